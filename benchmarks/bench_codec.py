@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the body codecs on get_vehicle_position sized payloads.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_codec.py [--vehicles 600] [--repeat 200]
+"""
+import argparse
+import random
+import timeit
+
+from lasvsim_openapi.codec import BINARY_CODECS, CODECS
+
+
+def position_reply(n: int) -> dict:
+    """Build a get_vehicle_position reply for n vehicles."""
+    rnd = random.Random(0)
+    return {
+        "position_dict": {
+            f"vehicle_{i}": {
+                "point": {"x": rnd.uniform(-1e3, 1e3), "y": rnd.uniform(-1e3, 1e3), "z": 0.0},
+                "phi": rnd.uniform(-3.14, 3.14),
+                "lane_id": f"lane_{rnd.randrange(200)}",
+                "link_id": f"link_{rnd.randrange(80)}",
+                "junction_id": "",
+                "segment_id": f"segment_{rnd.randrange(40)}",
+                "dis_to_lane_end": rnd.uniform(0, 200),
+                "position_type": 1,
+                "s": rnd.uniform(0, 500),
+                "t": rnd.uniform(-2, 2),
+                "lane_offset": rnd.uniform(-1, 1),
+            }
+            for i in range(n)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    reply = position_reply(args.vehicles)
+    request = {"simulation_id": "sim", "id_list": list(reply["position_dict"])}
+    print(f"{args.vehicles} vehicles, {args.repeat} rounds, times per call")
+    print(f"{'codec':<8} {'body':>10} {'encode req':>12} {'decode res':>12}")
+
+    for name, codec_cls in {**CODECS, **BINARY_CODECS}.items():
+        try:
+            codec = codec_cls()
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        body = codec.encode(reply)
+        encode = timeit.timeit(lambda: codec.encode(request), number=args.repeat) / args.repeat
+        decode = timeit.timeit(lambda: codec.decode(body), number=args.repeat) / args.repeat
+        print(f"{name:<8} {len(body):>9}B {encode * 1e6:>10.1f}us {decode * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
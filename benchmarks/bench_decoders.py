@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the generated model decoders against the hand-written from_dict methods.
+
+Replies are decoded the way Simulator and Resources.get_hd_map do, with
+and without generated=True. They are synthesized from the model type
+hints, or loaded from a JSON file of recorded responses keyed by model
+class name, e.g. {"GetVehiclePositionRes": {...}, "Qxmap": {...}}.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_decoders.py [--vehicles 600] [--width 4] [--repeat 50] \
+        [--replies replies.json]
+"""
+import argparse
+import dataclasses
+import json
+import random
+import timeit
+import typing
+from enum import Enum
+
+from bench_codec import position_reply
+from lasvsim_openapi import qxmap, simulator_model
+from lasvsim_openapi.resources import GetHdMapRes
+from lasvsim_openapi.simulator import Simulator
+
+MODULES = (simulator_model, qxmap)
+
+
+def sample(tp, rnd: random.Random, width: int):
+    """Build a raw value of type tp with width items per list or dict."""
+    if getattr(tp, "__origin__", None) is typing.Union:
+        tp = [a for a in tp.__args__ if a is not type(None)][0]
+    if dataclasses.is_dataclass(tp):
+        hints = typing.get_type_hints(tp)
+        return {f.name: sample(hints[f.name], rnd, width) for f in dataclasses.fields(tp)}
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return rnd.choice(list(tp)).value
+    origin = getattr(tp, "__origin__", None)
+    args = getattr(tp, "__args__", ())
+    if origin is list:
+        return [sample(args[0], rnd, width) for _ in range(width)]
+    if origin is dict:
+        return {f"key_{i}": sample(args[1], rnd, width) for i in range(width)}
+    if tp is float:
+        return rnd.uniform(-1e3, 1e3)
+    if tp is int:
+        return rnd.randrange(100)
+    if tp is str:
+        return f"id_{rnd.randrange(1000)}"
+    if tp is bool:
+        return rnd.random() < 0.5
+    return None
+
+
+def find_model(name: str) -> type:
+    for module in MODULES:
+        cls = getattr(module, name, None)
+        if cls is not None:
+            return cls
+    raise SystemExit(f"unknown model class: {name}")
+
+
+def decode_path(cls: type, generated: bool):
+    """The decode call Simulator or Resources.get_hd_map makes for cls."""
+    if cls is qxmap.Qxmap:
+        return lambda reply: GetHdMapRes.from_dict({"data": reply}, generated=generated).data
+    simulator = Simulator(None, generated=generated)
+    return lambda reply: simulator._decode(cls, reply)
+
+
+def synthetic_replies(vehicles: int, width: int) -> dict:
+    rnd = random.Random(0)
+    positions = position_reply(vehicles)
+    moving = {k: sample(simulator_model.ObjMovingInfo, rnd, width) for k in positions["position_dict"]}
+    perception = [
+        sample(simulator_model.GetVehiclePerceptionInfoRes_PerceptionObj, rnd, width)
+        for _ in range(vehicles // 6)
+    ]
+    return {
+        "GetVehiclePositionRes": positions,
+        "GetVehicleMovingInfoRes": {"moving_info_dict": moving},
+        "GetVehiclePerceptionInfoRes": {"list": perception},
+        "Qxmap": sample(qxmap.Qxmap, rnd, width),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=600)
+    parser.add_argument("--width", type=int, default=4, help="items per list in synthesized replies")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--replies", help="JSON file of recorded replies keyed by model class name")
+    args = parser.parse_args()
+
+    if args.replies:
+        with open(args.replies) as f:
+            replies = json.load(f)
+    else:
+        replies = synthetic_replies(args.vehicles, args.width)
+
+    print(f"{args.repeat} rounds, times per call")
+    print(f"{'model':<30} {'from_dict':>12} {'generated':>12} {'speedup':>8}")
+    for name, reply in replies.items():
+        cls = find_model(name)
+        eager_decode, generated_decode = decode_path(cls, False), decode_path(cls, True)
+        eager = min(timeit.repeat(lambda: eager_decode(reply), number=args.repeat, repeat=3)) / args.repeat
+        generated = min(timeit.repeat(lambda: generated_decode(reply), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{name:<30} {eager * 1e3:>10.3f}ms {generated * 1e3:>10.3f}ms {eager / generated:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
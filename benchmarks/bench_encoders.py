@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of request serialization against dataclasses.asdict.
+
+Array cases compare building Points from the array and calling asdict
+against serializing the array directly.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_encoders.py [--points 500] [--repeat 200]
+"""
+import argparse
+import timeit
+from dataclasses import asdict
+
+from lasvsim_openapi.model_encoder import local_path_dicts, point_dicts, to_dict
+from lasvsim_openapi.simulator_model import LocalPath, ObjBaseInfo, ObjMovingInfo, Obstacle, Point, Position
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--points", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    path = [Point(0.5 * i, 0.1 * i, 0.0) for i in range(args.points)]
+    tuples = [(p.x, p.y) for p in path]
+    obstacles = [
+        Obstacle(
+            id=f"obs_{i}",
+            base_info=ObjBaseInfo(width=2.0, length=4.5),
+            moving_info=ObjMovingInfo(u=10.0),
+            position=Position(point=Point(float(i), 0.0, 0.0), phi=0.1),
+        )
+        for i in range(args.points // 10)
+    ]
+    cases = {
+        "planning_path": (lambda: [asdict(p) for p in path], lambda: point_dicts(path)),
+        "planning_path tuples": (None, lambda: point_dicts(tuples)),
+        "obstacles": (lambda: [asdict(o) for o in obstacles], lambda: to_dict(obstacles)),
+    }
+    if np is not None:
+        array = np.array([(p.x, p.y, p.z) for p in path])
+        local_paths = [LocalPath(points=path, prob=0.5) for _ in range(5)]
+        records = np.zeros(5, dtype=[("points", "f8", array.shape), ("prob", "f8")])
+        records["points"] = array
+        records["prob"] = 0.5
+        cases["planning_path array"] = (lambda: [asdict(Point(*row)) for row in array.tolist()], lambda: point_dicts(array))
+        cases["5 local paths"] = (lambda: [asdict(p) for p in local_paths], lambda: local_path_dicts(records))
+
+    print(f"{args.points} points, {len(obstacles)} obstacles, {args.repeat} rounds, times per call")
+    print(f"{'request':<22} {'asdict':>10} {'to_dict':>10} {'speedup':>8}")
+    for name, (baseline, fast) in cases.items():
+        fast_time = timeit.timeit(fast, number=args.repeat) / args.repeat
+        if baseline is None:
+            print(f"{name:<22} {'':>10} {fast_time * 1e3:>8.3f}ms")
+            continue
+        base_time = timeit.timeit(baseline, number=args.repeat) / args.repeat
+        print(f"{name:<22} {base_time * 1e3:>8.3f}ms {fast_time * 1e3:>8.3f}ms {base_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of batch Frenet projection on the lanes of a synthetic map.
+
+Query points are scattered around random lane center points, like
+predicted vehicle trajectories. The baseline projects them one at a time
+with LaneIndex.nearest_segment.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_frenet.py [--blocks 8] [--points 5000] [--repeat 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from bench_map_index import synthetic_map
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=8)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    hd_map = decode(Qxmap, synthetic_map(args.blocks))
+    start = time.perf_counter()
+    projector = hd_map.lane_projector()
+    print(f"build projector {(time.perf_counter() - start) * 1e3:>10.1f}ms, {len(projector.ids)} lanes, "
+          f"{len(projector)} segments")
+
+    rnd = np.random.default_rng(0)
+    pick = rnd.integers(0, len(projector.px), args.points)
+    x = projector.px[pick] + rnd.normal(0, 1.0, args.points)
+    y = projector.py[pick] + rnd.normal(0, 1.0, args.points)
+    ids, s, t = projector.to_frenet(x, y)
+
+    index = hd_map.lane_index()
+    looped = min(args.points, 500)
+    start = time.perf_counter()
+    for i in range(looped):
+        index.nearest_segment(x[i], y[i])
+    per_point = (time.perf_counter() - start) / looped
+    print(f"{'nearest_segment loop':<22} {1e-3 / per_point:>10.0f} points/ms")
+
+    for name, func in (
+        ("to_frenet", lambda: projector.to_frenet(x, y)),
+        ("to_frenet given ids", lambda: projector.to_frenet(x, y, ids)),
+        ("to_xy", lambda: projector.to_xy(ids, s, t)),
+    ):
+        elapsed = min(_timed(func) for _ in range(args.repeat))
+        print(f"{name:<22} {args.points / (elapsed * 1e3):>10.0f} points/ms, {elapsed * 1e3:.2f}ms per batch")
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
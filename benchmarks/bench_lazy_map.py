@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of lazy HD map decoding against decoding the whole map.
+
+The lazy case looks up a few segments by ID and reads the center lines of
+their lanes, the typical access of a scenario that only needs the roads
+around the ego vehicle.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_lazy_map.py [--blocks 8] [--segments 5] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+from bench_map_index import synthetic_map
+from lasvsim_openapi.lazy_model import lazy_from_dict
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+
+
+def touch(hd_map: Qxmap, segment_ids) -> int:
+    """Read the center points of the lanes of some segments."""
+    points = 0
+    for segment_id in segment_ids:
+        for link in hd_map.segment_by_id(segment_id).ordered_links:
+            for lane in link.ordered_lanes:
+                points += sum(1 for c in lane.center_line if c.point.x is not None)
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=8)
+    parser.add_argument("--segments", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = synthetic_map(args.blocks)
+    segment_ids = random.Random(0).sample([s["id"] for s in data["segments"]], args.segments)
+    print(f"{len(data['segments'])} segments, touching {args.segments}")
+    for name, load in (("eager", lambda: decode(Qxmap, data)), ("lazy", lambda: lazy_from_dict(Qxmap, data))):
+        best_load, best_total = float("inf"), float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hd_map = load()
+            loaded = time.perf_counter()
+            touch(hd_map, segment_ids)
+            best_load = min(best_load, loaded - start)
+            best_total = min(best_total, time.perf_counter() - start)
+        print(f"{name:<6} load {best_load * 1e3:>10.2f}ms, load and query {best_total * 1e3:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
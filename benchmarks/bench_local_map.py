@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of local map building along an ego drive on a synthetic grid map.
+
+The ego drives along the center line of a horizontal road at --speed m/s
+with 0.1s steps. The baseline assembles the local map from Qxmap on every
+step by scanning all lanes.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_local_map.py [--blocks 8] [--radius 100] [--steps 2000]
+"""
+import argparse
+import math
+import time
+
+from bench_map_index import synthetic_map
+from lasvsim_openapi.local_map import LocalMapBuilder
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+from lasvsim_openapi.simulator_model import LaneCenterLines, LineString, LocalMap, Point
+
+
+def scan_local_map(hd_map: Qxmap, x: float, y: float, radius: float) -> LocalMap:
+    """Center lines with a point within radius, converted on every call, the baseline."""
+    lines = []
+    for lane in hd_map.iter_lanes():
+        if any(math.hypot(c.point.x - x, c.point.y - y) <= radius for c in lane.center_line):
+            lines.append(LaneCenterLines(LineString([Point(c.point.x, c.point.y) for c in lane.center_line])))
+    return LocalMap(lane_center_lines=lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=8)
+    parser.add_argument("--radius", type=float, default=100.0)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--speed", type=float, default=15.0)
+    args = parser.parse_args()
+
+    hd_map = decode(Qxmap, synthetic_map(args.blocks))
+    start = time.perf_counter()
+    builder = LocalMapBuilder(hd_map, radius=args.radius)
+    print(f"build tables       {(time.perf_counter() - start) * 1e3:>10.1f}ms, {len(builder)} features")
+
+    extent = args.blocks * 200.0
+    path = [((i * args.speed * 0.1) % extent, 200.0 - 1.75) for i in range(args.steps)]
+
+    scanned = path[:20]
+    start = time.perf_counter()
+    for x, y in scanned:
+        scan_local_map(hd_map, x, y, args.radius)
+    print(f"scan per step      {(time.perf_counter() - start) / len(scanned) * 1e6:>10.1f}us")
+
+    start = time.perf_counter()
+    sizes = 0
+    for x, y in path:
+        local_map = builder.build(x, y)
+        sizes += len(local_map.lane_boundaries) + len(local_map.lane_center_lines)
+    elapsed = (time.perf_counter() - start) / len(path)
+    print(f"builder per step   {elapsed * 1e6:>10.1f}us, {sizes / len(path):.0f} lines per local map")
+
+    start = time.perf_counter()
+    for x, y in path[::50]:
+        builder.fork().build(x, y)
+    print(f"builder cold       {(time.perf_counter() - start) / len(path[::50]) * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
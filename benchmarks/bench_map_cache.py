@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of loading an HD map from the disk cache against parsing the JSON reply.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_map_cache.py [--blocks 4] [--repeat 5]
+"""
+import argparse
+import tempfile
+import time
+
+import ujson
+
+from bench_map_index import synthetic_map
+from lasvsim_openapi.map_cache import HdMapCache
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = ujson.dumps({"data": synthetic_map(args.blocks)}).encode("utf-8")
+    print(f"reply body {len(body) / 1e6:.1f}MB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        HdMapCache(directory).get_data("scen", "1", lambda: ujson.loads(body)["data"])
+        cache = HdMapCache(directory)
+        cases = {
+            "parse reply": lambda: decode(Qxmap, ujson.loads(body)["data"]),
+            "disk cache": lambda: decode(Qxmap, HdMapCache(directory, memory_size=0).get_data("scen", "1")),
+            "memory cache": lambda: cache.get("scen", "1"),
+        }
+        for name, func in cases.items():
+            elapsed = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                func()
+                elapsed.append(time.perf_counter() - start)
+            print(f"{name:<14} {min(elapsed) * 1e3:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
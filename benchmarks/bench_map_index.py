@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the lane spatial index against scanning every center point.
+
+The map is a synthetic grid of two-way roads.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_map_index.py [--blocks 8] [--queries 2000]
+"""
+import argparse
+import math
+import random
+import time
+
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+
+
+def lane_dict(lane_id: str, x0: float, y0: float, heading: float, length: float, step: float, width: float) -> dict:
+    """A straight lane with center line points every step meters."""
+    n = int(length / step) + 1
+    cos, sin = math.cos(heading), math.sin(heading)
+    nx, ny = -sin * width / 2, cos * width / 2
+    center = [(x0 + cos * i * step, y0 + sin * i * step) for i in range(n)]
+    return {
+        "id": lane_id,
+        "length": length,
+        "width": width,
+        "center_line": [
+            {"s": i * step, "heading": heading, "point": {"x": x, "y": y}} for i, (x, y) in enumerate(center)
+        ],
+        "left_boundary": {"points": [{"x": x + nx, "y": y + ny} for x, y in center]},
+        "right_boundary": {"points": [{"x": x - nx, "y": y - ny} for x, y in center]},
+    }
+
+
+def synthetic_map(blocks: int = 8, block_len: float = 200.0, lanes: int = 3, step: float = 1.0,
+                  width: float = 3.5) -> dict:
+    """A grid map reply: blocks x blocks junctions joined by two-way roads.
+
+    Each road is a segment with one link per direction; lane k of a link is
+    offset k lane widths from the road center line. Segments and links are
+    wired up with junction, pair and upstream/downstream ids.
+    """
+    segments = []
+    junctions = {}
+    for j in range(blocks + 1):
+        for i in range(blocks + 1):
+            junctions[(i, j)] = {"id": f"junction_{i}_{j}", "links": [], "upstream_segment_ids": [],
+                                 "downstream_segment_ids": []}
+
+    def road(a, b, heading):
+        (i0, j0), (i1, j1) = a, b
+        seg_id = f"segment_{i0}_{j0}_{i1}_{j1}"
+        cos, sin = math.cos(heading), math.sin(heading)
+        x0, y0 = i0 * block_len, j0 * block_len
+        length = block_len - 2 * width * lanes
+        sx, sy = x0 + cos * width * lanes, y0 + sin * width * lanes
+        link_id = f"link_{seg_id}"
+        ordered_lanes = []
+        for k in range(lanes):
+            off = (k + 0.5) * width
+            ordered_lanes.append(lane_dict(f"lane_{seg_id}_{k}", sx + sin * off, sy - cos * off, heading, length,
+                                           step, width))
+        segments.append({
+            "id": seg_id,
+            "start_junction_id": junctions[a]["id"],
+            "end_junction_id": junctions[b]["id"],
+            "length": length,
+            "ordered_links": [{"id": link_id, "length": length, "ordered_lanes": ordered_lanes}],
+        })
+        junctions[a]["downstream_segment_ids"].append(seg_id)
+        junctions[b]["upstream_segment_ids"].append(seg_id)
+
+    for j in range(blocks + 1):
+        for i in range(blocks):
+            road((i, j), (i + 1, j), 0.0)
+            road((i + 1, j), (i, j), math.pi)
+    for i in range(blocks + 1):
+        for j in range(blocks):
+            road((i, j), (i, j + 1), math.pi / 2)
+            road((i, j + 1), (i, j), -math.pi / 2)
+    return {"id": "synthetic", "segments": segments, "junctions": list(junctions.values())}
+
+
+def scan_nearest(hd_map: Qxmap, x: float, y: float) -> str:
+    """Nearest lane by scanning every center point, the baseline."""
+    best, best_id = math.inf, None
+    for lane in hd_map.iter_lanes():
+        for c in lane.center_line:
+            d = (c.point.x - x) ** 2 + (c.point.y - y) ** 2
+            if d < best:
+                best, best_id = d, lane.id
+    return best_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--cell-size", type=float, default=10.0)
+    args = parser.parse_args()
+
+    hd_map = decode(Qxmap, synthetic_map(args.blocks))
+    points = sum(len(lane.center_line) for lane in hd_map.iter_lanes())
+    extent = args.blocks * 200.0
+    rnd = random.Random(0)
+    queries = [(rnd.uniform(0, extent), rnd.uniform(0, extent)) for _ in range(args.queries)]
+    print(f"{sum(1 for _ in hd_map.iter_lanes())} lanes, {points} center points")
+
+    start = time.perf_counter()
+    index = hd_map.lane_index(args.cell_size)
+    print(f"build index        {(time.perf_counter() - start) * 1e3:>10.1f}ms, {len(index)} segments")
+
+    scanned = queries[:max(1, args.queries // 100)]
+    start = time.perf_counter()
+    for x, y in scanned:
+        scan_nearest(hd_map, x, y)
+    scan = (time.perf_counter() - start) / len(scanned)
+    print(f"scan nearest       {scan * 1e6:>10.1f}us per query")
+
+    for name, query in (
+        ("nearest_lane", lambda x, y: hd_map.nearest_lane(x, y)),
+        ("lanes_within 20m", lambda x, y: hd_map.lanes_within(x, y, 20.0)),
+        ("lanes_in_box 50m", lambda x, y: hd_map.lanes_in_box(x - 25, y - 25, x + 25, y + 25)),
+    ):
+        start = time.perf_counter()
+        for x, y in queries:
+            query(x, y)
+        elapsed = (time.perf_counter() - start) / len(queries)
+        print(f"{name:<18} {elapsed * 1e6:>10.1f}us per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Memory and construction benchmark of the slotted model classes.
+
+Compares Position/Point/ObjMovingInfo/Step against equivalent dataclasses
+that keep a per-instance __dict__.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_models.py [--count 100000]
+"""
+import argparse
+import dataclasses
+import time
+import tracemalloc
+
+from lasvsim_openapi.sim_record_model import Step
+from lasvsim_openapi.simulator_model import ObjMovingInfo, Point, Position
+
+
+def dict_variant(cls: type) -> type:
+    """Build a dataclass with the same fields as cls but without __slots__."""
+    return dataclasses.make_dataclass(
+        f"Dict{cls.__name__}",
+        [(f.name, f.type, dataclasses.field(default=None)) for f in dataclasses.fields(cls)],
+    )
+
+
+def measure(build, count: int):
+    """Return (bytes per object, microseconds per object) for count objects."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    objs = [build(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return size / count, elapsed / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    DictPoint = dict_variant(Point)
+    DictPosition = dict_variant(Position)
+    cases = {
+        "Point": (
+            lambda i: Point(float(i), 2.0, 0.0),
+            lambda i: DictPoint(float(i), 2.0, 0.0),
+        ),
+        "Position": (
+            lambda i: Position(point=Point(float(i), 2.0, 0.0), phi=0.1, lane_id="lane", s=1.0, t=0.5),
+            lambda i: DictPosition(point=DictPoint(float(i), 2.0, 0.0), phi=0.1, lane_id="lane", s=1.0, t=0.5),
+        ),
+    }
+    for cls in (ObjMovingInfo, Step):
+        dict_cls = dict_variant(cls)
+        cases[cls.__name__] = (lambda i, cls=cls: cls(u=float(i)), lambda i, cls=dict_cls: cls(u=float(i)))
+
+    print(f"{args.count} objects per class")
+    print(f"{'class':<14} {'slotted':>16} {'with __dict__':>16} {'memory':>8}")
+    for name, (slotted, with_dict) in cases.items():
+        slot_size, slot_time = measure(slotted, args.count)
+        dict_size, dict_time = measure(with_dict, args.count)
+        print(
+            f"{name:<14} {slot_size:>6.0f}B {slot_time:>6.2f}us {dict_size:>6.0f}B {dict_time:>6.2f}us"
+            f" {slot_size / dict_size:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of array-backed map polylines against point object lists.
+
+Compares decode time, memory held by the decoded map, and computing the
+length of every lane center line.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_polyline.py [--blocks 4]
+"""
+import argparse
+import math
+import time
+import tracemalloc
+
+import numpy as np
+
+from bench_map_index import synthetic_map
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.polyline import PolylineArray, decode_array_map
+from lasvsim_openapi.qxmap import Qxmap
+
+
+def lane_lengths(hd_map: Qxmap) -> list:
+    lengths = []
+    for lane in hd_map.iter_lanes():
+        line = lane.center_line
+        if isinstance(line, PolylineArray):
+            lengths.append(float(np.hypot(*np.diff(line.xy, axis=0).T).sum()))
+        else:
+            lengths.append(sum(math.hypot(b.point.x - a.point.x, b.point.y - a.point.y) for a, b in zip(line, line[1:])))
+    return lengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=4)
+    args = parser.parse_args()
+
+    data = synthetic_map(args.blocks)
+    print(f"{'map':<8} {'decode':>10} {'memory':>10} {'lane lengths':>14}")
+    for name, load in (("objects", lambda: decode(Qxmap, data)), ("arrays", lambda: decode_array_map(data))):
+        tracemalloc.start()
+        start = time.perf_counter()
+        hd_map = load()
+        decoded = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        lane_lengths(hd_map)
+        lengths = time.perf_counter() - start
+        print(f"{name:<8} {decoded * 1e3:>8.1f}ms {memory / 1e6:>8.1f}MB {lengths * 1e3:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
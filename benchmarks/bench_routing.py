@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of lane routing on a synthetic grid map.
+
+Every junction connects each lane of an incoming road to the same lane of
+each outgoing road except the way back. Vehicles start on random lanes and
+head for one destination link, like the navigation of an episode's
+background traffic.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_routing.py [--blocks 8] [--vehicles 300]
+"""
+import argparse
+import random
+import time
+
+from bench_map_index import synthetic_map
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+
+
+def wired_map(blocks: int, lanes: int = 3) -> dict:
+    """synthetic_map with junction connections between its roads."""
+    data = synthetic_map(blocks, lanes=lanes)
+    segments = {segment["id"]: segment for segment in data["segments"]}
+    for junction in data["junctions"]:
+        connections = []
+        for up in junction["upstream_segment_ids"]:
+            for down in junction["downstream_segment_ids"]:
+                if up.split("_")[1:3] == down.split("_")[3:5]:
+                    continue
+                up_link, down_link = segments[up]["ordered_links"][0], segments[down]["ordered_links"][0]
+                for k in range(lanes):
+                    connections.append({
+                        "id": f"{up}->{down}_{k}",
+                        "upstream_lane_id": up_link["ordered_lanes"][k]["id"],
+                        "downstream_lane_id": down_link["ordered_lanes"][k]["id"],
+                        "upstream_link_id": up_link["id"],
+                        "downstream_link_id": down_link["id"],
+                    })
+        junction["connections"] = connections
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=8)
+    parser.add_argument("--vehicles", type=int, default=300)
+    args = parser.parse_args()
+
+    hd_map = decode(Qxmap, wired_map(args.blocks))
+    start = time.perf_counter()
+    graph = hd_map.lane_graph()
+    print(f"build graph        {(time.perf_counter() - start) * 1e3:>10.1f}ms, {len(graph)} lanes, "
+          f"{len(graph.targets)} edges")
+
+    rnd = random.Random(0)
+    sources = [rnd.choice(graph.lane_ids) for _ in range(args.vehicles)]
+    destination = rnd.choice(sorted(set(graph.lane_link)))
+
+    start = time.perf_counter()
+    expected = {lane_id: graph.link_route(lane_id, to_link_id=destination) for lane_id in sources}
+    elapsed = time.perf_counter() - start
+    print(f"A* per vehicle     {elapsed * 1e3:>10.1f}ms, {elapsed / len(sources) * 1e6:.0f}us per route")
+
+    start = time.perf_counter()
+    routes = graph.link_routes(sources, to_link_id=destination)
+    elapsed = time.perf_counter() - start
+    print(f"tree, cold         {elapsed * 1e3:>10.1f}ms")
+    start = time.perf_counter()
+    graph.link_routes(sources, to_link_id=destination)
+    elapsed = time.perf_counter() - start
+    print(f"tree, cached       {elapsed * 1e3:>10.1f}ms, {elapsed / len(sources) * 1e6:.0f}us per route")
+    assert all(len(routes[lane_id] or ()) == len(expected[lane_id] or ()) for lane_id in sources)
+
+
+if __name__ == "__main__":
+    main()
@@ -42,15 +42,25 @@ class Client:
         self.process_task = ProcessTask(self.client_fast.http_client)
         self.sim_record = SimRecord(self.client_fast.http_client)
 
-    def init_simulator_from_config(self, sim_config: SimulatorConfig) -> Simulator:
+    def init_simulator_from_config(
+        self, sim_config: SimulatorConfig, lazy: bool = False, generated: bool = False
+    ) -> Simulator:
         """Initialize a simulator from the given configuration.
         
         Args:
             sim_config: Configuration for the simulator
+            lazy: Return lazily decoded responses, see Simulator
+            generated: Decode responses with the generated decoders, see
+                Simulator
             
         Returns:
             A new simulator instance
+
+        Raises:
+            ValueError: If both lazy and generated are set
         """
+        if lazy and generated:
+            raise ValueError("lazy and generated cannot be combined")
         simlator_v2 = self.client_fast.init_simulator_from_config(sim_config)
-        simulator = Simulator(simlator_v2)
+        simulator = Simulator(simlator_v2, lazy=lazy, generated=generated)
         return simulator
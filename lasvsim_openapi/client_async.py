@@ -0,0 +1,68 @@
+"""
+Asyncio client module for the lasvsim API.
+"""
+from typing import Sequence
+
+from lasvsim_openapi.http_client import HttpConfig
+from lasvsim_openapi.http_client_async import AsyncHttpClient
+from lasvsim_openapi.process_task_async import AsyncProcessTaskFast
+from lasvsim_openapi.sim_record_async import AsyncSimRecordFast
+from lasvsim_openapi.simulator_async import AsyncSimulatorFast
+from lasvsim_openapi.simulator_model import SimulatorConfig
+from lasvsim_openapi.simulator_pool import AsyncSimulatorPool
+
+
+class AsyncClientFast:
+    """Asyncio client for the API.
+
+    All simulators created from one client multiplex their requests over a
+    single pool of keep-alive connections on the running event loop.
+    """
+    config: HttpConfig = None
+    http_client: AsyncHttpClient = None
+
+    process_task: AsyncProcessTaskFast = None
+    sim_record: AsyncSimRecordFast = None
+
+    def __init__(self, config: HttpConfig):
+        """Initialize a new API client.
+
+        Args:
+            config: HTTP configuration for the client
+        """
+        self.config = config
+        self.http_client = AsyncHttpClient(config)
+        self.init_common_client()
+
+    def init_common_client(self):
+        """Initialize the common client components."""
+        self.process_task = AsyncProcessTaskFast(self.http_client)
+        self.sim_record = AsyncSimRecordFast(self.http_client)
+
+    async def init_simulator_from_config(self, sim_config: SimulatorConfig) -> AsyncSimulatorFast:
+        """Initialize a simulator from the given configuration.
+
+        Args:
+            sim_config: Configuration for the simulator
+
+        Returns:
+            A new simulator instance
+        """
+        simulator = AsyncSimulatorFast(http_client=self.http_client)
+        await simulator.init(sim_config)
+        return simulator
+
+    async def init_simulator_pool(self, sim_configs: Sequence[SimulatorConfig]) -> AsyncSimulatorPool:
+        """Initialize several simulators concurrently.
+
+        Args:
+            sim_configs: One configuration per simulator
+
+        Returns:
+            A new simulator pool
+        """
+        return await AsyncSimulatorPool.create(self.http_client, sim_configs)
+
+    async def close(self):
+        """Close the connection pool shared by all components of this client."""
+        await self.http_client.close()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Sequence
 
 from lasvsim_openapi.http_client import HttpConfig, HttpClient
 from lasvsim_openapi.simulator_fast import *
@@ -8,6 +8,7 @@ from lasvsim_openapi.resources_fast import ResourcesFast
 from lasvsim_openapi.process_task_fast import ProcessTaskFast
 from lasvsim_openapi.simulator import SimulatorConfig
 from lasvsim_openapi.sim_record_fast import SimRecordFast
+from lasvsim_openapi.simulator_pool import SimulatorPool
 
 class ClientFast:
     config: HttpConfig = None
@@ -45,4 +46,16 @@ class ClientFast:
             A new simulator instance
         """
         simulator = SimulatorFast(http_client=self.http_client, sim_config = sim_config)
-        return simulator
\ No newline at end of file
+        return simulator
+
+    def init_simulator_pool(self, sim_configs: Sequence[SimulatorConfig], max_workers: Optional[int] = None) -> SimulatorPool:
+        """Initialize several simulators concurrently.
+        
+        Args:
+            sim_configs: One configuration per simulator
+            max_workers: Number of worker threads, defaults to one per simulator
+            
+        Returns:
+            A new simulator pool
+        """
+        return SimulatorPool(self.http_client, sim_configs, max_workers=max_workers)
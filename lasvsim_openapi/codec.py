@@ -0,0 +1,174 @@
+"""
+Body codec module for the lasvsim API.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+
+import ujson
+
+
+class Codec(ABC):
+    """Encodes request bodies to bytes and decodes response bodies from bytes."""
+    name: str = ""
+    content_type: str = "application/json"
+
+    @abstractmethod
+    def encode(self, data: Any) -> bytes:
+        """Encode a body."""
+
+    @abstractmethod
+    def decode(self, data: Union[bytes, bytearray, memoryview]) -> Any:
+        """Decode a body."""
+
+
+class UjsonCodec(Codec):
+    """JSON codec backed by ujson, the default."""
+    name = "ujson"
+
+    def encode(self, data: Any) -> bytes:
+        return ujson.dumps(data).encode("utf-8")
+
+    def decode(self, data: Union[bytes, bytearray, memoryview]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return ujson.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """JSON codec backed by orjson.
+
+    orjson serializes straight to bytes and parses bytes without an
+    intermediate str. NumPy arrays and scalars are serialized natively.
+    """
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "OrjsonCodec requires orjson, install it with `pip install lasvsim-openapi[orjson]`"
+            ) from e
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def encode(self, data: Any) -> bytes:
+        return self._dumps(data, option=self._option)
+
+    def decode(self, data: Union[bytes, bytearray, memoryview]) -> Any:
+        return self._loads(data)
+
+
+class MsgpackCodec(Codec):
+    """Binary codec backed by msgpack."""
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError(
+                "MsgpackCodec requires msgpack, install it with `pip install lasvsim-openapi[msgpack]`"
+            ) from e
+        self._packb = msgpack.packb
+        self._unpackb = msgpack.unpackb
+
+    def encode(self, data: Any) -> bytes:
+        return self._packb(data, use_bin_type=True)
+
+    def decode(self, data: Union[bytes, bytearray, memoryview]) -> Any:
+        return self._unpackb(data, raw=False, strict_map_key=False)
+
+
+CODECS: Dict[str, type] = {
+    UjsonCodec.name: UjsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+# 可协商的二进制格式, 对应 HttpConfig.wire_format
+BINARY_CODECS: Dict[str, type] = {
+    MsgpackCodec.name: MsgpackCodec,
+}
+WIRE_FORMATS = ("json",) + tuple(BINARY_CODECS)
+
+
+def get_codec(codec: Union[str, Codec, None] = None) -> Codec:
+    """Resolve a codec by name.
+
+    Args:
+        codec: A Codec instance, a registered codec name ("ujson",
+            "orjson"), or None for the default ujson codec
+
+    Returns:
+        The codec instance
+
+    Raises:
+        ValueError: If the name is not registered
+        ImportError: If the codec's library is not installed
+    """
+    if isinstance(codec, Codec):
+        return codec
+    codec_cls = CODECS.get(codec or UjsonCodec.name)
+    if codec_cls is None:
+        raise ValueError(f"unknown codec: {codec}, expected one of {sorted(CODECS)}")
+    return codec_cls()
+
+
+class WireFormat:
+    """Wire format negotiation shared by a client and all of its clones.
+
+    With the "json" format every body uses the JSON codec. With "msgpack"
+    requests advertise msgpack in Accept but keep sending JSON until the
+    server has answered with msgpack once; from then on request bodies are
+    msgpack too. If the server rejects a msgpack body with 415, the client
+    falls back to JSON for good. Responses are always decoded according to
+    their Content-Type.
+    """
+    json_codec: Codec = None
+    binary_codec: Optional[Codec] = None
+    accept: Optional[str] = None
+    # None: not negotiated yet, True: server speaks the binary format,
+    # False: server rejected it
+    binary_ok: Optional[bool] = None
+
+    def __init__(self, json_codec: Codec, wire_format: str = "json"):
+        """Initialize the negotiation state.
+
+        Args:
+            json_codec: Codec for JSON bodies
+            wire_format: "json" or "msgpack"
+
+        Raises:
+            ValueError: If the wire format is unknown
+            ImportError: If the binary codec's library is not installed
+        """
+        if wire_format not in WIRE_FORMATS:
+            raise ValueError(f"unknown wire format: {wire_format}, expected one of {WIRE_FORMATS}")
+        self.json_codec = json_codec
+        self.binary_codec = None
+        self.accept = None
+        self.binary_ok = None
+        if wire_format != "json":
+            self.binary_codec = BINARY_CODECS[wire_format]()
+            self.accept = f"{self.binary_codec.content_type}, {json_codec.content_type};q=0.9"
+
+    def request_codec(self) -> Codec:
+        """Codec for the next request body."""
+        if self.binary_ok:
+            return self.binary_codec
+        return self.json_codec
+
+    def response_codec(self, content_type: Optional[str]) -> Codec:
+        """Codec for a response body of the given Content-Type."""
+        binary_codec = self.binary_codec
+        if binary_codec is not None and content_type and content_type.startswith(binary_codec.content_type):
+            if self.binary_ok is None:
+                self.binary_ok = True
+            return binary_codec
+        return self.json_codec
+
+    def reject_binary(self):
+        """Fall back to JSON after the server rejected a binary body."""
+        self.binary_ok = False
@@ -0,0 +1,150 @@
+"""
+Body compression module for the lasvsim API.
+"""
+import gzip
+import threading
+import zlib
+from typing import Dict, Optional, Tuple
+
+ENCODINGS = ("gzip", "deflate")
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """Compress a body with the given Content-Encoding."""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level)
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+    raise ValueError(f"unknown content encoding: {encoding}, expected one of {ENCODINGS}")
+
+
+def decompress(data: bytes, encoding: Optional[str]) -> bytes:
+    """Decompress a body of the given Content-Encoding, identity if empty."""
+    if not encoding or encoding == "identity":
+        return data
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # 部分服务端发送不带 zlib 头的原始 deflate 流
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    raise ValueError(f"unsupported content encoding: {encoding}")
+
+
+class EndpointStats:
+    """Traffic counters of one endpoint.
+
+    ``*_raw`` counts body bytes before compression, ``*_wire`` the bytes
+    actually sent or received.
+    """
+    requests: int = 0
+    compressed_requests: int = 0
+    bytes_out_raw: int = 0
+    bytes_out_wire: int = 0
+    responses: int = 0
+    compressed_responses: int = 0
+    bytes_in_raw: int = 0
+    bytes_in_wire: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "compressed_requests": self.compressed_requests,
+            "bytes_out_raw": self.bytes_out_raw,
+            "bytes_out_wire": self.bytes_out_wire,
+            "responses": self.responses,
+            "compressed_responses": self.compressed_responses,
+            "bytes_in_raw": self.bytes_in_raw,
+            "bytes_in_wire": self.bytes_in_wire,
+        }
+
+
+class Compression:
+    """Body compression settings and per-endpoint stats shared by a client and its clones.
+
+    Request bodies of at least ``threshold`` bytes are compressed with
+    ``encoding``. If the server rejects a compressed body with 415,
+    requests are sent uncompressed from then on. Responses are compressed
+    only when the server chooses to, based on Accept-Encoding.
+    """
+    encoding: Optional[str] = None
+    threshold: int = 1024
+    level: int = 6
+    accept_encoding: Optional[str] = None
+    request_ok: bool = True
+
+    def __init__(self, encoding: Optional[str] = None, threshold: int = 1024, level: int = 6):
+        """Initialize compression settings.
+
+        Args:
+            encoding: "gzip", "deflate", or None to disable compression
+            threshold: Minimum request body size in bytes to compress
+            level: Compression level
+
+        Raises:
+            ValueError: If the encoding is unknown
+        """
+        if encoding is not None and encoding not in ENCODINGS:
+            raise ValueError(f"unknown content encoding: {encoding}, expected one of {ENCODINGS}")
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+        self.accept_encoding = ", ".join(ENCODINGS) if encoding is not None else None
+        self.request_ok = True
+        self._stats: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def compress_body(self, path: str, body: Optional[bytes]) -> Tuple[Optional[bytes], Optional[str]]:
+        """Compress a request body if it is large enough and record its size.
+
+        Returns:
+            A tuple of (body to send, Content-Encoding or None)
+        """
+        size = len(body) if body else 0
+        encoding = None
+        if self.encoding is not None and self.request_ok and size >= self.threshold:
+            body = compress(body, self.encoding, self.level)
+            encoding = self.encoding
+        with self._lock:
+            stats = self._endpoint(path)
+            stats.requests += 1
+            stats.bytes_out_raw += size
+            stats.bytes_out_wire += len(body) if body else 0
+            if encoding is not None:
+                stats.compressed_requests += 1
+        return body, encoding
+
+    def decompress_body(self, path: str, data: bytes, encoding: Optional[str]) -> bytes:
+        """Decompress a response body and record its size."""
+        wire_size = len(data)
+        data = decompress(data, encoding)
+        with self._lock:
+            stats = self._endpoint(path)
+            stats.responses += 1
+            stats.bytes_in_raw += len(data)
+            stats.bytes_in_wire += wire_size
+            if encoding and encoding != "identity":
+                stats.compressed_responses += 1
+        return data
+
+    def reject(self):
+        """Stop compressing requests after the server rejected a compressed body."""
+        self.request_ok = False
+
+    def _endpoint(self, path: str) -> EndpointStats:
+        stats = self._stats.get(path)
+        if stats is None:
+            stats = self._stats[path] = EndpointStats()
+        return stats
+
+    def stats(self) -> Dict[str, dict]:
+        """Snapshot of the per-endpoint traffic counters, keyed by request path."""
+        with self._lock:
+            return {path: stats.to_dict() for path, stats in self._stats.items()}
+
+    def reset_stats(self):
+        """Clear all traffic counters."""
+        with self._lock:
+            self._stats.clear()
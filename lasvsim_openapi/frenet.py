@@ -0,0 +1,245 @@
+"""
+Frenet (s, t) projection onto HD map lanes and links for the lasvsim API.
+"""
+from typing import Any, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "FrenetProjector requires numpy, install it with `pip install lasvsim-openapi[numpy]`"
+    ) from e
+
+from lasvsim_openapi.map_index import SegmentGrid, _center_line_xy, _reference_line_xy, project_segments
+from lasvsim_openapi.qxmap import Lane, Link
+
+
+class FrenetProjector(SegmentGrid):
+    """Converts batches of points between (x, y) and (id, s, t) on reference polylines.
+
+    s is the arc length from the first point of the polyline, computed from
+    its geometry, and t the signed lateral offset, positive to the left of
+    the direction of travel. Points beyond either end are extrapolated along
+    the first or last segment, so the two conversions are inverse to each
+    other there as well. Zero-length segments, from repeated points or
+    single-point polylines, take the direction of the neighboring segment.
+
+    All polylines are concatenated into flat arrays: points ``px, py`` with
+    the cumulative arc length ``ps``, and ``starts`` the offset of the first
+    point of each polyline. Segments are indexed by a SegmentGrid; ``line``
+    is the polyline a segment belongs to and ``s0`` the arc length at its
+    start.
+    """
+
+    ids: List[str] = None
+
+    def __init__(self, ids: Iterable[str], polylines: Iterable[Any], cell_size: float = 4.0):
+        """Build the projector.
+
+        Args:
+            ids: Polyline IDs, such as lane or link IDs
+            polylines: (N, 2) coordinate arrays, one per ID. Polylines
+                without points are left out.
+            cell_size: Grid cell edge length in meters. Batch lookups are
+                exact in one pass for points within one cell size of a
+                polyline, so it should exceed the usual distance of the
+                query points from the nearest polyline, e.g. half a lane
+                width for lane center lines.
+
+        Raises:
+            ValueError: If cell_size is not positive
+        """
+        self._set_cell_size(cell_size)
+        self.ids = []
+        shapes = []
+        for line_id, xy in zip(ids, polylines):
+            xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+            if not len(xy):
+                continue
+            if len(xy) == 1:
+                # 单点折线视为零长度线段
+                xy = np.repeat(xy, 2, axis=0)
+            self.ids.append(line_id)
+            shapes.append(xy)
+        self._lines = {line_id: i for i, line_id in enumerate(self.ids)}
+        self._id_array = np.array(self.ids, dtype=object)
+
+        sizes = np.array([len(xy) for xy in shapes], dtype=np.int64)
+        self.starts = np.concatenate([[0], np.cumsum(sizes)])
+        points = np.vstack(shapes) if shapes else np.empty((0, 2))
+        self.px = np.ascontiguousarray(points[:, 0])
+        self.py = np.ascontiguousarray(points[:, 1])
+        point_line = np.repeat(np.arange(len(sizes)), sizes)
+
+        # 每条折线的累计弧长
+        step = np.hypot(np.diff(self.px), np.diff(self.py))
+        step[self.starts[1:-1] - 1] = 0.0
+        cum = np.concatenate([[0.0], np.cumsum(step)])
+        self.ps = cum - cum[self.starts[:-1]][point_line] if len(points) else cum[:0]
+        self.length = self.ps[self.starts[1:] - 1] if len(sizes) else np.empty(0)
+        # 各折线的弧长首尾相接并留出间隔, 逆变换只需对全局弧长做一次二分查找
+        self._base = np.concatenate([[0.0], np.cumsum(self.length + 1.0)])[:-1]
+        self._global_s = self.ps + self._base[point_line]
+
+        # 线段 i 的起点为点 start_point[i], 每条折线比点数少一条线段
+        last = np.zeros(len(points), dtype=bool)
+        last[self.starts[1:] - 1] = True
+        self._start_point = np.flatnonzero(~last)
+        self.line = point_line[self._start_point].astype(np.int32)
+        self.s0 = self.ps[self._start_point]
+        self._seg_starts = self.starts - np.arange(len(self.starts))
+        end = self._start_point + 1
+        self.x0, self.y0 = self.px[self._start_point], self.py[self._start_point]
+        self.x1, self.y1 = self.px[end], self.py[end]
+        self._set_directions()
+        self._build_grid()
+
+    def _set_directions(self):
+        """Unit direction of each segment, borrowed from the nearest non-empty one of its polyline.
+
+        Zero-length segments, e.g. repeated points or single-point
+        polylines, have no direction of their own; polylines without any
+        length point along +x.
+        """
+        n = len(self.x0)
+        dx, dy = self.x1 - self.x0, self.y1 - self.y0
+        length = np.hypot(dx, dy)
+        valid = length > 0
+        index = np.arange(n)
+        first = self._seg_starts[self.line]
+        stop = self._seg_starts[self.line + 1]
+        before = np.maximum.accumulate(np.where(valid, index, -1)) if n else index
+        after = np.minimum.accumulate(np.where(valid, index, n)[::-1])[::-1] if n else index
+        source = np.where(before >= first, before, np.where(after < stop, after, -1))
+        found = source >= 0
+        source = np.where(found, source, 0)
+        scale = np.where(found, length[source], 1.0)
+        self._ux = np.where(found, dx[source] / np.where(found, scale, 1.0), 1.0)
+        self._uy = np.where(found, dy[source] / np.where(found, scale, 1.0), 0.0)
+
+    @classmethod
+    def from_lanes(cls, lanes: Iterable[Lane], cell_size: float = 4.0) -> "FrenetProjector":
+        """Build a projector onto lane center lines."""
+        lanes = list(lanes)
+        return cls([lane.id for lane in lanes], [_center_line_xy(lane) for lane in lanes], cell_size)
+
+    @classmethod
+    def from_links(cls, links: Iterable[Link], cell_size: float = 4.0) -> "FrenetProjector":
+        """Build a projector onto link reference lines."""
+        links = list(links)
+        return cls([link.id for link in links], [_reference_line_xy(link) for link in links], cell_size)
+
+    def _line_indices(self, ids) -> "np.ndarray":
+        if isinstance(ids, str):
+            ids = [ids]
+        try:
+            return np.fromiter((self._lines[i] for i in ids), dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"unknown reference line: {e.args[0]}") from None
+
+    def _nearest_on_lines(self, x, y, lines) -> "np.ndarray":
+        """Nearest segment of each point's own polyline, -1 where the point is not finite."""
+        seg = np.full(len(x), -1, dtype=np.int64)
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            keep = np.flatnonzero(finite)
+            seg[keep] = self._nearest_on_lines(x[keep], y[keep], lines[keep])
+            return seg
+        dist = np.full(len(x), np.inf)
+        pair_owner, pair_seg, margin = self._candidate_pairs(x, y)
+        keep = self.line[pair_seg] == lines[pair_owner]
+        self._nearest_pairs(x, y, pair_owner[keep], pair_seg[keep], seg, dist, np.zeros(len(x)))
+
+        # 附近格子中没有所给折线的点, 逐条折线投影到全部线段上
+        rest = np.flatnonzero(~(dist <= margin))
+        if not len(rest):
+            return seg
+        order = rest[np.argsort(lines[rest], kind="stable")]
+        bounds = np.flatnonzero(np.r_[True, lines[order][1:] != lines[order][:-1], True])
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            points = order[a:b]
+            k = lines[points[0]]
+            first, stop = self._seg_starts[k], self._seg_starts[k + 1]
+            line_dist, _ = project_segments(
+                x[points, None], y[points, None],
+                self.x0[first:stop], self.y0[first:stop], self.x1[first:stop], self.y1[first:stop],
+            )
+            seg[points] = first + np.argmin(line_dist, axis=1)
+        return seg
+
+    def to_frenet(
+        self, x, y, ids: Optional[Any] = None
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Project points onto the nearest polyline, or onto given ones.
+
+        Args:
+            x: X coordinates, an array or sequence
+            y: Y coordinates of the same length
+            ids: Polyline to project each point onto, a sequence of IDs or
+                a single ID for all points; the nearest polyline by default
+
+        Returns:
+            A tuple of arrays (polyline ID, s, t). The IDs are an object
+            array; where there are no polylines at all or the point is not
+            finite they are None and s and t are NaN.
+
+        Raises:
+            ValueError: If an ID is unknown or the lengths do not match
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64).ravel(), np.asarray(y, dtype=np.float64).ravel())
+        if not len(self):
+            return np.full(len(x), None, dtype=object), np.full(len(x), np.nan), np.full(len(x), np.nan)
+        if ids is None:
+            seg, _, _ = self.nearest_segments(x, y)
+        else:
+            lines = np.broadcast_to(self._line_indices(ids), x.shape)
+            seg = self._nearest_on_lines(x, y, lines)
+
+        x0, y0 = self.x0[seg], self.y0[seg]
+        dx, dy = self.x1[seg] - x0, self.y1[seg] - y0
+        length2 = dx * dx + dy * dy
+        u = ((x - x0) * dx + (y - y0) * dy) / np.where(length2 > 0, length2, 1.0)
+        # 折线两端之外沿首末线段外推, 中间线段截断到线段内
+        line = self.line[seg]
+        lower = np.where(seg == self._seg_starts[line], -np.inf, 0.0)
+        upper = np.where(seg == self._seg_starts[line + 1] - 1, np.inf, 1.0)
+        u = np.clip(u, lower, upper)
+
+        s = self.s0[seg] + u * np.sqrt(length2)
+        # 零长度线段沿用相邻线段的方向判断左右
+        cross = self._ux[seg] * (y - y0) - self._uy[seg] * (x - x0)
+        t = np.where(cross < 0, -1.0, 1.0) * np.hypot(x - (x0 + u * dx), y - (y0 + u * dy))
+        line_ids = self._id_array[line]
+        missing = seg < 0
+        if missing.any():
+            line_ids[missing] = None
+            s[missing] = np.nan
+            t[missing] = np.nan
+        return line_ids, s, t
+
+    def to_xy(self, ids, s, t=0.0) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Convert Frenet coordinates back to points.
+
+        Args:
+            ids: Polyline of each point, a sequence of IDs or a single ID
+            s: Arc lengths along the polylines, extrapolated beyond the ends
+            t: Lateral offsets, positive to the left, scalar or per point
+
+        Returns:
+            A tuple of arrays (x, y)
+
+        Raises:
+            ValueError: If an ID is unknown or the lengths do not match
+        """
+        line, s, t = np.broadcast_arrays(
+            self._line_indices(ids), np.asarray(s, dtype=np.float64).ravel(), np.asarray(t, dtype=np.float64).ravel()
+        )
+
+        g = self._base[line] + np.clip(s, 0.0, self.length[line])
+        p = np.searchsorted(self._global_s, g, side="right") - 1
+        p = np.clip(p, self.starts[line], self.starts[line + 1] - 2)
+        # 沿线段方向 (ux, uy) 前进, 再沿左法向量 (-uy, ux) 偏移; 零长度线段取相邻线段的方向
+        seg = p - line
+        ux, uy = self._ux[seg], self._uy[seg]
+        ds = s - self.ps[p]
+        return self.px[p] + ds * ux - t * uy, self.py[p] + ds * uy + t * ux
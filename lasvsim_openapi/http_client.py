@@ -1,11 +1,15 @@
 """
 HTTP client module for the lasvsim API.
 """
-from typing import Any, Dict, Callable, Optional, Type, TypeVar,Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Callable, List, Optional, Sequence, TypeVar,Tuple, Union
 import urllib3
-import ujson
 from urllib.parse import urlparse,urljoin
 
+from lasvsim_openapi.codec import Codec, WireFormat, get_codec
+from lasvsim_openapi.compression import Compression
+
 class ErrorReason:
     """Error reason constants."""
     CALL_GRPC_ERR = "CALL_GRPC_ERR"
@@ -62,92 +66,346 @@ class HttpConfig:
     """Configuration for the HTTP client."""
     token: str = ""
     endpoint: str = ""
+    pool_maxsize: int = 500
+    pool_block: bool = False
+    codec: Union[str, Codec] = "ujson"
+    wire_format: str = "json"
+    compression: Optional[str] = None
+    compression_threshold: int = 1024
+    timeout: Optional[float] = None
 
-    def __init__(self, token: str = "", endpoint: str = ""):
+    def __init__(
+        self,
+        token: str = "",
+        endpoint: str = "",
+        pool_maxsize: int = 500,
+        pool_block: bool = False,
+        codec: Union[str, Codec] = "ujson",
+        wire_format: str = "json",
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+        timeout: Optional[float] = None,
+    ):
         """Initialize HTTP configuration.
         
         Args:
             token: Authentication token
             endpoint: API endpoint URL
+            pool_maxsize: Maximum number of keep-alive connections kept by the
+                pool shared between a client and all of its clones
+            pool_block: Whether requests wait for a free connection once
+                pool_maxsize connections are in use instead of opening extra
+                short-lived ones
+            codec: Body codec, "ujson" (default), "orjson" or a Codec instance
+            wire_format: "json" (default) or "msgpack" to negotiate msgpack
+                bodies with the server, falling back to JSON if it does not
+                support them
+            compression: "gzip" or "deflate" to compress large request
+                bodies and accept compressed responses, None (default) to
+                send everything uncompressed
+            compression_threshold: Minimum request body size in bytes to
+                compress
+            timeout: Seconds to wait for a connection to open and for the
+                response to a request, None (default) to wait indefinitely
         """
         self.token = token
         self.endpoint = endpoint
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.codec = codec
+        self.wire_format = wire_format
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.timeout = timeout
 
 
 T = TypeVar('T')
 
-class HttpClient():
-    """HTTP client for the API."""
+# 标记共享线程池中的工作线程, 避免嵌套 gather 占满线程池导致死锁
+_worker_state = threading.local()
+
+
+def _mark_worker():
+    _worker_state.in_pool = True
+
+
+class SharedPool:
+    """Connection pool shared by an HttpClient and all of its clones.
+
+    Every clone only carries its own headers; the TCP/TLS connections are
+    owned here, so the number of sockets stays bounded by ``maxsize`` no
+    matter how many simulators a process drives.
+    """
+    config: HttpConfig = None
+    pool: urllib3.connectionpool.HTTPConnectionPool = None
+    wire: WireFormat = None
+    compression: Compression = None
+    max_workers: int = 32
+
+    def __init__(self, config: HttpConfig):
+        """Initialize the shared pool.
+        
+        Args:
+            config: Client configuration
+        """
+        self.config = config
+        self.pool = self._new_pool(config.pool_maxsize, config.pool_block)
+        self.wire = WireFormat(get_codec(config.codec), config.wire_format)
+        self.compression = Compression(config.compression, config.compression_threshold)
+        self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker threads used to fan out concurrent requests, created on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(self.max_workers, self.maxsize or 1),
+                initializer=_mark_worker,
+            )
+        return self._executor
+
+    def _new_pool(self, maxsize: int, block: bool) -> urllib3.connectionpool.HTTPConnectionPool:
+        parsed_url = urlparse(self.config.endpoint)
+        host = parsed_url.hostname
+        port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+
+        if parsed_url.scheme == "http":
+            pool_cls = urllib3.connectionpool.HTTPConnectionPool
+        else:
+            pool_cls = urllib3.connectionpool.HTTPSConnectionPool
+        return pool_cls(
+            host=host,
+            port=port,
+            maxsize=maxsize,
+            block=block,
+            retries=urllib3.Retry(total=3, backoff_factor=0.5),
+            timeout=urllib3.Timeout.DEFAULT_TIMEOUT if self.config.timeout is None else self.config.timeout,
+        )
+
+    @property
+    def maxsize(self) -> int:
+        return self.pool.pool.maxsize if self.pool.pool is not None else 0
+
+    def resize(self, maxsize: int, block: Optional[bool] = None):
+        """Replace the pool with one of a different size.
+
+        Requests already in flight finish on the old pool; their connections
+        are closed instead of being returned to it.
+
+        Args:
+            maxsize: Maximum number of keep-alive connections
+            block: Whether to block when all connections are in use,
+                defaults to the current setting
+        """
+        if maxsize < 1:
+            raise ValueError("pool maxsize must be at least 1")
+        if block is None:
+            block = self.pool.block
+        old_pool = self.pool
+        self.pool = self._new_pool(maxsize, block)
+        old_pool.close()
+        # 工作线程数跟随新的连接数, 下次使用时重建; 旧线程执行完已提交的调用后随旧执行器回收
+        self._executor = None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.pool.close()
+
+
+class BaseHttpClient():
+    """Request encoding and response handling shared by the sync and async clients."""
     config: HttpConfig = None
     headers: Dict[str, str] = {}
-    
-    def __init__(self, config: HttpConfig, headers: Dict[str, str] = None):
+    codec: Codec = None
+    wire: WireFormat = None
+    compression: Compression = None
+
+    def __init__(
+        self,
+        config: HttpConfig,
+        headers: Dict[str, str] = None,
+        wire: WireFormat = None,
+        compression: Compression = None,
+    ):
         """Initialize HTTP client.
         
         Args:
             config: Client configuration
             headers: Optional custom headers
+            wire: Optional wire format negotiation state to share, a new
+                one is created from the configuration when omitted
+            compression: Optional compression settings and stats to share,
+                new ones are created from the configuration when omitted
         """
         self.config = config
+        self.wire = wire or WireFormat(get_codec(config.codec), config.wire_format)
+        self.compression = compression or Compression(config.compression, config.compression_threshold)
+        self.codec = self.wire.json_codec
         self.headers = headers or {}
         self.headers["Authorization"] = f"Bearer {config.token}"
-        self.headers["Content-Type"] = "application/json"
+        self.headers["Content-Type"] = self.codec.content_type
         self.headers["Connection"] = "keep-alive"
+        if self.wire.accept:
+            self.headers["Accept"] = self.wire.accept
+        if self.compression.accept_encoding:
+            self.headers["Accept-Encoding"] = self.compression.accept_encoding
+
+    def _encode_body(self, data: Any = None, path: str = "") -> Tuple[Optional[bytes], Dict[str, str]]:
+        """Encode a request body in the negotiated wire format and compress it if large.
 
-        parsed_url = urlparse(config.endpoint)
-        host = parsed_url.hostname
-        port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
-        
-        if parsed_url.scheme == "http":
-            self.http = urllib3.connectionpool.HTTPConnectionPool(
-                host=host,
-                port=port,
-                maxsize=500,
-                retries=urllib3.Retry(total=3, backoff_factor=0.5),
-            )
-        else:
-            self.http = urllib3.connectionpool.HTTPSConnectionPool(
-                host=host,
-                port=port,
-                maxsize=500,
-                retries=urllib3.Retry(total=3, backoff_factor=0.5),
-            )
-    def clone(self) -> 'HttpClient':
-        """Create a clone of this client.
-        
         Returns:
-            A new HttpClient instance with the same configuration
+            A tuple of (body, headers with the matching Content-Type and
+            Content-Encoding)
         """
+        codec = self.wire.request_codec()
+        body, encoding = self.compression.compress_body(path, codec.encode(data) if data else None)
+        headers = self.headers
+        if codec is not self.codec or encoding is not None:
+            headers = dict(headers)
+            headers["Content-Type"] = codec.content_type
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+        return body, headers
 
-        return HttpClient(self.config, dict(self.headers))
+    def _fallback(self, err: Exception, headers: Dict[str, str]) -> bool:
+        """Whether a request rejected with 415 should be resent in a plainer form."""
+        if not isinstance(err, APIError) or err.status_code != 415:
+            return False
+        # 服务端不支持压缩请求体或二进制格式, 之后统一回退
+        if headers.get("Content-Encoding"):
+            self.compression.reject()
+            return True
+        if headers.get("Content-Type") != self.codec.content_type:
+            self.wire.reject_binary()
+            return True
+        return False
 
-    def close(self):
-        """Close the underlying HTTP connection"""
-        self.http.close()
+    def _decode_content(self, path: str, data: bytes, content_encoding: Optional[str]) -> bytes:
+        return self.compression.decompress_body(urlparse(path).path, data, content_encoding)
 
-    def _handle_response(self,headers, response: urllib3.HTTPResponse) -> Optional[T]:
-        if response.status != 200:
-            if response.status == 401:
+    def _handle_body(self, headers, status: int, data: bytes, content_type: Optional[str] = None) -> Optional[T]:
+        if status != 200:
+            if status == 401:
                 print("Unauthorized: Please check your authentication token. and headers:",headers)
             try:
-                error_data = ujson.loads(response.data)
+                error_data = self.wire.response_codec(content_type).decode(data)
             except Exception as e:
-                data = response.data.decode('utf-8')
+                data = data.decode('utf-8')
                 error_data = {"message": f'client parse json error:{e},data:{data}'}
 
             reason = error_data.get('reason') if isinstance(error_data, dict) else None
             raise APIError(
-                status_code=response.status,
+                status_code=status,
                 message=error_data.get('message'),
                 reason=reason,
             )
         
         # if out_type is None:
         #     return None
-        response_data = ujson.loads(response.data)
+        response_data = self.wire.response_codec(content_type).decode(data)
         return response_data
+
+
+class HttpClient(BaseHttpClient):
+    """HTTP client for the API."""
+    shared_pool: SharedPool = None
+    
+    def __init__(self, config: HttpConfig, headers: Dict[str, str] = None, shared_pool: SharedPool = None):
+        """Initialize HTTP client.
+        
+        Args:
+            config: Client configuration
+            headers: Optional custom headers
+            shared_pool: Optional connection pool to reuse, a new one is
+                created when omitted
+        """
+        # 只有创建连接池的客户端负责关闭它
+        self._owns_pool = shared_pool is None
+        self.shared_pool = shared_pool or SharedPool(config)
+        super().__init__(config, headers, self.shared_pool.wire, self.shared_pool.compression)
+
+    @property
+    def http(self) -> urllib3.connectionpool.HTTPConnectionPool:
+        """The underlying urllib3 connection pool."""
+        return self.shared_pool.pool
+
+    def clone(self) -> 'HttpClient':
+        """Create a clone of this client.
+
+        The clone gets its own copy of the headers but shares the connection
+        pool with this client.
+        
+        Returns:
+            A new HttpClient instance with the same configuration
+        """
+
+        return HttpClient(self.config, dict(self.headers), shared_pool=self.shared_pool)
+
+    def set_pool_size(self, maxsize: int, block: Optional[bool] = None):
+        """Resize the connection pool shared by this client and its clones.
+
+        Args:
+            maxsize: Maximum number of keep-alive connections
+            block: Whether to block when all connections are in use
+        """
+        self.shared_pool.resize(maxsize, block)
+
+    def gather(self, calls: Sequence[Callable[[], T]], return_exceptions: bool = False) -> List[T]:
+        """Run several request callables concurrently over the shared pool.
+
+        A single call, or calls gathered from inside another gathered call,
+        run sequentially on the calling thread.
+
+        Args:
+            calls: Zero-argument callables, typically issuing one request each
+            return_exceptions: Return errors in place of results instead of
+                raising the first one
+
+        Returns:
+            Results in call order
+        """
+        if len(calls) <= 1 or getattr(_worker_state, "in_pool", False):
+            futures = None
+        else:
+            futures = [self.shared_pool.executor.submit(call) for call in calls]
+
+        results = []
+        first_error = None
+        for i, call in enumerate(calls):
+            try:
+                results.append(futures[i].result() if futures is not None else call())
+            except Exception as e:
+                if first_error is None:
+                    first_error = e
+                results.append(e)
+        if first_error is not None and not return_exceptions:
+            raise first_error
+        return results
+
+    def compression_stats(self) -> Dict[str, dict]:
+        """Per-endpoint request/response byte counters shared with all clones."""
+        return self.compression.stats()
+
+    def close(self):
+        """Close the underlying HTTP connection pool.
+
+        Only the client that created the pool closes it, which also closes
+        it for every clone; closing a clone does nothing, so components can
+        close their clones without cutting off the others.
+        """
+        if self._owns_pool:
+            self.shared_pool.close()
+
+    def _handle_response(self,headers, response: urllib3.HTTPResponse, path: str = "") -> Optional[T]:
+        data = self._decode_content(path, response.data, response.headers.get("Content-Encoding"))
+        return self._handle_body(headers, response.status, data, response.headers.get("Content-Type"))
     
     def do(self, method, url, fields=None, headers=None, **urlopen_kw):
+        path = url
+        # 响应体由 _decode_content 解压, 以便统计传输字节数
+        urlopen_kw.setdefault("decode_content", False)
         try:
             # path join
             url = self.config.endpoint + url
@@ -159,7 +417,7 @@ class HttpClient():
             else:
                 response = self.http.request(method, url, headers=headers, **urlopen_kw)
 
-            return self._handle_response(headers,response)
+            return self._handle_response(headers,response,path)
         except APIError as e:
             e.url = f"{method},{url}"
             raise e
@@ -179,8 +437,13 @@ class HttpClient():
 
     def post(self, path: str, data: Any = None):
         try:
-            encoded_data = ujson.dumps(data) if data else None
-            return self.do("POST", path, body=encoded_data, headers=self.headers)
+            while True:
+                encoded_data, headers = self._encode_body(data, path)
+                try:
+                    return self.do("POST", path, body=encoded_data, headers=headers)
+                except APIError as e:
+                    if not self._fallback(e, headers):
+                        raise e
         except Exception as e:
             # 兜底打印
             print(f"http request error{e},method:POST,path:{path}")
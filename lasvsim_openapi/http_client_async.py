@@ -0,0 +1,350 @@
+"""
+Asyncio HTTP client module for the lasvsim API.
+"""
+import asyncio
+import ssl
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+from lasvsim_openapi.codec import WireFormat, get_codec
+from lasvsim_openapi.compression import Compression
+from lasvsim_openapi.http_client import APIError, BaseHttpClient, HttpConfig
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+# 与 urllib3.Retry 默认一致: 请求发出后出错, 只重试幂等方法
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"))
+
+
+class _StaleConnectionError(ConnectionError):
+    """A reused keep-alive connection was closed by the server before replying."""
+
+
+class AsyncSharedPool:
+    """Keep-alive HTTP/1.1 connections shared by an AsyncHttpClient and its clones.
+
+    The pool is bound to the event loop that first uses it, like the
+    streams it holds.
+    """
+    config: HttpConfig = None
+    maxsize: int = 500
+    wire: WireFormat = None
+    compression: Compression = None
+    retries: int = 3
+    backoff_factor: float = 0.5
+
+    def __init__(self, config: HttpConfig):
+        """Initialize the shared pool.
+
+        Args:
+            config: Client configuration
+        """
+        self.config = config
+        self.maxsize = config.pool_maxsize
+        self.wire = WireFormat(get_codec(config.codec), config.wire_format)
+        self.compression = Compression(config.compression, config.compression_threshold)
+
+        parsed_url = urlparse(config.endpoint)
+        self.scheme = parsed_url.scheme
+        self.host = parsed_url.hostname
+        self.port = parsed_url.port or (443 if parsed_url.scheme == "https" else 80)
+        self.base_path = parsed_url.path.rstrip("/")
+        self.host_header = self.host if parsed_url.port is None else f"{self.host}:{self.port}"
+        self.ssl_context = ssl.create_default_context() if self.scheme == "https" else None
+
+        self._idle: List[_Connection] = []
+        self._in_use = 0
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or in use."""
+        return len(self._idle) + self._in_use
+
+    def resize(self, maxsize: int):
+        """Change the maximum number of connections.
+
+        Args:
+            maxsize: Maximum number of keep-alive connections
+        """
+        if maxsize < 1:
+            raise ValueError("pool maxsize must be at least 1")
+        self.maxsize = maxsize
+        while len(self._idle) > maxsize:
+            self._close_conn(self._idle.pop(0))
+        self._wake_waiters()
+
+    async def _acquire(self) -> Tuple[_Connection, bool]:
+        while self._in_use >= self.maxsize:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                # 被唤醒后、继续运行前被取消, 把空出的连接转交给下一个等待者
+                if not waiter.cancelled():
+                    self._wake_waiters()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_use += 1
+
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if writer.is_closing() or reader.at_eof():
+                self._close_conn((reader, writer))
+                continue
+            return (reader, writer), True
+
+        try:
+            conn = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.ssl_context), self.config.timeout,
+            )
+        except BaseException:
+            self._release(None)
+            raise
+        return conn, False
+
+    def _release(self, conn: Optional[_Connection], reusable: bool = False):
+        self._in_use -= 1
+        if conn is not None:
+            if reusable and len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+            else:
+                self._close_conn(conn)
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    @staticmethod
+    def _close_conn(conn: _Connection):
+        conn[1].close()
+
+    async def request(self, method: str, path: str, headers: Dict[str, str], body: Optional[bytes] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Send a request over a pooled connection.
+
+        Failures to connect, including timeouts, are retried with
+        exponential backoff, and a request that hits a keep-alive connection
+        the server already closed is resent on a fresh one. Errors after the
+        request was sent, including a response that takes longer than
+        HttpConfig.timeout, are retried only for idempotent methods, as
+        urllib3.Retry does for the sync client, so a POST such as a
+        simulation step is never sent twice.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to the endpoint, including the query string
+            headers: Request headers
+            body: Optional encoded request body
+
+        Returns:
+            A tuple of (status code, lower-cased response headers, body)
+        """
+        head = [f"{method} {self.base_path}{path} HTTP/1.1", f"Host: {self.host_header}"]
+        for key, value in headers.items():
+            head.append(f"{key}: {value}")
+        if body is not None:
+            head.append(f"Content-Length: {len(body)}")
+        elif method in ("POST", "PUT", "PATCH"):
+            head.append("Content-Length: 0")
+        payload = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1")
+        if body is not None:
+            payload += body
+
+        attempt = 0
+        while True:
+            try:
+                conn, reused = await self._acquire()
+            except (OSError, asyncio.TimeoutError):
+                # 连接失败, 请求尚未发出
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                await self._backoff(attempt)
+                continue
+            try:
+                status, resp_headers, data, keep_alive = await self._roundtrip(conn, method, payload, reused)
+            except _StaleConnectionError:
+                self._release(conn)
+                continue
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                self._release(conn)
+                attempt += 1
+                if method not in _IDEMPOTENT_METHODS or attempt > self.retries:
+                    raise
+                await self._backoff(attempt)
+                continue
+            except BaseException:
+                self._release(conn)
+                raise
+            self._release(conn, keep_alive)
+            return status, resp_headers, data
+
+    async def _backoff(self, attempt: int):
+        await asyncio.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+
+    async def _roundtrip(
+        self, conn: _Connection, method: str, payload: bytes, reused: bool
+    ) -> Tuple[int, Dict[str, str], bytes, bool]:
+        reader, writer = conn
+        writer.write(payload)
+        try:
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), self.config.timeout)
+        except asyncio.TimeoutError:
+            # 超时不是连接失效, 请求可能已被处理 (Python 3.11 起 TimeoutError 是 OSError)
+            raise
+        except OSError:
+            if reused:
+                raise _StaleConnectionError()
+            raise
+        if not status_line:
+            if reused:
+                raise _StaleConnectionError()
+            raise ConnectionResetError("connection closed before response")
+
+        version, status, _ = (status_line.decode("latin-1").rstrip("\r\n") + "  ").split(" ", 2)
+        return await asyncio.wait_for(self._read_response(reader, method, version, int(status)), self.config.timeout)
+
+    @staticmethod
+    async def _read_response(
+        reader: asyncio.StreamReader, method: str, version: str, status: int
+    ) -> Tuple[int, Dict[str, str], bytes, bool]:
+        resp_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            resp_headers[key.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and resp_headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304):
+            # 这些响应没有响应体, 即使带有 Content-Length
+            data = b""
+        elif resp_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in resp_headers:
+            data = await reader.readexactly(int(resp_headers["content-length"]))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return status, resp_headers, data, keep_alive
+
+    async def close(self):
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for reader, writer in idle:
+            writer.close()
+        for reader, writer in idle:
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+
+class AsyncHttpClient(BaseHttpClient):
+    """Asyncio HTTP client for the API."""
+    shared_pool: AsyncSharedPool = None
+
+    def __init__(self, config: HttpConfig, headers: Dict[str, str] = None, shared_pool: AsyncSharedPool = None):
+        """Initialize HTTP client.
+
+        Args:
+            config: Client configuration
+            headers: Optional custom headers
+            shared_pool: Optional connection pool to reuse, a new one is
+                created when omitted
+        """
+        # 只有创建连接池的客户端负责关闭它
+        self._owns_pool = shared_pool is None
+        self.shared_pool = shared_pool or AsyncSharedPool(config)
+        super().__init__(config, headers, self.shared_pool.wire, self.shared_pool.compression)
+
+    def clone(self) -> 'AsyncHttpClient':
+        """Create a clone of this client.
+
+        The clone gets its own copy of the headers but shares the connection
+        pool with this client.
+
+        Returns:
+            A new AsyncHttpClient instance with the same configuration
+        """
+        return AsyncHttpClient(self.config, dict(self.headers), shared_pool=self.shared_pool)
+
+    def set_pool_size(self, maxsize: int):
+        """Resize the connection pool shared by this client and its clones.
+
+        Args:
+            maxsize: Maximum number of keep-alive connections
+        """
+        self.shared_pool.resize(maxsize)
+
+    def compression_stats(self) -> Dict[str, dict]:
+        """Per-endpoint request/response byte counters shared with all clones."""
+        return self.compression.stats()
+
+    async def close(self):
+        """Close the underlying connection pool, shared with every clone.
+
+        Only the client that created the pool closes it; closing a clone
+        does nothing.
+        """
+        if self._owns_pool:
+            await self.shared_pool.close()
+
+    async def do(self, method, url, fields=None, headers=None, body=None):
+        try:
+            if fields:
+                url = f"{url}?{urlencode(fields)}"
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            status, response_headers, data = await self.shared_pool.request(method, url, headers or {}, body)
+            data = self._decode_content(url, data, response_headers.get("content-encoding"))
+            return self._handle_body(headers, status, data, response_headers.get("content-type"))
+        except APIError as e:
+            e.url = f"{method},{self.config.endpoint + url}"
+            raise e
+        except Exception as e:
+            raise APIError(
+                message=f"Failed to get response. Error: {e!r}",
+                url=f"{method},{self.config.endpoint + url}"
+            )
+
+    async def get(self, path: str, params: Dict[str, str] = None):
+        try:
+            return await self.do("GET", path, fields=params, headers=self.headers)
+        except Exception as e:
+            # 兜底打印
+            print(f"http request error{e},method:GET,path:{path}")
+            raise e
+
+    async def post(self, path: str, data: Any = None):
+        try:
+            while True:
+                encoded_data, headers = self._encode_body(data, path)
+                try:
+                    return await self.do("POST", path, body=encoded_data, headers=headers)
+                except APIError as e:
+                    if not self._fallback(e, headers):
+                        raise e
+        except Exception as e:
+            # 兜底打印
+            print(f"http request error{e},method:POST,path:{path}")
+            raise e
@@ -0,0 +1,244 @@
+"""
+Lazy model decoding module for the lasvsim API.
+
+lazy_from_dict(cls, data) returns an instance of a subclass of ``cls`` that
+keeps the raw reply dict and decodes each field on first attribute access.
+The subclass carries the same name, fields and methods as ``cls``, so
+isinstance checks, equality, repr and dataclasses.asdict behave as for
+instances built by ``cls.from_dict``.
+"""
+import dataclasses
+import inspect
+import sys
+import typing
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
+
+T = TypeVar('T')
+
+_lazy_classes: Dict[type, type] = {}
+
+_IMMUTABLE = (bool, int, float, str, Enum)
+
+
+def _is_model(tp: Any) -> bool:
+    return isinstance(tp, type) and dataclasses.is_dataclass(tp) and hasattr(tp, "from_dict")
+
+
+def _unwrap_optional(tp: Any) -> Any:
+    if getattr(tp, "__origin__", None) is typing.Union:
+        args = [a for a in tp.__args__ if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return tp
+
+
+def _converter(tp: Any) -> Optional[Callable[[Any], Any]]:
+    """Build a function converting a raw value of type ``tp``, None for raw values."""
+    tp = _unwrap_optional(tp)
+    if _is_model(tp):
+        return lambda value: lazy_from_dict(tp, value)
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tp
+
+    origin = getattr(tp, "__origin__", None)
+    args = getattr(tp, "__args__", None) or ()
+    if origin is list and args:
+        item = _converter(args[0])
+        if item is not None:
+            return lambda value: [item(v) for v in value] if value is not None else None
+    elif origin is dict and len(args) == 2:
+        item = _converter(args[1])
+        if item is not None:
+            return lambda value: {k: item(v) for k, v in value.items()} if value is not None else None
+    return None
+
+
+def _container_type(tp: Any) -> Optional[type]:
+    origin = getattr(_unwrap_optional(tp), "__origin__", None)
+    return origin if origin in (list, dict) else None
+
+
+class _LazyField:
+    """Non-data descriptor decoding one field from the raw dict on first access."""
+    __slots__ = ("name", "default", "convert", "container")
+
+    def __init__(
+        self,
+        name: str,
+        default: Any,
+        convert: Optional[Callable[[Any], Any]],
+        container: Optional[type] = None,
+    ):
+        self.name = name
+        self.default = default
+        self.convert = convert
+        self.container = container
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj._data.get(self.name, self.default)
+        if value is None:
+            # 与 from_dict 一致: 缺省的列表/字典字段为空容器
+            if self.container is not None:
+                value = self.container()
+        elif self.convert is not None:
+            value = self.convert(value)
+        obj.__dict__[self.name] = value
+        return value
+
+
+def _rebuild(cls: type, values: dict):
+    return cls(**values)
+
+
+def _lazy_eq(self, other):
+    base = type(self)._lazy_base
+    if not isinstance(other, base):
+        return NotImplemented
+    names = [f.name for f in dataclasses.fields(base) if f.compare]
+    return all(getattr(self, n) == getattr(other, n) for n in names)
+
+
+def _lazy_reduce(self):
+    base = type(self)._lazy_base
+    return _rebuild, (base, {f.name: getattr(self, f.name) for f in dataclasses.fields(base) if f.init})
+
+
+def _declared(cls: type, attr: str, names: set) -> set:
+    declared = set(getattr(cls, attr, ()))
+    unknown = declared - names
+    if unknown:
+        raise TypeError(f"{cls.__qualname__}.{attr} names unknown fields: {', '.join(sorted(unknown))}")
+    return declared
+
+
+def _field_specs(cls: type) -> list:
+    """Describe how from_dict decodes each field of a model class.
+
+    The description comes from the type hints, the ``__init__`` defaults and
+    three optional class attributes listing field names:
+
+    - ``_enum_fields``: enum fields whose raw values are converted to the enum
+    - ``_raw_enum_fields``: enum fields whose raw values are kept as they are
+    - ``_default_instance_fields``: model fields decoded from ``{}`` when the
+      key is missing, giving a default instance instead of None
+
+    Every field with an enum type must be listed in one of the first two.
+
+    Returns:
+        A list of (name, type hint, default, container) tuples, where
+        default is used for a missing key and container is list or dict
+        for fields that decode a missing value as an empty container
+
+    Raises:
+        TypeError: If the class attributes are missing or inconsistent
+            with the type hints
+    """
+    module = sys.modules.get(cls.__module__)
+    hints = typing.get_type_hints(cls, vars(module) if module else None)
+    try:
+        params = inspect.signature(cls.__init__).parameters
+    except (TypeError, ValueError):
+        params = {}
+    try:
+        defaults = cls()
+    except TypeError:
+        defaults = None
+
+    fields = dataclasses.fields(cls)
+    names = {f.name for f in fields}
+    enum_fields = _declared(cls, "_enum_fields", names)
+    raw_enum_fields = _declared(cls, "_raw_enum_fields", names)
+    default_instance_fields = _declared(cls, "_default_instance_fields", names)
+    if enum_fields & raw_enum_fields:
+        raise TypeError(f"{cls.__qualname__} lists {', '.join(sorted(enum_fields & raw_enum_fields))} "
+                        "in both _enum_fields and _raw_enum_fields")
+    specs = []
+    for f in fields:
+        tp = hints.get(f.name)
+        param = params.get(f.name)
+        if param is not None and param.default is not inspect.Parameter.empty:
+            default = param.default
+            if default is dataclasses._HAS_DEFAULT_FACTORY:
+                default = f.default_factory()
+        else:
+            # 无参 __init__ 的模型: 默认值取自 __init__ 中的赋值, 仅保留不可变值
+            default = getattr(defaults, f.name, None)
+            if not isinstance(default, _IMMUTABLE):
+                default = None
+        leaf = _unwrap_optional(tp)
+        if _container_type(leaf) is not None and getattr(leaf, "__args__", None):
+            leaf = leaf.__args__[-1]
+        is_enum = isinstance(leaf, type) and issubclass(leaf, Enum)
+        if is_enum != (f.name in enum_fields or f.name in raw_enum_fields):
+            raise TypeError(
+                f"{cls.__qualname__}.{f.name} must be listed in _enum_fields or _raw_enum_fields"
+                if is_enum else f"{cls.__qualname__}.{f.name} is listed as an enum field but is not one"
+            )
+        if f.name in raw_enum_fields:
+            # from_dict 原样保存数值, 不转换为枚举
+            tp = None
+        container = _container_type(tp)
+        if f.name in default_instance_fields:
+            if container is not None or not _is_model(_unwrap_optional(tp)):
+                raise TypeError(f"{cls.__qualname__}.{f.name} is listed in _default_instance_fields but is not a model")
+            default = {}
+        elif container is not None:
+            default = None
+        specs.append((f.name, tp, default, container))
+    return specs
+
+
+def lazy_class(cls: Type[T]) -> Type[T]:
+    """Get the lazy subclass of a model class, creating it on first use.
+
+    Args:
+        cls: A dataclass model with a from_dict classmethod
+
+    Returns:
+        The lazy subclass
+    """
+    lazy_cls = _lazy_classes.get(cls)
+    if lazy_cls is not None:
+        return lazy_cls
+
+    namespace = {
+        "_lazy_base": cls,
+        "__eq__": _lazy_eq,
+        "__hash__": None,
+        "__reduce__": _lazy_reduce,
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        "__doc__": cls.__doc__,
+    }
+    for name, tp, default, container in _field_specs(cls):
+        namespace[name] = _LazyField(name, default, _converter(tp), container)
+
+    lazy_cls = type(cls.__name__, (cls,), namespace)
+    _lazy_classes[cls] = lazy_cls
+    return lazy_cls
+
+
+def lazy_from_dict(cls: Type[T], data: dict = None) -> Optional[T]:
+    """Wrap a raw reply dict in a lazily decoded instance of cls.
+
+    Args:
+        cls: Model class, e.g. GetVehiclePositionRes
+        data: Raw reply dict, kept by reference and not copied
+
+    Returns:
+        An instance of a subclass of cls, or None if data is None
+    """
+    if data is None:
+        return None
+    lazy_cls = _lazy_classes.get(cls) or lazy_class(cls)
+    instance = object.__new__(lazy_cls)
+    instance._data = data
+    return instance
+
+
+def is_lazy(obj: Any) -> bool:
+    """Whether obj was created by lazy_from_dict."""
+    return hasattr(type(obj), "_lazy_base")
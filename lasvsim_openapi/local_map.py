@@ -0,0 +1,342 @@
+"""
+Local map assembly from an HD map for road perception injection.
+
+LocalMapBuilder(hd_map).build(x, y) returns the simulator_model.LocalMap of
+the map features around an ego position, ready for
+Simulator.set_vehicle_road_perception_info.
+"""
+import copy
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "LocalMapBuilder requires numpy, install it with `pip install lasvsim-openapi[numpy]`"
+    ) from e
+
+from lasvsim_openapi.map_index import SegmentGrid
+from lasvsim_openapi.qxmap import LaneMark, LaneMark_LaneMarkStyle, Qxmap
+from lasvsim_openapi.simulator_model import (
+    LaneBoundary,
+    LaneCenterLines,
+    LineString,
+    LocalMap,
+    Point,
+    Polygon,
+    ReferenceLines,
+    StopLines,
+)
+
+# LocalMap 中由地图生成的字段, 也是要素在表中的排列顺序
+KINDS = ("lane_boundaries", "lane_center_lines", "stop_lines", "crosswalks", "junctions", "reference_lines")
+
+
+def _convert(points) -> List[Point]:
+    result = []
+    for p in points:
+        if p is not None and p.x is not None and p.y is not None:
+            result.append(Point(p.x, p.y, p.z or 0.0))
+    return result
+
+
+def _mark_style(mark: Optional[LaneMark]) -> str:
+    """Lane mark style as its enum name, e.g. LANE_MARK_STYLE_SOLID; "" when unknown."""
+    style = getattr(mark, "style", None)
+    if isinstance(style, str):
+        return style
+    if not style:
+        return ""
+    try:
+        return LaneMark_LaneMarkStyle(style).name
+    except ValueError:
+        return str(style)
+
+
+def _mark_color(mark: Optional[LaneMark]) -> str:
+    color = getattr(mark, "color", None)
+    return str(color) if color else ""
+
+
+def _cumulative(points: List[Point]) -> List[float]:
+    cum = [0.0]
+    for a, b in zip(points, points[1:]):
+        cum.append(cum[-1] + math.hypot(b.x - a.x, b.y - a.y))
+    return cum
+
+
+def _interpolate(a: Point, b: Point, t: float) -> Point:
+    return Point(a.x + (b.x - a.x) * t, a.y + (b.y - a.y) * t, a.z + (b.z - a.z) * t)
+
+
+def _slice(points: List[Point], cum: List[float], start: float, end: float) -> List[Point]:
+    """Part of a polyline between two arc lengths."""
+    result = []
+    for i in range(1, len(points)):
+        s0, s1 = cum[i - 1], cum[i]
+        if s1 < start or s0 > end:
+            continue
+        length = s1 - s0
+        if not result:
+            t = (start - s0) / length if length > 0 else 0.0
+            result.append(_interpolate(points[i - 1], points[i], max(t, 0.0)))
+        if s1 < end:
+            result.append(points[i])
+        else:
+            t = (end - s0) / length if length > 0 else 1.0
+            result.append(_interpolate(points[i - 1], points[i], min(t, 1.0)))
+            break
+    return result
+
+
+def _boundary_pieces(points: List[Point], marks: List[LaneMark], lane_length: float) -> List[LaneBoundary]:
+    """Split a lane boundary by its lane marks, each piece with the style and color of its mark.
+
+    Mark positions are along the lane; they are scaled to the boundary's own
+    length, which differs from the lane's on curves.
+    """
+    marks = sorted((m for m in marks or () if m is not None), key=lambda m: m.s or 0.0)
+    if len(marks) <= 1:
+        mark = marks[0] if marks else None
+        return [LaneBoundary(LineString(points), _mark_style(mark), _mark_color(mark))]
+    cum = _cumulative(points)
+    total = cum[-1]
+    scale = total / lane_length if lane_length > 0 else 1.0
+    starts = [0.0] + [min(max((m.s or 0.0) * scale, 0.0), total) for m in marks[1:]]
+    ends = starts[1:] + [total]
+    pieces = []
+    for mark, start, end in zip(marks, starts, ends):
+        if end > start:
+            pieces.append(LaneBoundary(
+                LineString(_slice(points, cum, start, end)), _mark_style(mark), _mark_color(mark)
+            ))
+    return pieces
+
+
+def _boundary_key(points: List[Point]) -> tuple:
+    # 端点排序后作为键, 反向存储的共用边界也能去重
+    a, b = points[0], points[-1]
+    ends = sorted([(round(a.x, 2), round(a.y, 2)), (round(b.x, 2), round(b.y, 2))])
+    return (*ends[0], *ends[1], len(points))
+
+
+def _line_features(hd_map: Qxmap) -> Dict[str, list]:
+    """Map features by LocalMap field, each a list of simulator_model objects."""
+    features = {kind: [] for kind in KINDS}
+    seen_boundaries = set()
+    seen_stoplines = set()
+    for link in hd_map.iter_links():
+        for lane in link.ordered_lanes or ():
+            lane_length = None
+            for boundary, marks in ((lane.left_boundary, lane.left_lane_marks),
+                                    (lane.right_boundary, lane.right_lane_marks)):
+                points = _convert(boundary.points) if boundary is not None else []
+                if len(points) < 2:
+                    continue
+                # 相邻车道共用的边界只保留一条
+                key = _boundary_key(points)
+                if key not in seen_boundaries:
+                    seen_boundaries.add(key)
+                    if lane_length is None:
+                        lane_length = lane.length or _cumulative(_convert(c.point for c in lane.center_line))[-1]
+                    features["lane_boundaries"].extend(_boundary_pieces(points, marks, lane_length))
+            points = _convert(c.point for c in lane.center_line)
+            if len(points) >= 2:
+                features["lane_center_lines"].append(LaneCenterLines(LineString(points)))
+            stopline = lane.stopline
+            if stopline is not None and stopline.shape is not None:
+                key = stopline.id or id(stopline)
+                points = _convert(stopline.shape.points)
+                if points and key not in seen_stoplines:
+                    seen_stoplines.add(key)
+                    features["stop_lines"].append(StopLines(LineString(points)))
+        points = _convert(r.point for r in link.reference_line)
+        if len(points) >= 2:
+            features["reference_lines"].append(ReferenceLines(LineString(points)))
+    for junction in hd_map.junctions or ():
+        if junction.shape is not None:
+            points = _convert(junction.shape.points)
+            if points:
+                features["junctions"].append(Polygon(points))
+        for crosswalk in junction.crosswalks or ():
+            if crosswalk.shape is not None:
+                points = _convert(crosswalk.shape.points)
+                if points:
+                    features["crosswalks"].append(Polygon(points))
+    return features
+
+
+def _points_of(feature) -> List[Point]:
+    line = getattr(feature, "line", None)
+    return line.points if line is not None else feature.points
+
+
+def _contains(xy: "np.ndarray", x: float, y: float) -> bool:
+    """Whether a point is inside a polygon, by the even-odd rule."""
+    x0, y0 = xy[:, 0], xy[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    crosses = (y0 > y) != (y1 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        at = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return bool(np.count_nonzero(crosses & (x < at)) % 2)
+
+
+class LocalMapBuilder:
+    """Builds the local map around an ego vehicle, step after step.
+
+    Map features (lane boundaries, lane center lines, stop lines,
+    crosswalks, junction polygons and link reference lines) are converted
+    to simulator_model objects once, and their segments are indexed by a
+    map_index.SegmentGrid. Each build keeps the features with a segment
+    within radius of the ego, plus the polygons containing it. The
+    segments of the grid cells covering the query circle are reused while
+    the ego stays in the same cells, and the previous LocalMap is returned
+    again when the selection did not change.
+
+    Lane boundaries are split by their lane marks and carry the mark style
+    (the LaneMark_LaneMarkStyle name) and color. Features are whole
+    polylines and polygons, not clipped to the radius. The returned objects
+    are shared between builds, so treat them as read-only. A builder tracks
+    one ego; use fork for more vehicles on the same map.
+    """
+
+    radius: float = 100.0
+    cell_size: float = 25.0
+
+    def __init__(
+        self,
+        hd_map: Qxmap,
+        radius: float = 100.0,
+        cell_size: float = 25.0,
+        kinds: Optional[Iterable[str]] = None,
+    ):
+        """Convert and index the map features.
+
+        Args:
+            hd_map: The map
+            radius: Default query radius in meters
+            cell_size: Grid cell edge length in meters
+            kinds: LocalMap fields to fill, see KINDS; all by default
+
+        Raises:
+            ValueError: If radius or cell_size is not positive or a kind is
+                unknown
+        """
+        if radius <= 0 or cell_size <= 0:
+            raise ValueError(f"radius and cell_size must be positive, got {radius} and {cell_size}")
+        kinds = KINDS if kinds is None else tuple(kinds)
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise ValueError(f"unknown LocalMap fields: {', '.join(sorted(unknown))}")
+        self.radius = float(radius)
+        self.cell_size = float(cell_size)
+
+        features = _line_features(hd_map)
+        self._features = []
+        # 各字段在要素表中的起止位置
+        self._kind_bounds: List[Tuple[str, int, int]] = []
+        for kind in KINDS:
+            if kind in kinds:
+                start = len(self._features)
+                self._features.extend(features[kind])
+                self._kind_bounds.append((kind, start, len(self._features)))
+
+        segments, owners = [], []
+        polygons, polygon_boxes = [], []
+        for i, feature in enumerate(self._features):
+            xy = np.array([(p.x, p.y) for p in _points_of(feature)], dtype=np.float64)
+            if isinstance(feature, Polygon) and len(xy) >= 3:
+                polygons.append((i, xy))
+                polygon_boxes.append((*xy.min(axis=0), *xy.max(axis=0)))
+                # 多边形首尾闭合
+                xy = np.vstack([xy, xy[:1]])
+            elif len(xy) == 1:
+                # 单点视为零长度线段
+                xy = np.repeat(xy, 2, axis=0)
+            segments.append(np.hstack([xy[:-1], xy[1:]]))
+            owners.append(np.full(len(xy) - 1, i, dtype=np.int64))
+        segments = np.vstack(segments) if segments else np.empty((0, 4))
+        self._grid = SegmentGrid(*(segments[:, k] for k in range(4)), cell_size=self.cell_size)
+        self._owner = np.concatenate(owners) if owners else np.empty(0, dtype=np.int64)
+        self._polygons = polygons
+        self._polygon_boxes = np.array(polygon_boxes, dtype=np.float64).reshape(-1, 4)
+        self._reset()
+
+    def _reset(self):
+        self._window: Optional[Tuple[int, int, int, int]] = None
+        self._candidates: Tuple["np.ndarray", ...] = ()
+        self._selected: Optional[np.ndarray] = None
+        self._local_map: Optional[LocalMap] = None
+
+    def fork(self) -> "LocalMapBuilder":
+        """A builder sharing the feature tables, with its own window, e.g. for another ego."""
+        other = copy.copy(self)
+        other._reset()
+        return other
+
+    def __len__(self) -> int:
+        """Number of map features."""
+        return len(self._features)
+
+    def _move_window(self, window: Tuple[int, int, int, int]):
+        grid = self._grid
+        size = self.cell_size
+        # 按格子中心取框, 避免浮点误差落到相邻格子
+        ix0, iy0, ix1, iy1 = (i + 0.5 for i in window)
+        seg = np.unique(grid._box_segments(ix0 * size, iy0 * size, ix1 * size, iy1 * size))
+        self._window = window
+        # 窗口内线段的起点, 方向与所属要素, 窗口不变时各步直接复用
+        x0, y0 = grid.x0[seg], grid.y0[seg]
+        dx, dy = grid.x1[seg] - x0, grid.y1[seg] - y0
+        length2 = dx * dx + dy * dy
+        self._candidates = (x0, y0, dx, dy, 1.0 / np.where(length2 > 0, length2, 1.0), self._owner[seg])
+
+    def build(self, x: float, y: float, radius: Optional[float] = None) -> LocalMap:
+        """Build the local map around a position.
+
+        Args:
+            x: Ego X coordinate
+            y: Ego Y coordinate
+            radius: Query radius in meters, the builder's radius by default
+
+        Returns:
+            LocalMap with the map features within radius; traffic light
+            colors and virtual polygons are left empty
+        """
+        r = self.radius if radius is None else radius
+        size = self.cell_size
+        bx0, by0, bx1, by1 = self._grid._bounds
+        # 窗口裁剪到有线段的格子范围内, 半径很大时也不会遍历空格子
+        window = (max(math.floor((x - r) / size), bx0), max(math.floor((y - r) / size), by0),
+                  min(math.floor((x + r) / size), bx1), min(math.floor((y + r) / size), by1))
+        if window != self._window:
+            self._move_window(window)
+
+        # 同 map_index.project_segments, 比较距离平方并复用窗口内的线段方向
+        x0, y0, dx, dy, inv_length2, owner = self._candidates
+        px, py = x - x0, y - y0
+        u = np.clip((px * dx + py * dy) * inv_length2, 0.0, 1.0)
+        ex, ey = px - u * dx, py - u * dy
+        hit = np.zeros(len(self._features), dtype=bool)
+        hit[owner[ex * ex + ey * ey <= r * r]] = True
+        boxes = self._polygon_boxes
+        inside = np.flatnonzero(
+            (boxes[:, 0] <= x) & (x <= boxes[:, 2]) & (boxes[:, 1] <= y) & (y <= boxes[:, 3])
+        ).tolist()
+        for k in inside:
+            i, xy = self._polygons[k]
+            if not hit[i] and _contains(xy, x, y):
+                hit[i] = True
+        selected = np.flatnonzero(hit)
+        if self._local_map is not None and np.array_equal(selected, self._selected):
+            return self._local_map
+
+        features = self._features
+        bounds = np.searchsorted(selected, [b for _, start, end in self._kind_bounds for b in (start, end)]).tolist()
+        fields = {}
+        for k, (kind, _, _) in enumerate(self._kind_bounds):
+            fields[kind] = [features[i] for i in selected[bounds[2 * k]:bounds[2 * k + 1]].tolist()]
+        self._selected = selected
+        self._local_map = LocalMap(**fields)
+        return self._local_map
@@ -0,0 +1,242 @@
+"""
+HD map disk cache module for the lasvsim API.
+"""
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from lasvsim_openapi.codec import Codec, MsgpackCodec, UjsonCodec
+from lasvsim_openapi.lazy_model import lazy_from_dict
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+
+_SAFE_DIGEST = re.compile(r"[0-9A-Za-z_-]{1,128}")
+
+# 文件扩展名对应的编码
+_CODECS = {"msgpack": MsgpackCodec, "json": UjsonCodec}
+
+
+def _digest(data: dict, body) -> str:
+    """File name stem of a map: its digest, or a hash when that is missing or unsafe in a path."""
+    digest = data.get("digest") or ""
+    if _SAFE_DIGEST.fullmatch(digest):
+        return digest
+    # 无 digest 或含特殊字符时按内容哈希寻址
+    return hashlib.sha256(digest.encode("utf-8") if digest else body).hexdigest()
+
+
+def default_cache_dir() -> str:
+    """Directory used when HdMapCache is created without one."""
+    return os.path.join(os.path.expanduser("~"), ".cache", "lasvsim_openapi", "hd_maps")
+
+
+class HdMapCache:
+    """Local cache of HD maps shared across episodes and processes.
+
+    Map data is stored once per map digest under ``maps/``, in msgpack when
+    it is installed and JSON otherwise. Small reference files under
+    ``refs/`` point each scenario version at its map, so scenarios sharing
+    a map share the file. Files are written to a temporary name and renamed
+    into place, so several processes may use one directory. Map files that
+    fail to decode, e.g. truncated by a crash, or whose digest does not
+    match their name are deleted and fetched again.
+
+    A disk hit saves the request but still decodes the whole file, which
+    costs about as much as parsing the reply, so decoded maps are also kept
+    in memory, up to memory_size of them; the same Qxmap instance is
+    returned for repeated loads along with the lane index and projectors
+    cached on it, so treat it as read-only.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self, directory: Optional[str] = None, memory_size: int = 2):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory, created if missing, see
+                default_cache_dir
+            memory_size: Number of decoded maps kept in memory, 0 to
+                disable
+        """
+        self.directory = directory or default_cache_dir()
+        self.memory_size = memory_size
+        self._maps: "OrderedDict[Tuple[str, bool, bool, bool], Qxmap]" = OrderedDict()
+        self._refs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        try:
+            self._codec: Codec = MsgpackCodec()
+        except ImportError:
+            self._codec = UjsonCodec()
+        os.makedirs(os.path.join(self.directory, "maps"), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "refs"), exist_ok=True)
+
+    def _ref_path(self, scen_id: str, scen_ver: str) -> str:
+        key = hashlib.sha1(f"{scen_id}\0{scen_ver}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "refs", key)
+
+    def _map_path(self, name: str) -> str:
+        return os.path.join(self.directory, "maps", name)
+
+    def _write(self, path: str, data: bytes):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _read_ref(self, scen_id: str, scen_ver: str) -> Optional[str]:
+        try:
+            with open(self._ref_path(scen_id, scen_ver), "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _read_map(self, name: str) -> Optional[dict]:
+        stem, _, ext = name.rpartition(".")
+        codec = _CODECS.get(ext)
+        if codec is None:
+            return None
+        path = self._map_path(name)
+        try:
+            codec = self._codec if isinstance(self._codec, codec) else codec()
+            with open(path, "rb") as f:
+                # 空文件无法映射, 视为未命中
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                # 映射只省去一次拷贝, 仍需完整解码
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        data = codec.decode(view)
+                        valid = isinstance(data, dict) and _digest(data, view) == stem
+                    finally:
+                        view.release()
+        except (FileNotFoundError, ImportError):
+            return None
+        except ValueError:
+            # 截断或损坏的文件
+            valid = False
+        if not valid:
+            # 删除后由调用方重新获取
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return None
+        return data
+
+    def _store(self, scen_id: str, scen_ver: str, data: dict) -> str:
+        codec = self._codec
+        body = codec.encode(data)
+        name = f"{_digest(data, body)}.{'msgpack' if isinstance(codec, MsgpackCodec) else 'json'}"
+        if not os.path.exists(self._map_path(name)):
+            self._write(self._map_path(name), body)
+        self._write(self._ref_path(scen_id, scen_ver), name.encode("utf-8"))
+        return name
+
+    def get_data(
+        self, scen_id: str, scen_ver: str, fetch: Optional[Callable[[], Optional[dict]]] = None
+    ) -> Optional[dict]:
+        """Load the raw map data of a scenario version, fetching it on a miss.
+
+        Args:
+            scen_id: Scenario ID
+            scen_ver: Scenario version
+            fetch: Called on a miss to get the map data, which is then
+                stored; without it a miss returns None
+
+        Returns:
+            The map data dict, or None
+        """
+        name = self._refs.get(f"{scen_id}\0{scen_ver}") or self._read_ref(scen_id, scen_ver)
+        data = None if name is None else self._read_map(name)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if data is None and fetch is not None:
+            data = fetch()
+            if data is not None:
+                name = self._store(scen_id, scen_ver, data)
+        if data is not None:
+            self._refs[f"{scen_id}\0{scen_ver}"] = name
+        return data
+
+    def get(
+        self,
+        scen_id: str,
+        scen_ver: str,
+        fetch: Optional[Callable[[], Optional[dict]]] = None,
+        lazy: bool = False,
+        arrays: bool = False,
+        generated: bool = False,
+    ) -> Optional[Qxmap]:
+        """Load the decoded map of a scenario version, fetching it on a miss.
+
+        Args:
+            scen_id: Scenario ID
+            scen_ver: Scenario version
+            fetch: Called on a miss to get the map data, see get_data
+            lazy: Decode the map lazily, see lazy_model.lazy_from_dict
+            arrays: Store lane and link polylines as arrays, see
+                polyline.decode_array_map
+            generated: Decode with the generated decoder of model_decoder;
+                maps decoded in different ways are cached separately
+
+        Returns:
+            The map, or None
+
+        Raises:
+            ValueError: If more than one of lazy, arrays and generated is set
+        """
+        if lazy + arrays + generated > 1:
+            raise ValueError("only one of lazy, arrays and generated can be set")
+        key = f"{scen_id}\0{scen_ver}"
+        name = self._refs.get(key)
+        with self._lock:
+            hd_map = None if name is None else self._maps.get((name, lazy, arrays, generated))
+            if hd_map is not None:
+                self._maps.move_to_end((name, lazy, arrays, generated))
+                self.hits += 1
+                return hd_map
+
+        data = self.get_data(scen_id, scen_ver, fetch)
+        if data is None:
+            return None
+        if arrays:
+            from lasvsim_openapi.polyline import decode_array_map
+
+            hd_map = decode_array_map(data)
+        elif generated:
+            hd_map = decode(Qxmap, data)
+        else:
+            hd_map = lazy_from_dict(Qxmap, data) if lazy else Qxmap.from_dict(data)
+        if self.memory_size > 0:
+            with self._lock:
+                self._maps[(self._refs[key], lazy, arrays, generated)] = hd_map
+                while len(self._maps) > self.memory_size:
+                    self._maps.popitem(last=False)
+        return hd_map
+
+    def clear(self):
+        """Drop all cached maps, in memory and on disk."""
+        with self._lock:
+            self._maps.clear()
+            self._refs.clear()
+        for sub in ("maps", "refs"):
+            folder = os.path.join(self.directory, sub)
+            for name in os.listdir(folder):
+                os.unlink(os.path.join(folder, name))
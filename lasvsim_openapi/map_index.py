@@ -0,0 +1,446 @@
+"""
+Spatial index over HD map lanes for the lasvsim API.
+"""
+import math
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "LaneIndex requires numpy, install it with `pip install lasvsim-openapi[numpy]`"
+    ) from e
+
+from lasvsim_openapi.polyline import PolylineArray
+from lasvsim_openapi.qxmap import Lane, Link
+
+# 2x2 邻域格子的偏移
+_NEIGHBOR_DX = np.array([0, 1, 0, 1])
+_NEIGHBOR_DY = np.array([0, 0, 1, 1])
+
+
+def _array_xy(line: PolylineArray) -> "np.ndarray":
+    xy = line.xy
+    missing = np.isnan(xy[:, 0])
+    # 缺少坐标的点与对象表示一样跳过
+    return xy[~missing] if missing.any() else xy
+
+
+def _polyline_xy(points) -> "np.ndarray":
+    """(N, 2) coordinates of a list of Point/CenterPoint-like objects."""
+    if isinstance(points, PolylineArray):
+        return _array_xy(points)
+    xy = [(p.x, p.y) for p in points if p is not None]
+    return np.array(xy, dtype=np.float64).reshape(-1, 2)
+
+
+def _center_line_xy(lane: Lane) -> "np.ndarray":
+    if isinstance(lane.center_line, PolylineArray):
+        return _array_xy(lane.center_line)
+    return _polyline_xy([c.point for c in lane.center_line])
+
+
+def _reference_line_xy(link: Link) -> "np.ndarray":
+    if isinstance(link.reference_line, PolylineArray):
+        return _array_xy(link.reference_line)
+    return _polyline_xy([r.point for r in link.reference_line])
+
+
+def _boundary_xy(boundary) -> "np.ndarray":
+    if boundary is None:
+        return np.empty((0, 2))
+    return _polyline_xy(boundary.points)
+
+
+def project_segments(px, py, x0, y0, x1, y1) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Project points onto segments, elementwise with broadcasting.
+
+    Returns:
+        A tuple of (distance to the segment, position along the segment
+        in [0, 1])
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    length2 = dx * dx + dy * dy
+    u = ((px - x0) * dx + (py - y0) * dy) / np.where(length2 > 0, length2, 1.0)
+    u = np.clip(u, 0.0, 1.0)
+    return np.hypot(px - (x0 + u * dx), py - (y0 + u * dy)), u
+
+
+class SegmentGrid:
+    """Grid index over line segments.
+
+    Each segment is registered in the grid cells its bounding box overlaps.
+    Only non-empty cells are stored, as a sorted key array with CSR offsets,
+    so memory follows the amount of geometry rather than the map extent; a
+    cell lookup is a binary search. Queries only look at segments in the
+    cells around the query point, so their cost does not grow with the size
+    of the map.
+
+    ``x0, y0, x1, y1`` are the segment end points. Subclasses fill them in
+    and call ``_build_grid``.
+    """
+
+    cell_size: float = 10.0
+    _dx = None
+
+    def __init__(self, x0, y0, x1, y1, cell_size: float = 10.0):
+        """Build the index.
+
+        Args:
+            x0: Segment start X coordinates
+            y0: Segment start Y coordinates
+            x1: Segment end X coordinates
+            y1: Segment end Y coordinates
+            cell_size: Grid cell edge length in meters
+
+        Raises:
+            ValueError: If cell_size is not positive
+        """
+        self._set_cell_size(cell_size)
+        self.x0, self.y0, self.x1, self.y1 = (np.ascontiguousarray(a, dtype=np.float64) for a in (x0, y0, x1, y1))
+        self._build_grid()
+
+    def _set_cell_size(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = float(cell_size)
+
+    def __len__(self) -> int:
+        """Number of indexed segments."""
+        return len(self.x0)
+
+    def _cell(self, x, y):
+        return np.floor(x / self.cell_size).astype(np.int64), np.floor(y / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _key(ix, iy):
+        # 行列编码为一个 int64 键, 坐标范围 ±2^31 个格子
+        return (iy << 32) + ix
+
+    def _build_grid(self):
+        ix0, iy0 = self._cell(np.minimum(self.x0, self.x1), np.minimum(self.y0, self.y1))
+        ix1, iy1 = self._cell(np.maximum(self.x0, self.x1), np.maximum(self.y0, self.y1))
+        width = ix1 - ix0 + 1
+        count = width * (iy1 - iy0 + 1)
+
+        # 展开为 (格子, 线段) 对
+        seg = np.repeat(np.arange(len(count)), count)
+        local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        keys = self._key(ix0[seg] + local % width[seg], iy0[seg] + local // width[seg])
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        self._items = seg[order].astype(np.int32)
+        self._keys, starts = np.unique(keys, return_index=True)
+        self._starts = np.append(starts, len(keys))
+        if len(count):
+            self._bounds = (ix0.min(), iy0.min(), ix1.max(), iy1.max())
+        else:
+            self._bounds = (0, 0, -1, -1)
+
+    def _segments_in_cells(self, keys) -> "np.ndarray":
+        """Segments registered in the given cells, possibly repeated."""
+        pos = np.searchsorted(self._keys, keys)
+        found = pos < len(self._keys)
+        pos = pos[found]
+        pos = pos[self._keys[pos] == keys[found]]
+        if not len(pos):
+            return np.empty(0, dtype=np.int32)
+        if len(pos) == 1:
+            return self._items[self._starts[pos[0]]:self._starts[pos[0] + 1]]
+        # 拼接各格子的 CSR 区间; 跨格子的线段会重复出现, 查询结果按车道去重
+        starts = self._starts[pos]
+        counts = self._starts[pos + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return self._items[np.arange(counts.sum()) + offsets]
+
+    def _box_segments(self, min_x: float, min_y: float, max_x: float, max_y: float) -> "np.ndarray":
+        ix0, iy0 = self._cell(np.float64(min_x), np.float64(min_y))
+        ix1, iy1 = self._cell(np.float64(max_x), np.float64(max_y))
+        bx0, by0, bx1, by1 = self._bounds
+        ix0, iy0, ix1, iy1 = max(ix0, bx0), max(iy0, by0), min(ix1, bx1), min(iy1, by1)
+        if ix0 > ix1 or iy0 > iy1:
+            return np.empty(0, dtype=np.int32)
+        keys = np.add.outer(self._key(0, np.arange(iy0, iy1 + 1)), np.arange(ix0, ix1 + 1))
+        return self._segments_in_cells(keys.ravel())
+
+    def nearest_segment(
+        self, x: float, y: float, max_distance: Optional[float] = None, select: Optional["np.ndarray"] = None
+    ) -> Optional[Tuple[int, float, float]]:
+        """Find the segment closest to a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            max_distance: Ignore segments farther away than this
+            select: Boolean mask of the segments to consider, all by default
+
+        Returns:
+            A tuple of (segment index, distance, position along the segment
+            in [0, 1]), or None if no segment is in range or the point is
+            not finite
+        """
+        # NaN 坐标会使搜索半径变为 NaN, 循环无法结束
+        if not len(self) or not (math.isfinite(x) and math.isfinite(y)):
+            return None
+        limit = math.inf if max_distance is None else max_distance
+        cell = self.cell_size
+        bx0, by0, bx1, by1 = self._bounds
+        # 查询点到网格范围的距离, 以及网格范围内最远的距离
+        gap_x = max(bx0 * cell - x, x - (bx1 + 1) * cell, 0.0)
+        gap_y = max(by0 * cell - y, y - (by1 + 1) * cell, 0.0)
+        reach = max(x - bx0 * cell, (bx1 + 1) * cell - x) + max(y - by0 * cell, (by1 + 1) * cell - y)
+        radius = max(gap_x, gap_y) + cell
+        while True:
+            # 方框内包含所有距离不超过 radius 的线段, 逐次加倍直到找到更近的线段
+            candidates = self._box_segments(x - radius, y - radius, x + radius, y + radius)
+            if select is not None:
+                candidates = candidates[select[candidates]]
+            if len(candidates):
+                dist, u = project_segments(
+                    x, y, self.x0[candidates], self.y0[candidates], self.x1[candidates], self.y1[candidates]
+                )
+                i = int(np.argmin(dist))
+                if dist[i] <= radius:
+                    if dist[i] > limit:
+                        return None
+                    return int(candidates[i]), float(dist[i]), float(u[i])
+            if radius >= limit or radius >= reach:
+                return None
+            radius *= 2
+
+    def _candidate_pairs(self, x, y) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Pair each point with the segments in the 2x2 cells around it.
+
+        Returns:
+            A tuple of (point index, segment index) pair arrays, ordered by
+            point, and the distance from each point to the edge of its 2x2
+            cells, within which the candidates include every segment
+        """
+        # 左下角格子: 查询点位于 2x2 方块中心附近的象限
+        cell = self.cell_size
+        ix = np.floor(x / cell - 0.5).astype(np.int64)
+        iy = np.floor(y / cell - 0.5).astype(np.int64)
+        margin = np.minimum(
+            np.minimum(x - ix * cell, (ix + 2) * cell - x), np.minimum(y - iy * cell, (iy + 2) * cell - y)
+        )
+        keys = self._key(ix[:, None] + _NEIGHBOR_DX, iy[:, None] + _NEIGHBOR_DY).ravel()
+        owner = np.repeat(np.arange(len(x)), len(_NEIGHBOR_DX))
+        pos = np.searchsorted(self._keys, keys)
+        found = pos < len(self._keys)
+        found[found] = self._keys[pos[found]] == keys[found]
+        pos, owner = pos[found], owner[found]
+        starts = self._starts[pos]
+        counts = self._starts[pos + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return np.repeat(owner, counts), self._items[np.arange(counts.sum()) + offsets], margin
+
+    def _nearest_pairs(self, x, y, pair_owner, pair_seg, seg, dist, u):
+        """Keep the closest candidate of each point, updating seg, dist and u in place."""
+        if not len(pair_seg):
+            return
+        if self._dx is None:
+            self._dx = self.x1 - self.x0
+            self._dy = self.y1 - self.y0
+            length2 = self._dx * self._dx + self._dy * self._dy
+            self._inv_length2 = np.where(length2 > 0, 1.0 / np.where(length2 > 0, length2, 1.0), 0.0)
+        ax = x[pair_owner] - self.x0[pair_seg]
+        ay = y[pair_owner] - self.y0[pair_seg]
+        dx, dy = self._dx[pair_seg], self._dy[pair_seg]
+        pair_u = np.clip((ax * dx + ay * dy) * self._inv_length2[pair_seg], 0.0, 1.0)
+        ax -= pair_u * dx
+        ay -= pair_u * dy
+        dist2 = ax * ax + ay * ay
+
+        group = np.flatnonzero(np.r_[True, pair_owner[1:] != pair_owner[:-1]])
+        best = np.minimum.reduceat(dist2, group)
+        # 每组取第一个达到最小距离的候选
+        hit = np.flatnonzero(dist2 == np.repeat(best, np.diff(np.r_[group, len(dist2)])))
+        hit = hit[np.r_[True, pair_owner[hit[1:]] != pair_owner[hit[:-1]]]]
+        owners = pair_owner[hit]
+        seg[owners] = pair_seg[hit]
+        dist[owners] = np.sqrt(dist2[hit])
+        u[owners] = pair_u[hit]
+
+    def nearest_segments(
+        self, x, y, select: Optional["np.ndarray"] = None
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Find the segment closest to each of a batch of points.
+
+        Candidates for all points are gathered from the 2x2 cells around
+        them, the point's own cell and its neighbors on the near sides, and
+        projected in one pass. That is exact for points closer to their
+        nearest segment than to the edge of those cells, at least half a
+        cell size; the others fall back to nearest_segment one by one, so
+        keep cell_size above twice the usual distance of the query points
+        from the geometry.
+
+        Args:
+            x: X coordinates, an array or sequence
+            y: Y coordinates of the same length
+            select: Boolean mask of the segments to consider, all by default
+
+        Returns:
+            A tuple of arrays (segment index, distance, position along the
+            segment in [0, 1]); the index is -1 and the distance inf where
+            there are no segments or the point is not finite
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        n = len(x)
+        seg = np.full(n, -1, dtype=np.int64)
+        dist = np.full(n, np.inf)
+        u = np.zeros(n)
+        if not n or not len(self):
+            return seg, dist, u
+        finite = np.isfinite(x) & np.isfinite(y)
+        if not finite.all():
+            keep = np.flatnonzero(finite)
+            seg[keep], dist[keep], u[keep] = self.nearest_segments(x[keep], y[keep], select)
+            return seg, dist, u
+
+        pair_owner, pair_seg, margin = self._candidate_pairs(x, y)
+        if select is not None:
+            keep = select[pair_seg]
+            pair_owner, pair_seg = pair_owner[keep], pair_seg[keep]
+        self._nearest_pairs(x, y, pair_owner, pair_seg, seg, dist, u)
+
+        for i in np.flatnonzero(~(dist <= margin)):
+            found = SegmentGrid.nearest_segment(self, float(x[i]), float(y[i]), select=select)
+            if found is not None:
+                seg[i], dist[i], u[i] = found
+        return seg, dist, u
+
+
+class LaneIndex(SegmentGrid):
+    """Grid index over lane center lines and boundaries.
+
+    Every polyline is split into segments indexed by a SegmentGrid. Segment
+    arrays are public for callers that post-process query results:
+    ``x0, y0, x1, y1`` are segment end points, ``lane`` the index into
+    ``lane_ids`` and ``center`` whether the segment belongs to a center
+    line (as opposed to a boundary).
+    """
+
+    lane_ids: List[str] = None
+
+    def __init__(self, lanes: Iterable[Lane], cell_size: float = 10.0, boundaries: bool = True):
+        """Build the index.
+
+        Args:
+            lanes: Lanes to index
+            cell_size: Grid cell edge length in meters, roughly the lane
+                width or the typical query radius works well
+            boundaries: Whether to index lane boundaries as well as center
+                lines, used by the box and radius queries
+
+        Raises:
+            ValueError: If cell_size is not positive
+        """
+        self._set_cell_size(cell_size)
+        self.lane_ids = []
+
+        polylines, owners, centers = [], [], []
+        for lane in lanes:
+            index = len(self.lane_ids)
+            self.lane_ids.append(lane.id)
+            shapes = [(_center_line_xy(lane), True)]
+            if boundaries:
+                shapes.append((_boundary_xy(lane.left_boundary), False))
+                shapes.append((_boundary_xy(lane.right_boundary), False))
+            for xy, center in shapes:
+                if len(xy) == 1:
+                    # 单点折线视为零长度线段
+                    xy = np.repeat(xy, 2, axis=0)
+                if len(xy) < 2:
+                    continue
+                polylines.append(np.hstack([xy[:-1], xy[1:]]))
+                owners.append(np.full(len(xy) - 1, index, dtype=np.int32))
+                centers.append(np.full(len(xy) - 1, center))
+
+        segments = np.vstack(polylines) if polylines else np.empty((0, 4))
+        self.x0, self.y0, self.x1, self.y1 = (np.ascontiguousarray(segments[:, i]) for i in range(4))
+        self.lane = np.concatenate(owners) if owners else np.empty(0, dtype=np.int32)
+        self.center = np.concatenate(centers) if centers else np.empty(0, dtype=bool)
+        self._build_grid()
+
+    def nearest_segment(
+        self, x: float, y: float, max_distance: Optional[float] = None, center_only: bool = True
+    ) -> Optional[Tuple[int, float, float]]:
+        """Find the segment closest to a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            max_distance: Ignore segments farther away than this
+            center_only: Only consider center line segments
+
+        Returns:
+            A tuple of (segment index, distance, position along the segment
+            in [0, 1]), or None if no segment is in range
+        """
+        return super().nearest_segment(x, y, max_distance, self.center if center_only else None)
+
+    def nearest(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[Tuple[str, float]]:
+        """Find the lane whose center line is closest to a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            max_distance: Ignore lanes farther away than this
+
+        Returns:
+            A tuple of (lane ID, distance), or None if no lane is in range
+        """
+        found = self.nearest_segment(x, y, max_distance)
+        if found is None:
+            return None
+        return self.lane_ids[self.lane[found[0]]], found[1]
+
+    def _lanes(self, segments: "np.ndarray") -> List[str]:
+        return [self.lane_ids[i] for i in np.unique(self.lane[segments])]
+
+    def lanes_in_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[str]:
+        """Find the lanes whose center line or boundaries cross a box.
+
+        Args:
+            min_x: Box lower X
+            min_y: Box lower Y
+            max_x: Box upper X
+            max_y: Box upper Y
+
+        Returns:
+            Lane IDs in index order
+        """
+        seg = self._box_segments(min_x, min_y, max_x, max_y)
+        x0, y0, x1, y1 = self.x0[seg], self.y0[seg], self.x1[seg], self.y1[seg]
+        overlap = (
+            (np.minimum(x0, x1) <= max_x) & (np.maximum(x0, x1) >= min_x)
+            & (np.minimum(y0, y1) <= max_y) & (np.maximum(y0, y1) >= min_y)
+        )
+        # 包围盒相交时, 线段穿过矩形当且仅当四个角不全在线段所在直线的同一侧
+        dx, dy = x1 - x0, y1 - y0
+        sides = np.stack([dx * (cy - y0) - dy * (cx - x0) for cx, cy in (
+            (min_x, min_y), (min_x, max_y), (max_x, min_y), (max_x, max_y)
+        )])
+        crosses = ~((sides > 0).all(axis=0) | (sides < 0).all(axis=0))
+        return self._lanes(seg[overlap & crosses])
+
+    def lanes_within(self, x: float, y: float, radius: float) -> List[str]:
+        """Find the lanes whose center line or boundaries come within radius of a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            radius: Search radius in meters
+
+        Returns:
+            Lane IDs ordered by distance
+        """
+        seg = self._box_segments(x - radius, y - radius, x + radius, y + radius)
+        dist, _ = project_segments(x, y, self.x0[seg], self.y0[seg], self.x1[seg], self.y1[seg])
+        inside = dist <= radius
+        seg, dist = seg[inside], dist[inside]
+        lanes = self.lane[seg[np.argsort(dist, kind="stable")]]
+        _, first = np.unique(lanes, return_index=True)
+        return [self.lane_ids[i] for i in lanes[np.sort(first)]]
@@ -0,0 +1,206 @@
+"""
+Request serialization module for the lasvsim API.
+
+to_dict(obj) turns model instances, and lists or dicts of them, into the
+plain dicts sent as request bodies, like dataclasses.asdict but without
+its recursive deep copy. Each model class gets a generated function that
+reads its fields directly; plain values and lists of plain values are
+passed through by reference, since the result is only serialized.
+
+Point sequences may also be NumPy arrays; they are detected by duck typing,
+so numpy is not imported here.
+"""
+import dataclasses
+import linecache
+from typing import Any, Callable, Dict, List, Optional
+
+from lasvsim_openapi.lazy_model import _field_specs, _unwrap_optional
+
+_encoders: Dict[type, Callable[[Any], dict]] = {}
+
+# 无需转换, 可直接引用的字段类型
+_PLAIN = (bool, int, float, str)
+
+
+def _is_plain(tp: Any) -> bool:
+    tp = _unwrap_optional(tp)
+    if tp in _PLAIN:
+        return True
+    origin = getattr(tp, "__origin__", None)
+    args = getattr(tp, "__args__", None) or ()
+    if origin is list and args:
+        return _is_plain(args[0])
+    if origin is dict and len(args) == 2:
+        return _is_plain(args[1])
+    return False
+
+
+def encoder(cls: type) -> Callable[[Any], dict]:
+    """Get the generated serializer of a model class, compiling it on first use.
+
+    Args:
+        cls: A dataclass model
+
+    Returns:
+        A function taking an instance of cls and returning a plain dict
+    """
+    func = _encoders.get(cls)
+    if func is not None:
+        return func
+
+    func_name = f"encode_{cls.__name__}"
+    items = []
+    for name, tp, _, _ in _field_specs(cls):
+        value = f"obj.{name}"
+        items.append(f"        {name!r}: {value if _is_plain(tp) else f'_to_dict({value})'},")
+    source = "\n".join([f"def {func_name}(obj):", "    return {", *items, "    }"]) + "\n"
+
+    filename = f"<encoder {cls.__module__}.{cls.__qualname__}>"
+    namespace = {"_to_dict": to_dict}
+    exec(compile(source, filename, "exec"), namespace)
+    # 注册源码, 使生成函数的异常栈可读
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    func = namespace[func_name]
+    func.__qualname__ = f"{cls.__qualname__}.{func_name}"
+    func.__source__ = source
+    _encoders[cls] = func
+    return func
+
+
+def to_dict(obj: Any) -> Any:
+    """Serialize a model instance, or a list or dict of them, into request data.
+
+    Args:
+        obj: A dataclass model instance, a list, tuple or dict of values,
+            an object with a tolist method such as a NumPy array, or a
+            plain value
+
+    Returns:
+        Plain dicts and lists in place of model instances; other values
+        are returned as is
+    """
+    func = _encoders.get(type(obj))
+    if func is not None:
+        return func(obj)
+    if obj is None or isinstance(obj, _PLAIN):
+        return obj
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return encoder(type(obj))(obj)
+    if isinstance(obj, (list, tuple)):
+        return [to_dict(v) for v in obj]
+    if isinstance(obj, dict):
+        return {k: to_dict(v) for k, v in obj.items()}
+    if hasattr(obj, "tolist"):
+        # NumPy 数组与数组存储的折线
+        return to_dict(obj.tolist())
+    return obj
+
+
+def point_dict(point: Any) -> Optional[dict]:
+    """Serialize a point given as a Point, a dict or an (x, y[, z]) sequence.
+
+    Args:
+        point: The point, or None
+
+    Returns:
+        A dict with x, y and z, or None
+    """
+    if point is None or isinstance(point, dict):
+        return point
+    if isinstance(point, (tuple, list)):
+        if len(point) == 2:
+            return {"x": point[0], "y": point[1], "z": 0.0}
+        return {"x": point[0], "y": point[1], "z": point[2]}
+    return {"x": point.x, "y": point.y, "z": point.z}
+
+
+def point_dicts(points: Any) -> Optional[List[dict]]:
+    """Serialize a sequence of points.
+
+    Args:
+        points: A sequence of points accepted by point_dict, an (N, 2) or
+            (N, 3) array, or a structured array with x, y and optionally z
+            fields. Arrays are converted column-wise without building a
+            Point per row.
+
+    Returns:
+        A list of dicts with x, y and z, or None
+
+    Raises:
+        ValueError: If an array has an unexpected shape
+    """
+    if points is None:
+        return None
+    if hasattr(points, "ndim") and hasattr(points, "tolist"):
+        return _array_point_dicts(points)
+    return [point_dict(p) for p in points]
+
+
+def _array_point_dicts(points) -> List[dict]:
+    names = points.dtype.names
+    if names:
+        # 结构化数组: 按 x/y/z 字段取列
+        if points.ndim != 1 or "x" not in names or "y" not in names:
+            raise ValueError(f"expected a 1-d structured array with x and y fields, got {points.dtype} {points.shape}")
+        xs = points["x"].tolist()
+        ys = points["y"].tolist()
+        if "z" not in names:
+            return [{"x": x, "y": y, "z": 0.0} for x, y in zip(xs, ys)]
+        return [{"x": x, "y": y, "z": z} for x, y, z in zip(xs, ys, points["z"].tolist())]
+
+    if points.ndim != 2 or points.shape[1] not in (2, 3):
+        raise ValueError(f"expected an (N, 2) or (N, 3) array of points, got shape {points.shape}")
+    # tolist 一次性转换为 Python float, 编码器无需处理 numpy 标量
+    rows = points.tolist()
+    if points.shape[1] == 2:
+        return [{"x": x, "y": y, "z": 0.0} for x, y in rows]
+    return [{"x": x, "y": y, "z": z} for x, y, z in rows]
+
+
+def value_list(values: Any) -> Optional[list]:
+    """Serialize a sequence or 1-d array of plain values, such as speeds."""
+    if values is not None and hasattr(values, "tolist"):
+        return values.tolist()
+    return values
+
+
+def local_path_dicts(local_paths: Any) -> Optional[List[dict]]:
+    """Serialize local paths for set_vehicle_local_paths.
+
+    Args:
+        local_paths: A sequence whose items are LocalPath instances, dicts
+            with points and prob, (points, prob) tuples or lists, or point
+            arrays with prob 0; or a structured array with one record per path
+            and fields points, of shape (N, 2) or (N, 3), and prob
+
+    Returns:
+        A list of dicts with points and prob, or None
+
+    Raises:
+        ValueError: If a points array has an unexpected shape
+    """
+    if local_paths is None:
+        return None
+    names = getattr(getattr(local_paths, "dtype", None), "names", None)
+    if names:
+        if "points" not in names or "prob" not in names:
+            raise ValueError(f"expected a structured array with points and prob fields, got {local_paths.dtype}")
+        return [
+            {"points": point_dicts(points), "prob": prob}
+            for points, prob in zip(local_paths["points"], local_paths["prob"].tolist())
+        ]
+
+    result = []
+    for path in local_paths:
+        if isinstance(path, dict):
+            if "points" in path:
+                path = dict(path, points=point_dicts(path["points"]))
+        elif isinstance(path, (tuple, list)):
+            points, prob = path
+            path = {"points": point_dicts(points), "prob": float(prob)}
+        elif hasattr(path, "ndim"):
+            path = {"points": point_dicts(path), "prob": 0.0}
+        else:
+            path = {"points": point_dicts(path.points), "prob": path.prob}
+        result.append(path)
+    return result
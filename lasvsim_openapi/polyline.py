@@ -0,0 +1,248 @@
+"""
+Array-backed polylines for HD map geometry.
+
+decode_array_map(data) decodes a map reply like Qxmap.from_dict(data), but
+stores the center lines and boundaries of lanes and the reference lines and
+boundaries of links as one contiguous float64 (N, k) array each instead of
+a list of point objects. The arrays are wrapped in list-like sequences on
+the same fields, so code iterating over ``lane.center_line`` keeps working,
+while geometry code can use ``lane.center_line.array`` directly.
+"""
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "PolylineArray requires numpy, install it with `pip install lasvsim-openapi[numpy]`"
+    ) from e
+
+from lasvsim_openapi.qxmap import CenterPoint, LineString, Point, Qxmap, ReferencePoint
+
+_NAN = float("nan")
+
+
+def _point_row(point: Any) -> Tuple[float, float, float]:
+    if point is None:
+        return _NAN, _NAN, _NAN
+    return point.get("x") or 0.0, point.get("y") or 0.0, point.get("z") or 0.0
+
+
+class PolylineArray:
+    """List-like view of a polyline stored as one (N, k) float64 array.
+
+    Indexing and iteration build a new model object per point from the
+    array row, so edits to those objects are not stored; edit ``array``
+    instead. Slices share the array.
+    """
+    __slots__ = ("array",)
+
+    # 各列含义, 由子类定义
+    columns: Tuple[str, ...] = ()
+
+    def __init__(self, array: Any = None):
+        """Wrap an array.
+
+        Args:
+            array: (N, k) array with one row per point, k = len(columns)
+
+        Raises:
+            ValueError: If the array has the wrong shape
+        """
+        k = len(self.columns)
+        array = np.ascontiguousarray(np.empty((0, k)) if array is None else array, dtype=np.float64)
+        if array.ndim != 2 or array.shape[1] != k:
+            raise ValueError(f"expected an (N, {k}) array of {', '.join(self.columns)}, got shape {array.shape}")
+        self.array = array
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[dict]) -> "PolylineArray":
+        """Build the array from raw reply dicts of the points."""
+        rows = [cls._row(item) for item in items]
+        return cls(np.array(rows, dtype=np.float64).reshape(-1, len(cls.columns)))
+
+    @staticmethod
+    def _row(item: dict) -> tuple:
+        raise NotImplementedError
+
+    @staticmethod
+    def _item(row: List[float]) -> Any:
+        raise NotImplementedError
+
+    def column(self, name: str) -> "np.ndarray":
+        """The values of one column, a view of the array."""
+        return self.array[:, self.columns.index(name)]
+
+    @property
+    def xy(self) -> "np.ndarray":
+        """(N, 2) view of the x and y columns."""
+        return self.array[:, :2]
+
+    def tolist(self) -> list:
+        """The points as a list of model objects."""
+        make = self._item
+        return [make(row) for row in self.array.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self.array[index])
+        return self._item(self.array[index].tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, PolylineArray):
+            return type(self) is type(other) and np.array_equal(self.array, other.array, equal_nan=True)
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} points)"
+
+
+class PointArray(PolylineArray):
+    """Points of a LineString, columns x, y, z."""
+    __slots__ = ()
+    columns = ("x", "y", "z")
+
+    @staticmethod
+    def _row(item: dict) -> tuple:
+        return _point_row(item)
+
+    @staticmethod
+    def _item(row: List[float]) -> Point:
+        return Point(*row)
+
+
+class CenterLineArray(PolylineArray):
+    """Lane center line, columns x, y, z, s, heading, left_width, right_width."""
+    __slots__ = ()
+    columns = ("x", "y", "z", "s", "heading", "left_width", "right_width")
+
+    @staticmethod
+    def _row(item: dict) -> tuple:
+        return _point_row(item.get("point")) + (
+            item.get("s") or 0.0,
+            item.get("heading") or 0.0,
+            item.get("left_width") or 0.0,
+            item.get("right_width") or 0.0,
+        )
+
+    @staticmethod
+    def _item(row: List[float]) -> CenterPoint:
+        x, y, z, s, heading, left_width, right_width = row
+        point = None if x != x else Point(x, y, z)
+        return CenterPoint(s, heading, left_width, right_width, point)
+
+
+class ReferenceLineArray(PolylineArray):
+    """Link reference line, columns x, y, z, s, heading, height, cross_slope."""
+    __slots__ = ()
+    columns = ("x", "y", "z", "s", "heading", "height", "cross_slope")
+
+    @staticmethod
+    def _row(item: dict) -> tuple:
+        return _point_row(item.get("point")) + (
+            item.get("s") or 0.0,
+            item.get("heading") or 0.0,
+            item.get("height") or 0.0,
+            item.get("cross_slope") or 0.0,
+        )
+
+    @staticmethod
+    def _item(row: List[float]) -> ReferencePoint:
+        x, y, z, s, heading, height, cross_slope = row
+        point = None if x != x else Point(x, y, z)
+        return ReferencePoint(s, heading, point, height, cross_slope)
+
+
+# 以数组存储的字段: (字段名, 数组类型, 是否为 LineString)
+_LANE_FIELDS = (("center_line", CenterLineArray, False), ("left_boundary", PointArray, True),
+                ("right_boundary", PointArray, True))
+_LINK_FIELDS = (("reference_line", ReferenceLineArray, False), ("left_boundary", PointArray, True),
+                ("right_boundary", PointArray, True))
+
+
+def _split(raw: dict, fields, arrays: List[Callable[[Any], None]]) -> dict:
+    """Copy a raw lane or link without its polylines, queueing their arrays."""
+    rest = dict(raw)
+    values = []
+    for name, array_cls, line_string in fields:
+        value = raw.get(name)
+        if line_string:
+            if value is None:
+                values.append(None)
+                continue
+            rest[name] = {k: v for k, v in value.items() if k != "points"}
+            value = value.get("points")
+        else:
+            rest.pop(name, None)
+        values.append(array_cls.from_dicts(value or ()))
+    arrays.append(values)
+    return rest
+
+
+def _split_links(links: list, arrays: list) -> list:
+    result = []
+    for raw in links or ():
+        link = _split(raw, _LINK_FIELDS, arrays)
+        link["ordered_lanes"] = [_split(lane, _LANE_FIELDS, arrays) for lane in raw.get("ordered_lanes") or ()]
+        result.append(link)
+    return result
+
+
+def _attach(obj: Any, fields, values: list):
+    for (name, _, line_string), array in zip(fields, values):
+        if not line_string:
+            setattr(obj, name, array)
+        elif array is not None:
+            line = getattr(obj, name)
+            if line is None:
+                line = LineString()
+                setattr(obj, name, line)
+            line.points = array
+
+
+def decode_array_map(data: dict) -> Qxmap:
+    """Decode a map reply, storing lane and link polylines as arrays.
+
+    Lanes and links of segments and junction links are converted; other
+    geometry, such as junction shapes, wait areas and roundabouts, keeps
+    the object representation.
+
+    Args:
+        data: Raw map dict, not modified
+
+    Returns:
+        The map, or None if data is None
+    """
+    if data is None:
+        return None
+    arrays = []
+    stripped = dict(data)
+    stripped["segments"] = [
+        dict(segment, ordered_links=_split_links(segment.get("ordered_links"), arrays))
+        for segment in data.get("segments") or ()
+    ]
+    stripped["junctions"] = [
+        dict(junction, links=_split_links(junction.get("links"), arrays))
+        for junction in data.get("junctions") or ()
+    ]
+    hd_map = Qxmap.from_dict(stripped)
+
+    # 按拆分时的顺序将数组挂回解码后的对象
+    queue = iter(arrays)
+    links = [link for segment in hd_map.segments for link in segment.ordered_links]
+    links += [link for junction in hd_map.junctions for link in junction.links]
+    for link in links:
+        _attach(link, _LINK_FIELDS, next(queue))
+        for lane in link.ordered_lanes:
+            _attach(lane, _LANE_FIELDS, next(queue))
+    return hd_map
@@ -0,0 +1,191 @@
+"""
+Columnar position decoding module for the lasvsim API.
+"""
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "PositionColumns requires numpy, install it with `pip install lasvsim-openapi[numpy]`"
+    ) from e
+
+_FLOAT_FIELDS = ("x", "y", "z", "phi", "s", "t", "lane_offset")
+_EMPTY: dict = {}
+
+
+class PositionColumns:
+    """Struct-of-arrays view of a position_dict response.
+
+    Decodes get_vehicle_position / get_participant_position replies without
+    building a Position and Point object per participant. Row ``i`` of every
+    array describes participant ``ids[i]``; the arrays are views of the
+    first ``len(self)`` rows of buffers that are reused when the instance is
+    passed back as ``out``.
+
+    Missing optional values (s, t, lane_offset) are NaN. Lane and link ids
+    are interned: ``lane_code[i]`` indexes ``lane_ids`` and is -1 for an
+    empty id. The intern tables live as long as the instance, so codes stay
+    stable across steps when the same ``out`` buffer is reused.
+    """
+
+    lane_ids: List[str] = None
+    link_ids: List[str] = None
+
+    def __init__(self, capacity: int = 0):
+        """Initialize empty columns.
+
+        Args:
+            capacity: Number of rows to preallocate
+        """
+        self._size = 0
+        self._capacity = -1
+        self.lane_ids = []
+        self.link_ids = []
+        self._lane_index: Dict[str, int] = {}
+        self._link_index: Dict[str, int] = {}
+        self._reserve(capacity)
+
+    def _reserve(self, capacity: int):
+        if capacity <= self._capacity:
+            return
+        capacity = max(capacity, 2 * self._capacity)
+        floats = np.empty((len(_FLOAT_FIELDS), capacity), dtype=np.float64)
+        codes = np.empty((2, capacity), dtype=np.int32)
+        ids = np.empty(capacity, dtype=object)
+        if self._size:
+            floats[:, :self._size] = self._floats[:, :self._size]
+            codes[:, :self._size] = self._codes[:, :self._size]
+            ids[:self._size] = self._ids[:self._size]
+        self._floats = floats
+        self._codes = codes
+        self._ids = ids
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._floats[0, :self._size]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._floats[1, :self._size]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._floats[2, :self._size]
+
+    @property
+    def phi(self) -> np.ndarray:
+        return self._floats[3, :self._size]
+
+    @property
+    def s(self) -> np.ndarray:
+        return self._floats[4, :self._size]
+
+    @property
+    def t(self) -> np.ndarray:
+        return self._floats[5, :self._size]
+
+    @property
+    def lane_offset(self) -> np.ndarray:
+        return self._floats[6, :self._size]
+
+    @property
+    def lane_code(self) -> np.ndarray:
+        return self._codes[0, :self._size]
+
+    @property
+    def link_code(self) -> np.ndarray:
+        return self._codes[1, :self._size]
+
+    def lane_id(self, i: int) -> str:
+        """Lane ID of row i, empty if the participant is not on a lane."""
+        code = self._codes[0, i]
+        return self.lane_ids[code] if code >= 0 else ""
+
+    def link_id(self, i: int) -> str:
+        """Link ID of row i, empty if the participant is not on a link."""
+        code = self._codes[1, i]
+        return self.link_ids[code] if code >= 0 else ""
+
+    @staticmethod
+    def _intern(table: List[str], index: Dict[str, int], value: Optional[str]) -> int:
+        if not value:
+            return -1
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(table)
+            table.append(value)
+        return code
+
+    @classmethod
+    def from_dict(cls, data: dict = None, out: Optional['PositionColumns'] = None) -> Optional['PositionColumns']:
+        """Decode a position_dict response.
+
+        Args:
+            data: Reply of get_vehicle_position or get_participant_position
+            out: Optional columns to decode into, reusing their buffers and
+                intern tables
+
+        Returns:
+            The decoded columns, ``out`` itself when given
+        """
+        if data is None:
+            return None
+        positions = data.get("position_dict") or _EMPTY
+        n = len(positions)
+        columns = out if out is not None else cls(n)
+        columns._size = 0
+        columns._reserve(n)
+        columns._size = n
+        if n == 0:
+            return columns
+
+        values = list(positions.values())
+        columns._ids[:n] = list(positions.keys())
+
+        rows = []
+        for v in values:
+            p = v.get("point") or _EMPTY
+            rows.append((
+                p.get("x", 0.0),
+                p.get("y", 0.0),
+                p.get("z", 0.0),
+                v.get("phi", 0.0),
+                v.get("s"),
+                v.get("t"),
+                v.get("lane_offset"),
+            ))
+        columns._floats[:, :n].T[:] = rows
+
+        intern = cls._intern
+        lane_ids, lane_index = columns.lane_ids, columns._lane_index
+        link_ids, link_index = columns.link_ids, columns._link_index
+        columns._codes[:, :n].T[:] = [
+            (
+                intern(lane_ids, lane_index, v.get("lane_id")),
+                intern(link_ids, link_index, v.get("link_id")),
+            )
+            for v in values
+        ]
+        return columns
+
+
+def decode_positions(data: dict = None, out: Optional[PositionColumns] = None) -> Optional[PositionColumns]:
+    """Decode a position_dict response into columns.
+
+    Args:
+        data: Reply of get_vehicle_position or get_participant_position
+        out: Optional columns to decode into, reusing their buffers
+
+    Returns:
+        The decoded columns
+    """
+    return PositionColumns.from_dict(data, out=out)
@@ -0,0 +1,71 @@
+"""
+Asyncio process task module for the lasvsim API.
+"""
+
+from lasvsim_openapi.http_client_async import AsyncHttpClient
+
+class AsyncProcessTaskFast:
+    """Asyncio process task client for the API."""
+    http_client: AsyncHttpClient = None
+
+    def __init__(self, http_client: AsyncHttpClient):
+        """Initialize process task client.
+        
+        Args:
+            http_client: Async HTTP client instance
+        """
+        self.http_client = http_client.clone()
+
+    async def copy_record(self, task_id: int, record_id: int):
+        """Copy a record.
+        
+        Args:
+            task_id: Task ID
+            record_id: Record ID
+            
+        Returns:
+            Copy record response
+            
+        Raises:
+            APIError: If the request fails
+        """
+        return await self.http_client.post(
+            "/openapi/process_task/v2/record/copy",
+            {"task_id": task_id, "record_id": record_id},
+        )
+
+    async def get_record_scenario(self, task_id: int, record_id: int):
+        """Get record scenario.
+        
+        Args:
+            task_id: Task ID
+            record_id: Record ID
+            
+        Returns:
+            Get record scenario response
+            
+        Raises:
+            APIError: If the request fails
+        """        
+        return await self.http_client.post(
+            "/openapi/process_task/v2/record/scenario/get",
+            {"task_id": task_id, "record_id": record_id},
+        )
+
+    async def get_task_record_ids(self, task_id: int):
+        """Get task record IDs.
+        
+        Args:
+            task_id: Task ID
+            
+        Returns:
+            Get task record IDs response
+            
+        Raises:
+            APIError: If the request fails
+        """
+        
+        return await self.http_client.post(
+            "/openapi/process_task/v2/record/id_list",
+            {"task_id": task_id},
+        )
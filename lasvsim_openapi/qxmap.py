@@ -2,7 +2,7 @@
 HD map data structures.
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from enum import IntEnum
 
 
@@ -279,6 +279,9 @@ class Header:
     source_projection: str = ""
     source_unit: str = ""
     
+    # 解码元数据, 见 lazy_model._field_specs: from_dict 原样保存枚举字段的数值
+    _raw_enum_fields = ("source_type",)
+    
     @classmethod
     def from_dict(cls, data: dict = None):
         if data is None:
@@ -338,6 +341,9 @@ class SpeedLimit:
     unit: str = ""
     source: str = ""
     
+    # 解码元数据, 见 lazy_model._field_specs: from_dict 原样保存枚举字段的数值
+    _raw_enum_fields = ("type",)
+    
     @classmethod
     def from_dict(cls, data: dict = None):
         if data is None:
@@ -383,6 +389,9 @@ class LaneMark:
     styles: List[LaneMark_LaneMarkStyle] = field(default_factory=list)
     colors: List[int] = field(default_factory=list)
     
+    # 解码元数据, 见 lazy_model._field_specs: from_dict 原样保存枚举字段的数值
+    _raw_enum_fields = ("style", "styles")
+    
     def __init__(self, s: float = 0.0, length: float = 0.0):
         self.s = s
         self.length = length
@@ -447,6 +456,9 @@ class Lane:
     right_boundary: Optional[LineString] = None
     width: float = 0.0
     
+    # 解码元数据, 见 lazy_model._field_specs: from_dict 原样保存枚举字段的数值
+    _raw_enum_fields = ("type",)
+    
     def __init__(self):
         self.id = ""
         self.type = 0
@@ -567,6 +579,9 @@ class Movement:
     junction_id: str = ""
     flow_direction: Direction = Direction.DIRECTION_UNKNOWN
     
+    # 解码元数据, 见 lazy_model._field_specs: from_dict 原样保存枚举字段的数值
+    _raw_enum_fields = ("flow_direction",)
+    
     @classmethod
     def from_dict(cls, data: dict = None):
         if data is None:
@@ -591,6 +606,9 @@ class Connection:
     downstream_link_id: str = ""
     path: Optional[LineString] = None
     
+    # 解码元数据, 见 lazy_model._field_specs: from_dict 原样保存枚举字段的数值
+    _raw_enum_fields = ("flow_direction",)
+    
     @classmethod
     def from_dict(cls, data: dict = None):
         if data is None:
@@ -1070,6 +1088,7 @@ class Qxmap:
         trees = data.get("trees", [])
         lamps = data.get("lamps", [])
         cls.id = data.get("id", "")
+        cls.digest = data.get("digest", "")
 
         cls.header = None if header is None else Header.from_dict(header)
         cls.junctions = [Junction.from_dict(j) for j in junctions]
@@ -1081,3 +1100,237 @@ class Qxmap:
         cls.lamps = [Lamp.from_dict(l) for l in lamps]
 
         return cls
+
+    def _id_index(self, name: str) -> dict:
+        key = f"_{name}_by_id"
+        index = self.__dict__.get(key)
+        if index is None:
+            index = {item.id: item for item in getattr(self, name)}
+            self.__dict__[key] = index
+        return index
+
+    def segment_by_id(self, segment_id: str) -> Optional[Segment]:
+        """Find a segment by ID.
+
+        The ID index is built on first use and not updated when segments
+        are added later. On a lazily decoded map (see
+        lasvsim_openapi.lazy_model.lazy_from_dict) building it reads only
+        the IDs; the rest of a segment is decoded when first accessed.
+
+        Args:
+            segment_id: Segment ID
+
+        Returns:
+            The segment, or None if there is no such segment
+        """
+        return self._id_index("segments").get(segment_id)
+
+    def junction_by_id(self, junction_id: str) -> Optional[Junction]:
+        """Find a junction by ID, see segment_by_id.
+
+        Args:
+            junction_id: Junction ID
+
+        Returns:
+            The junction, or None if there is no such junction
+        """
+        return self._id_index("junctions").get(junction_id)
+
+    def _topology_index(self) -> dict:
+        index = self.__dict__.get("_topology")
+        if index is None:
+            lanes, links, lane_to_link, link_to_segment = {}, {}, {}, {}
+            for segment in self.segments or ():
+                for link in segment.ordered_links or ():
+                    links[link.id] = link
+                    link_to_segment[link.id] = segment
+            for junction in self.junctions or ():
+                for link in junction.links or ():
+                    links[link.id] = link
+            for link in links.values():
+                for lane in link.ordered_lanes or ():
+                    lanes[lane.id] = lane
+                    lane_to_link[lane.id] = link
+            index = {"lanes": lanes, "links": links, "lane_to_link": lane_to_link, "link_to_segment": link_to_segment}
+            self.__dict__["_topology"] = index
+        return index
+
+    def lane_by_id(self, lane_id: str) -> Optional[Lane]:
+        """Find a lane of a segment or junction by ID, e.g. the lane_id of a Position.
+
+        The index over lanes and links is built on first use, walking all
+        segments and junctions once, and not updated when the map is edited
+        later.
+
+        Args:
+            lane_id: Lane ID
+
+        Returns:
+            The lane, or None if there is no such lane
+        """
+        return self._topology_index()["lanes"].get(lane_id)
+
+    def link_by_id(self, link_id: str) -> Optional[Link]:
+        """Find a link of a segment or junction by ID, see lane_by_id.
+
+        Args:
+            link_id: Link ID
+
+        Returns:
+            The link, or None if there is no such link
+        """
+        return self._topology_index()["links"].get(link_id)
+
+    def lane_to_link(self, lane_id: str) -> Optional[Link]:
+        """Find the link a lane belongs to, see lane_by_id.
+
+        Args:
+            lane_id: Lane ID
+
+        Returns:
+            The link, or None if there is no such lane
+        """
+        return self._topology_index()["lane_to_link"].get(lane_id)
+
+    def link_to_segment(self, link_id: str) -> Optional[Segment]:
+        """Find the segment a link belongs to, see lane_by_id.
+
+        Args:
+            link_id: Link ID
+
+        Returns:
+            The segment, or None if there is no such link or it is a
+            junction link
+        """
+        return self._topology_index()["link_to_segment"].get(link_id)
+
+    def movement_by_id(self, movement_id: str) -> Optional[Movement]:
+        """Find a junction movement by ID.
+
+        The index is built on first use from the junctions only and not
+        updated when movements are added later.
+
+        Args:
+            movement_id: Movement ID
+
+        Returns:
+            The movement, or None if there is no such movement
+        """
+        index = self.__dict__.get("_movements_by_id")
+        if index is None:
+            index = {
+                movement.id: movement
+                for junction in self.junctions or ()
+                for movement in junction.movements or ()
+            }
+            self.__dict__["_movements_by_id"] = index
+        return index.get(movement_id)
+
+    def iter_lanes(self) -> Iterator[Lane]:
+        """Iterate over the lanes of all segments and junctions."""
+        for link in self.iter_links():
+            yield from link.ordered_lanes or ()
+
+    def iter_links(self) -> Iterator[Link]:
+        """Iterate over the links of all segments and junctions."""
+        for segment in self.segments or ():
+            yield from segment.ordered_links or ()
+        for junction in self.junctions or ():
+            yield from junction.links or ()
+
+    def lane_index(self, cell_size: Optional[float] = None):
+        """Get the spatial index over the map lanes, building it on first use.
+
+        Requires numpy. The index is cached on the map and rebuilt when a
+        different cell_size is asked for; call it again after editing the
+        lane geometry.
+
+        Args:
+            cell_size: Grid cell edge length in meters, 10 by default
+
+        Returns:
+            A lasvsim_openapi.map_index.LaneIndex
+        """
+        index = self.__dict__.get("_lane_index")
+        if index is None or (cell_size is not None and index.cell_size != cell_size):
+            from lasvsim_openapi.map_index import LaneIndex
+
+            index = LaneIndex(self.iter_lanes(), cell_size or 10.0)
+            self.__dict__["_lane_index"] = index
+        return index
+
+    def lane_projector(self):
+        """Get the Frenet projector onto lane center lines, building it on first use.
+
+        Requires numpy. The projector is cached on the map, so it does not
+        follow later edits to the lane geometry.
+
+        Returns:
+            A lasvsim_openapi.frenet.FrenetProjector with lane IDs
+        """
+        projector = self.__dict__.get("_lane_projector")
+        if projector is None:
+            from lasvsim_openapi.frenet import FrenetProjector
+
+            projector = FrenetProjector.from_lanes(self.iter_lanes())
+            self.__dict__["_lane_projector"] = projector
+        return projector
+
+    def link_projector(self):
+        """Get the Frenet projector onto link reference lines, building it on first use.
+
+        Requires numpy. Links without a reference line are left out.
+
+        Returns:
+            A lasvsim_openapi.frenet.FrenetProjector with link IDs
+        """
+        projector = self.__dict__.get("_link_projector")
+        if projector is None:
+            from lasvsim_openapi.frenet import FrenetProjector
+
+            projector = FrenetProjector.from_links(self.iter_links())
+            self.__dict__["_link_projector"] = projector
+        return projector
+
+    def lane_graph(self, lane_change_cost: Optional[float] = None):
+        """Get the lane routing graph, building it on first use.
+
+        The graph is cached on the map and rebuilt when a different
+        lane_change_cost is asked for; call it again after editing the
+        lane topology.
+
+        Args:
+            lane_change_cost: Cost of a lane change in meters, 20 by default
+
+        Returns:
+            A lasvsim_openapi.routing.LaneGraph
+        """
+        graph = self.__dict__.get("_lane_graph")
+        if graph is None or (lane_change_cost is not None and graph.lane_change_cost != lane_change_cost):
+            from lasvsim_openapi.routing import LaneGraph
+
+            graph = LaneGraph(self, 20.0 if lane_change_cost is None else lane_change_cost)
+            self.__dict__["_lane_graph"] = graph
+        return graph
+
+    def nearest_lane(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[str]:
+        """Find the lane whose center line is closest to a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            max_distance: Ignore lanes farther away than this
+
+        Returns:
+            The lane ID, or None if no lane is in range
+        """
+        found = self.lane_index().nearest(x, y, max_distance)
+        return None if found is None else found[0]
+
+    def lanes_in_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[str]:
+        """Find the lanes whose center line or boundaries cross a box."""
+        return self.lane_index().lanes_in_box(min_x, min_y, max_x, max_y)
+
+    def lanes_within(self, x: float, y: float, radius: float) -> List[str]:
+        """Find the lanes within radius of a point, nearest first."""
+        return self.lane_index().lanes_within(x, y, radius)
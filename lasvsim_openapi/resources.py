@@ -5,6 +5,9 @@ from typing import Optional
 from dataclasses import dataclass
 
 from lasvsim_openapi.http_client import HttpClient
+from lasvsim_openapi.lazy_model import lazy_from_dict
+from lasvsim_openapi.map_cache import HdMapCache
+from lasvsim_openapi.model_decoder import decode
 from lasvsim_openapi.qxmap import Qxmap
 from lasvsim_openapi.resources_fast import ResourcesFast
 
@@ -17,12 +20,19 @@ class GetHdMapRes:
         self.data = None
 
     @classmethod
-    def from_dict(cls, data: dict = None):
+    def from_dict(cls, data: dict = None, lazy: bool = False, arrays: bool = False, generated: bool = False):
         if data is None:
             return None
         map_data = data.pop("data", None)
         instance = cls()
-        instance.data = None if map_data is None else Qxmap.from_dict(map_data)
+        if arrays:
+            from lasvsim_openapi.polyline import decode_array_map
+
+            instance.data = decode_array_map(map_data)
+        elif generated:
+            instance.data = decode(Qxmap, map_data)
+        else:
+            instance.data = lazy_from_dict(Qxmap, map_data) if lazy else Qxmap.from_dict(map_data)
         return instance
 
 class Resources:
@@ -37,18 +47,52 @@ class Resources:
         """
         self.resources_fast = ResourcesFast(http_client)
 
-    def get_hd_map(self, scen_id: str, scen_ver: str) -> GetHdMapRes:
+    def enable_map_cache(self, cache: Optional[HdMapCache] = None) -> HdMapCache:
+        """Keep downloaded HD maps in a local cache, see ResourcesFast.enable_map_cache.
+
+        Repeated calls for the same scenario version return the same Qxmap
+        instance while it is held in the cache's memory; treat it as
+        read-only.
+        """
+        return self.resources_fast.enable_map_cache(cache)
+
+    def disable_map_cache(self):
+        """Download HD maps on every call again."""
+        self.resources_fast.disable_map_cache()
+
+    def get_hd_map(
+        self, scen_id: str, scen_ver: str, lazy: bool = False, arrays: bool = False, generated: bool = False
+    ) -> GetHdMapRes:
         """Get HD map for a scenario.
         
         Args:
             scen_id: Scenario ID
             scen_ver: Scenario version
+            lazy: Return a lazily decoded map that keeps the raw segments
+                and junctions and decodes each one on first access, e.g.
+                through Qxmap.segment_by_id
+            arrays: Store lane center lines and boundaries and link
+                reference lines and boundaries as NumPy arrays, see
+                lasvsim_openapi.polyline; requires numpy
+            generated: Decode the map with the generated decoder of
+                model_decoder instead of Qxmap.from_dict
             
         Returns:
             HD map response
             
         Raises:
             APIError: If the request fails
+            ValueError: If more than one of lazy, arrays and generated is set
         """
+        if lazy + arrays + generated > 1:
+            raise ValueError("only one of lazy, arrays and generated can be set")
+        cache = self.resources_fast.map_cache
+        if cache is not None:
+            res = GetHdMapRes()
+            res.data = cache.get(
+                scen_id, scen_ver, lambda: self.resources_fast._fetch_hd_map(scen_id, scen_ver), lazy, arrays,
+                generated,
+            )
+            return res
         reply = self.resources_fast.get_hd_map(scen_id, scen_ver)
-        return GetHdMapRes.from_dict(reply)
+        return GetHdMapRes.from_dict(reply, lazy=lazy, arrays=arrays, generated=generated)
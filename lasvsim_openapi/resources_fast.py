@@ -1,12 +1,15 @@
 """
 Resource module for the lasvsim API.
 """
+from typing import Optional
 
 from lasvsim_openapi.http_client import HttpClient
+from lasvsim_openapi.map_cache import HdMapCache
 
 class ResourcesFast:
     """Resources client for the API."""
     http_client: HttpClient = None
+    map_cache: Optional[HdMapCache] = None
 
     def __init__(self, http_client: HttpClient):
         """Initialize resources client.
@@ -16,8 +19,28 @@ class ResourcesFast:
         """
         self.http_client = http_client.clone()
 
+    def enable_map_cache(self, cache: Optional[HdMapCache] = None) -> HdMapCache:
+        """Keep downloaded HD maps in a local cache.
+
+        Args:
+            cache: Optional cache to use, e.g. one in a custom directory,
+                a cache in the default directory is created when omitted
+
+        Returns:
+            The cache in use
+        """
+        self.map_cache = cache if cache is not None else HdMapCache()
+        return self.map_cache
+
+    def disable_map_cache(self):
+        """Download HD maps on every call again, the cache files are kept."""
+        self.map_cache = None
+
     def get_hd_map(self, scen_id: str, scen_ver: str) :
         """Get HD map for a scenario.
+
+        With the map cache enabled, the map is downloaded once per scenario
+        version and the reply holds only "data".
         
         Args:
             scen_id: Scenario ID
@@ -29,7 +52,15 @@ class ResourcesFast:
         Raises:
             APIError: If the request fails
         """
+        if self.map_cache is not None:
+            return {"data": self.map_cache.get_data(scen_id, scen_ver, lambda: self._fetch_hd_map(scen_id, scen_ver))}
         return self.http_client.post(
             "/openapi/resource/v2/scenario/map/get",
             {"scen_id": scen_id, "scen_ver": scen_ver},
         )
+
+    def _fetch_hd_map(self, scen_id: str, scen_ver: str) -> Optional[dict]:
+        return self.http_client.post(
+            "/openapi/resource/v2/scenario/map/get",
+            {"scen_id": scen_id, "scen_ver": scen_ver},
+        ).get("data")
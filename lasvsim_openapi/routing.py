@@ -0,0 +1,431 @@
+"""
+Lane-level routing over HD map topology for the lasvsim API.
+"""
+import heapq
+import math
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lasvsim_openapi.qxmap import Lane, LaneMark, LaneMark_LaneMarkStyle, Qxmap
+
+# 边的种类
+FOLLOW = 0        # 驶入下游车道
+LANE_CHANGE = 1   # 同一 link 内换到相邻车道
+CONNECTION = 2    # 路口 connection 连接的上下游车道
+
+# 禁止跨越的车道线
+_SOLID_STYLES = frozenset((
+    LaneMark_LaneMarkStyle.LANE_MARK_STYLE_SOLID,
+    LaneMark_LaneMarkStyle.LANE_MARK_STYLE_DOUBLE_SOLID,
+))
+
+
+def _start_point(lane: Lane) -> Optional[Tuple[float, float]]:
+    line = lane.center_line
+    if not len(line):
+        return None
+    point = line[0].point
+    if point is None or point.x is None or point.y is None:
+        return None
+    return point.x, point.y
+
+
+def _side(lane: Lane, other: Lane) -> Optional[bool]:
+    """Whether other starts to the left of lane, by its first center line segment; None if unknown."""
+    line = lane.center_line
+    start = _start_point(other)
+    if len(line) < 2 or start is None:
+        return None
+    a, b = line[0].point, line[1].point
+    if a is None or b is None or None in (a.x, a.y, b.x, b.y):
+        return None
+    cross = (b.x - a.x) * (start[1] - a.y) - (b.y - a.y) * (start[0] - a.x)
+    return None if cross == 0 else cross > 0
+
+
+def _style(value) -> int:
+    if isinstance(value, str):
+        member = LaneMark_LaneMarkStyle.__members__.get(value)
+        return 0 if member is None else int(member)
+    return int(value or 0)
+
+
+def _is_solid(mark: LaneMark) -> bool:
+    style = _style(mark.style)
+    if style:
+        return style in _SOLID_STYLES
+    # 仅给出各条线的样式时, 全部为实线才禁止跨越
+    styles = [_style(s) for s in mark.styles or ()]
+    return bool(styles) and all(s in _SOLID_STYLES for s in styles)
+
+
+def _can_change(lane: Lane, other: Lane) -> bool:
+    """Whether the lane marks between two neighboring lanes allow changing from lane to other.
+
+    The change is allowed unless every mark on that side of lane is solid,
+    using the marks on the facing side of other when lane has none, and
+    when the side cannot be told from the center lines.
+    """
+    left = _side(lane, other)
+    if left is None:
+        return True
+    marks = lane.left_lane_marks if left else lane.right_lane_marks
+    if not marks:
+        marks = other.right_lane_marks if left else other.left_lane_marks
+    marks = [m for m in marks or () if m is not None]
+    return not marks or not all(_is_solid(m) for m in marks)
+
+
+def _polyline_length(points) -> float:
+    coords = [(p.x, p.y) for p in points if p is not None]
+    return sum(math.hypot(b[0] - a[0], b[1] - a[1]) for a, b in zip(coords, coords[1:]))
+
+
+def _lane_length(lane: Lane) -> float:
+    if lane.length:
+        return float(lane.length)
+    return _polyline_length([c.point for c in lane.center_line])
+
+
+class ShortestPathTree:
+    """Shortest routes from every lane to one set of target lanes.
+
+    ``cost[i]`` is the route cost from lane i, inf if the targets cannot be
+    reached, and ``next[i]`` the lane to go to from lane i, -1 at a target
+    or where unreachable. Lanes are indexes into LaneGraph.lane_ids.
+    """
+    __slots__ = ("targets", "cost", "next")
+
+    def __init__(self, targets: Tuple[int, ...], cost: List[float], next: List[int]):
+        self.targets = targets
+        self.cost = cost
+        self.next = next
+
+    def path(self, source: int) -> Optional[List[int]]:
+        """Lane indexes from source to the nearest target, None if unreachable."""
+        if self.cost[source] == math.inf:
+            return None
+        path = [source]
+        nxt = self.next
+        while nxt[path[-1]] >= 0:
+            path.append(nxt[path[-1]])
+        return path
+
+
+class LaneGraph:
+    """Routing graph over the lanes of a map.
+
+    Nodes are lanes. A lane has an edge to each of its downstream lanes and
+    to the downstream lane of each junction connection starting from it,
+    costing the length of the lane; lanes of a link without lane topology
+    get an edge to every lane of each downstream link instead. Lanes also
+    have an edge to each neighbor in the same link, costing
+    lane_change_cost, unless the lane marks between them are solid along
+    the whole lane. Edges are stored in CSR form: the edges of lane i are
+    ``targets[offsets[i]:offsets[i + 1]]`` with the matching ``weights``
+    and ``kinds``.
+
+    Single queries run A* with the straight-line distance between lane
+    start points, scaled down so that it never overestimates on this
+    graph; when some lane has no start point it falls back to Dijkstra.
+    Shortest-path trees towards a destination serve any number of vehicles
+    heading there and are kept in an LRU cache.
+    """
+
+    lane_ids: List[str] = None
+    lane_change_cost: float = 20.0
+
+    def __init__(self, hd_map: Qxmap, lane_change_cost: float = 20.0, cache_size: int = 64):
+        """Build the graph.
+
+        Args:
+            hd_map: The map
+            lane_change_cost: Cost of moving to an adjacent lane of the
+                same link, in meters of driving
+            cache_size: Number of shortest-path trees kept
+
+        Raises:
+            ValueError: If lane_change_cost is negative
+        """
+        if lane_change_cost < 0:
+            raise ValueError(f"lane_change_cost must not be negative, got {lane_change_cost}")
+        self.lane_change_cost = float(lane_change_cost)
+        self.cache_size = cache_size
+        self._trees: "OrderedDict[Tuple[int, ...], ShortestPathTree]" = OrderedDict()
+
+        lanes: List[Lane] = []
+        self.lane_link: List[str] = []
+        self._link_lanes: Dict[str, List[int]] = {}
+        neighbors = []
+        links = list(hd_map.iter_links())
+        for link in links:
+            indexes = list(range(len(lanes), len(lanes) + len(link.ordered_lanes)))
+            lanes.extend(link.ordered_lanes)
+            self.lane_link.extend([link.id] * len(indexes))
+            self._link_lanes.setdefault(link.id, []).extend(indexes)
+            neighbors.extend(zip(indexes, indexes[1:]))
+        self.lane_ids = [lane.id for lane in lanes]
+        self._index = {lane_id: i for i, lane_id in enumerate(self.lane_ids)}
+        self.lengths = [_lane_length(lane) for lane in lanes]
+
+        # (源, 目标) -> (代价, 种类), 重复边保留代价最小者
+        edges: Dict[Tuple[int, int], Tuple[float, int]] = {}
+
+        def add(u: int, v: int, weight: float, kind: int):
+            old = edges.get((u, v))
+            if old is None or weight < old[0]:
+                edges[(u, v)] = (weight, kind)
+
+        index = self._index
+        for u, lane in enumerate(lanes):
+            for lane_id in lane.downstream_lane_ids:
+                v = index.get(lane_id)
+                if v is not None:
+                    add(u, v, self.lengths[u], FOLLOW)
+        # link 内没有车道级拓扑时, 按 link 的下游关系连接所有车道
+        for link in links:
+            if any(lane.downstream_lane_ids for lane in link.ordered_lanes):
+                continue
+            sources = self._link_lanes.get(link.id, ())
+            for link_id in link.downstream_link_ids:
+                for v in self._link_lanes.get(link_id, ()):
+                    for u in sources:
+                        add(u, v, self.lengths[u], FOLLOW)
+        for a, b in neighbors:
+            if _can_change(lanes[a], lanes[b]):
+                add(a, b, self.lane_change_cost, LANE_CHANGE)
+            if _can_change(lanes[b], lanes[a]):
+                add(b, a, self.lane_change_cost, LANE_CHANGE)
+        for junction in hd_map.junctions or ():
+            for connection in junction.connections or ():
+                u = index.get(connection.upstream_lane_id)
+                v = index.get(connection.downstream_lane_id)
+                if u is not None and v is not None:
+                    path = 0.0 if connection.path is None else _polyline_length(connection.path.points)
+                    add(u, v, self.lengths[u] + path, CONNECTION)
+
+        n = len(lanes)
+        ordered = sorted(edges.items())
+        self.offsets = [0] * (n + 1)
+        for (u, _), _ in ordered:
+            self.offsets[u + 1] += 1
+        for i in range(n):
+            self.offsets[i + 1] += self.offsets[i]
+        self.targets = [v for (_, v), _ in ordered]
+        self.weights = [w for _, (w, _) in ordered]
+        self.kinds = [k for _, (_, k) in ordered]
+
+        # 反向邻接, 用于从目的地出发构建最短路径树
+        reverse = sorted((v, u, w) for (u, v), (w, _) in ordered)
+        self._reverse_offsets = [0] * (n + 1)
+        for v, _, _ in reverse:
+            self._reverse_offsets[v + 1] += 1
+        for i in range(n):
+            self._reverse_offsets[i + 1] += self._reverse_offsets[i]
+        self._reverse_sources = [u for _, u, _ in reverse]
+        self._reverse_weights = [w for _, _, w in reverse]
+
+        # A* 启发函数: 车道起点间的直线距离乘以不超过任何边 代价/位移 的系数, 保证可采纳
+        self._starts = [_start_point(lane) for lane in lanes]
+        scale = 1.0
+        if None in self._starts:
+            # 经过无起点车道的路径没有下界, 退化为 Dijkstra
+            scale = 0.0
+        for (u, v), (w, _) in ordered:
+            if scale <= 0:
+                break
+            a, b = self._starts[u], self._starts[v]
+            d = math.hypot(b[0] - a[0], b[1] - a[1])
+            if d > w:
+                scale = min(scale, w / d)
+        self._scale = scale
+
+    def __len__(self) -> int:
+        """Number of lanes."""
+        return len(self.lane_ids)
+
+    def _target_indexes(self, to_lane_id: Optional[str], to_link_id: Optional[str]) -> Tuple[int, ...]:
+        if (to_lane_id is None) == (to_link_id is None):
+            raise ValueError("exactly one of to_lane_id and to_link_id is required")
+        if to_lane_id is not None:
+            target = self._index.get(to_lane_id)
+            if target is None:
+                raise ValueError(f"unknown lane: {to_lane_id}")
+            return (target,)
+        targets = self._link_lanes.get(to_link_id)
+        if not targets:
+            raise ValueError(f"unknown link or link without lanes: {to_link_id}")
+        return tuple(targets)
+
+    def _source_index(self, from_lane_id: str) -> int:
+        source = self._index.get(from_lane_id)
+        if source is None:
+            raise ValueError(f"unknown lane: {from_lane_id}")
+        return source
+
+    def shortest_path_tree(self, to_lane_id: Optional[str] = None, to_link_id: Optional[str] = None) -> ShortestPathTree:
+        """Get the shortest-path tree towards a lane or any lane of a link, building it on first use.
+
+        Args:
+            to_lane_id: Destination lane ID
+            to_link_id: Destination link ID, instead of to_lane_id
+
+        Returns:
+            The tree
+
+        Raises:
+            ValueError: If the destination is unknown or not exactly one
+                of to_lane_id and to_link_id is given
+        """
+        targets = self._target_indexes(to_lane_id, to_link_id)
+        tree = self._trees.get(targets)
+        if tree is not None:
+            self._trees.move_to_end(targets)
+            return tree
+
+        n = len(self.lane_ids)
+        cost = [math.inf] * n
+        nxt = [-1] * n
+        heap = []
+        for t in targets:
+            cost[t] = 0.0
+            heap.append((0.0, t))
+        heapq.heapify(heap)
+        offsets, sources, weights = self._reverse_offsets, self._reverse_sources, self._reverse_weights
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > cost[v]:
+                continue
+            for e in range(offsets[v], offsets[v + 1]):
+                u = sources[e]
+                nd = d + weights[e]
+                if nd < cost[u]:
+                    cost[u] = nd
+                    nxt[u] = v
+                    heapq.heappush(heap, (nd, u))
+
+        tree = ShortestPathTree(targets, cost, nxt)
+        if self.cache_size > 0:
+            self._trees[targets] = tree
+            while len(self._trees) > self.cache_size:
+                self._trees.popitem(last=False)
+        return tree
+
+    def _astar(self, source: int, targets: Tuple[int, ...]) -> Tuple[float, Optional[List[int]]]:
+        goal = set(targets)
+        starts = self._starts
+        scale = self._scale
+        goal_points = [starts[t] for t in targets if starts[t] is not None]
+        if scale <= 0 or len(goal_points) != len(targets):
+            goal_points = []
+
+        def heuristic(v: int) -> float:
+            p = starts[v]
+            if p is None or not goal_points:
+                return 0.0
+            return scale * min(math.hypot(p[0] - q[0], p[1] - q[1]) for q in goal_points)
+
+        cost = {source: 0.0}
+        prev = {source: -1}
+        heap = [(heuristic(source), 0.0, source)]
+        offsets, targets_, weights = self.offsets, self.targets, self.weights
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if d > cost[u]:
+                continue
+            if u in goal:
+                path = [u]
+                while prev[path[-1]] >= 0:
+                    path.append(prev[path[-1]])
+                return d, path[::-1]
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets_[e]
+                nd = d + weights[e]
+                if nd < cost.get(v, math.inf):
+                    cost[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd + heuristic(v), nd, v))
+        return math.inf, None
+
+    def _route(self, from_lane_id: str, to_lane_id: Optional[str], to_link_id: Optional[str]):
+        source = self._source_index(from_lane_id)
+        targets = self._target_indexes(to_lane_id, to_link_id)
+        tree = self._trees.get(targets)
+        if tree is not None:
+            return tree.cost[source], tree.path(source)
+        return self._astar(source, targets)
+
+    def lane_route(
+        self, from_lane_id: str, to_lane_id: Optional[str] = None, to_link_id: Optional[str] = None
+    ) -> Optional[List[str]]:
+        """Find the cheapest lane sequence to a lane or to any lane of a link.
+
+        A cached shortest-path tree towards the destination is used when
+        there is one, A* otherwise.
+
+        Args:
+            from_lane_id: Start lane ID
+            to_lane_id: Destination lane ID
+            to_link_id: Destination link ID, instead of to_lane_id
+
+        Returns:
+            Lane IDs from the start lane to the destination, including
+            lane changes, or None if the destination cannot be reached
+
+        Raises:
+            ValueError: If a lane or link is unknown
+        """
+        _, path = self._route(from_lane_id, to_lane_id, to_link_id)
+        return None if path is None else [self.lane_ids[i] for i in path]
+
+    def route_cost(self, from_lane_id: str, to_lane_id: Optional[str] = None, to_link_id: Optional[str] = None) -> float:
+        """Cost of the cheapest route, inf if unreachable, see lane_route."""
+        return self._route(from_lane_id, to_lane_id, to_link_id)[0]
+
+    def _links(self, path: Optional[List[int]]) -> Optional[List[str]]:
+        if path is None:
+            return None
+        links = []
+        for i in path:
+            link_id = self.lane_link[i]
+            if not links or links[-1] != link_id:
+                links.append(link_id)
+        return links
+
+    def link_route(
+        self, from_lane_id: str, to_lane_id: Optional[str] = None, to_link_id: Optional[str] = None
+    ) -> Optional[List[str]]:
+        """Find the links of the cheapest route, e.g. for Simulator.set_vehicle_link_nav.
+
+        Args:
+            from_lane_id: Start lane ID
+            to_lane_id: Destination lane ID
+            to_link_id: Destination link ID, instead of to_lane_id
+
+        Returns:
+            Link IDs starting with the link of the start lane, or None if
+            the destination cannot be reached
+
+        Raises:
+            ValueError: If a lane or link is unknown
+        """
+        return self._links(self._route(from_lane_id, to_lane_id, to_link_id)[1])
+
+    def link_routes(
+        self, from_lane_ids: Iterable[str], to_lane_id: Optional[str] = None, to_link_id: Optional[str] = None
+    ) -> Dict[str, Optional[List[str]]]:
+        """Find link routes of many vehicles to one destination with a single shortest-path tree.
+
+        Args:
+            from_lane_ids: Start lane IDs, e.g. of every vehicle
+            to_lane_id: Destination lane ID
+            to_link_id: Destination link ID, instead of to_lane_id
+
+        Returns:
+            Link route, or None, by start lane ID
+
+        Raises:
+            ValueError: If a lane or link is unknown
+        """
+        tree = self.shortest_path_tree(to_lane_id, to_link_id)
+        return {lane_id: self._links(tree.path(self._source_index(lane_id))) for lane_id in from_lane_ids}
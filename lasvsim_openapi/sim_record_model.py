@@ -41,14 +41,16 @@ class GetRecordIdsRes:
 @dataclass
 class Track:
     """Track information."""
-    x: float = 0.0
-    y: float = 0.0
-    z: float = 0.0
-    phi: float = 0.0
-    lane_id: str = ""  # 车道ID，允许为空
-    position_type: str = ""
-    timestamp: int = 0
-    position: Optional[Position] = None
+    # 录制数据中的高频模型使用 __slots__ 减少内存占用, 默认值由 __init__ 提供
+    __slots__ = ("x", "y", "z", "phi", "lane_id", "position_type", "timestamp", "position")
+    x: float
+    y: float
+    z: float
+    phi: float
+    lane_id: str  # 车道ID，允许为空
+    position_type: str
+    timestamp: int
+    position: Optional[Position]
     
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0, phi: float = 0.0, lane_id: str = "", position_type: str = "", timestamp: int = 0, position: Optional[Position] = None):
         self.x = x
@@ -132,33 +134,34 @@ class GetTrackResultsRes:
 @dataclass
 class SensorObj:
     """Sensor object information."""
-    id: str = ""
-    speed: float = 0.0
-    x: float = 0.0
-    y: float = 0.0
-    z: float = 0.0
-    length: float = 0.0
-    width: float = 0.0
-    height: float = 0.0
-    phi: float = 0.0
+    __slots__ = ("id", "speed", "x", "y", "z", "length", "width", "height", "phi", "exterior_light", "risk_2_ego", "lon_acc", "v", "lat_acc", "w", "w_acc", "lane_id", "position_type", "position")
+    id: str
+    speed: float
+    x: float
+    y: float
+    z: float
+    length: float
+    width: float
+    height: float
+    phi: float
     # 最低位起置1表示灯光点亮:近光灯(0) 远光灯(1) 左转向灯(2) 右转向灯(3)
     # 紧急报警灯(4) 刹车灯(5) e.g. "000001" 近光灯; "100000" 刹车灯; "111111"
     # 全亮
-    exterior_light: str = ""
+    exterior_light: str
     # 0(无风险); 1(低风险); 2(高风险)
-    risk_2_ego: int = 0
+    risk_2_ego: int
     # 纵向加速度
-    lon_acc: float = 0.0
+    lon_acc: float
     # 横向速度
-    v: float = 0.0
+    v: float
     # 横向加速度
-    lat_acc: float = 0.0
+    lat_acc: float
     # 横摆角速度
-    w: float = 0.0
+    w: float
     # 横摆角加速度
-    w_acc: float = 0.0
+    w_acc: float
     # 车道ID，允许为空
-    lane_id: str = ""
+    lane_id: str
     # POSITION_TYPE_UNKNOWN = 0;
     # 1. 在车道内
     # POSITION_TYPE_IN_LANE = 1;
@@ -166,8 +169,8 @@ class SensorObj:
     # POSITION_TYPE_IN_JUNCTION = 2;
     # 3. 在道路外
     # POSITION_TYPE_OUT_ROAD = 3;
-    position_type: str = ""
-    position: Optional[Position] = None
+    position_type: str
+    position: Optional[Position]
 
     def __init__(self, id: str = "", speed: float = 0.0, x: float = 0.0, y: float = 0.0, z: float = 0.0, length: float = 0.0, width: float = 0.0, height: float = 0.0, phi: float = 0.0, exterior_light: str = "", risk_2_ego: int = 0, lon_acc: float = 0.0, v: float = 0.0, lat_acc: float = 0.0, w: float = 0.0, w_acc: float = 0.0, lane_id: str = "", position_type: str = "", position: Optional[Position] = None):
         self.id = id
@@ -262,21 +265,22 @@ class GetSensorResultsRes:
 @dataclass
 class Step:
     """Step information."""
-    speed: float = 0.0
-    acc: float = 0.0
-    mileage: float = 0.0
-    ste_wheel: float = 0.0
-    turn_signal: str = ""
-    v: float = 0.0
-    lat_acc: float = 0.0
-    w: float = 0.0
-    w_acc: float = 0.0
-    u: float = 0.0
-    u_acc: float = 0.0
-    reference_speed: float = 0.0
-    timestamp: int = 0
-    position: Optional[Position] = None
-    distance_to_front: float = 0.0
+    __slots__ = ("speed", "acc", "mileage", "ste_wheel", "turn_signal", "v", "lat_acc", "w", "w_acc", "u", "u_acc", "reference_speed", "timestamp", "position", "distance_to_front")
+    speed: float
+    acc: float
+    mileage: float
+    ste_wheel: float
+    turn_signal: str
+    v: float
+    lat_acc: float
+    w: float
+    w_acc: float
+    u: float
+    u_acc: float
+    reference_speed: float
+    timestamp: int
+    position: Optional[Position]
+    distance_to_front: float
 
     def __init__(self, speed: float = 0.0, acc: float = 0.0, mileage: float = 0.0, ste_wheel: float = 0.0, turn_signal: str = "", v: float = 0.0, lat_acc: float = 0.0, w: float = 0.0, w_acc: float = 0.0, reference_speed: float = 0.0, timestamp: int = 0, position: Optional[Position] = None,u: float = 0.0,u_acc: float = 0.0,distance_to_front: float = 0.0):
         self.speed = speed
@@ -301,7 +305,9 @@ class Step:
             return None
         position = data.pop("position", None)
         instance = cls()
-        instance.__dict__.update(data)
+        for name in cls.__slots__:
+            if name in data:
+                setattr(instance, name, data[name])
         instance.position = None if position is None else Position.from_dict(position)
         return instance
 
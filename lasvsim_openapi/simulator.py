@@ -2,10 +2,12 @@
 Simulator module for the lasvsim API.
 """
 
-from typing import Dict, List, Optional
-from dataclasses import asdict
+from typing import Dict, List, Optional, Type, TypeVar
 
 from lasvsim_openapi.http_client import HttpClient
+from lasvsim_openapi.lazy_model import lazy_from_dict
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.model_encoder import to_dict
 from lasvsim_openapi.simulator_fast import SimulatorFast
 from lasvsim_openapi.simulator_model import (
     Point,
@@ -103,19 +105,42 @@ from lasvsim_openapi.simulator_model import (
     IdcStepRes,
 )
 
+T = TypeVar('T')
+
 
 class Simulator:
     """Simulator client for the API."""
 
     simulator_fast: SimulatorFast = None
+    lazy: bool = False
+    generated: bool = False
 
-    def __init__(self, simulator_v2: SimulatorFast):
+    def __init__(self, simulator_v2: SimulatorFast, lazy: bool = False, generated: bool = False):
         """Initialize simulator client.
 
         Args:
             http_client: HTTP client instance
+            lazy: Return lazily decoded responses, whose nested members are
+                only built when their attribute is first read
+            generated: Decode responses with the generated decoders of
+                model_decoder instead of from_dict, see
+                benchmarks/bench_decoders.py for the speedup
+
+        Raises:
+            ValueError: If both lazy and generated are set
         """
+        if lazy and generated:
+            raise ValueError("lazy and generated cannot be combined")
         self.simulator_fast = simulator_v2
+        self.lazy = lazy
+        self.generated = generated
+
+    def _decode(self, cls: Type[T], reply: dict) -> T:
+        if self.lazy:
+            return lazy_from_dict(cls, reply)
+        if self.generated:
+            return decode(cls, reply)
+        return cls.from_dict(reply)
 
     def step(self) -> StepRes:
         """Step the simulation forward.
@@ -127,7 +152,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.step()
-        return StepRes.from_dict(reply)
+        return self._decode(StepRes, reply)
 
     def stop(self) -> StopRes:
         """Stop the simulation.
@@ -139,7 +164,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.stop()
-        return StopRes.from_dict(reply)
+        return self._decode(StopRes, reply)
 
     def reset(
         self,
@@ -161,7 +186,7 @@ class Simulator:
         reply = self.simulator_fast.reset(
             reset_traffic_flow, reset_vehicle, reset_env_ptcs=reset_env_ptcs
         )
-        return ResetRes.from_dict(reply)
+        return self._decode(ResetRes, reply)
 
     # --------- 地图部分 ---------
     def get_current_stage(self, junction_id: str) -> GetCurrentStageRes:
@@ -177,7 +202,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_current_stage(junction_id)
-        return GetCurrentStageRes.from_dict(reply)
+        return self._decode(GetCurrentStageRes, reply)
 
     def get_movement_signal(self, movement_id: str) -> GetMovementSignalRes:
         """Get movement signal.
@@ -192,7 +217,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_movement_signal(movement_id)
-        return GetMovementSignalRes.from_dict(reply)
+        return self._decode(GetMovementSignalRes, reply)
 
     def get_signal_plan(self, junction_id: str) -> GetSignalPlanRes:
         """Get signal plan.
@@ -207,7 +232,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_signal_plan(junction_id)
-        return GetSignalPlanRes.from_dict(reply)
+        return self._decode(GetSignalPlanRes, reply)
 
     def get_movement_list(self, junction_id: str) -> GetMovementListRes:
         """Get movement list.
@@ -222,7 +247,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_movement_list(junction_id)
-        return GetMovementListRes.from_dict(reply)
+        return self._decode(GetMovementListRes, reply)
 
     # --------- 车辆部分 ---------
     def get_vehicle_id_list(self) -> GetVehicleIdListRes:
@@ -235,7 +260,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_id_list()
-        return GetVehicleIdListRes.from_dict(reply)
+        return self._decode(GetVehicleIdListRes, reply)
 
     def get_test_vehicle_id_list(self) -> GetTestVehicleIdListRes:
         """Get test vehicle ID list.
@@ -247,7 +272,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_test_vehicle_id_list()
-        return GetTestVehicleIdListRes.from_dict(reply)
+        return self._decode(GetTestVehicleIdListRes, reply)
 
     def get_vehicle_base_info(
         self, vehicle_id_list: List[str]
@@ -264,7 +289,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_base_info(vehicle_id_list)
-        return GetVehicleBaseInfoRes.from_dict(reply)
+        return self._decode(GetVehicleBaseInfoRes, reply)
 
     def get_vehicle_position(self, vehicle_id_list: List[str]) -> GetVehiclePositionRes:
         """Get vehicle position.
@@ -279,7 +304,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_position(vehicle_id_list)
-        return GetVehiclePositionRes.from_dict(reply)
+        return self._decode(GetVehiclePositionRes, reply)
 
     def get_vehicle_moving_info(
         self, vehicle_id_list: List[str]
@@ -296,7 +321,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_moving_info(vehicle_id_list)
-        return GetVehicleMovingInfoRes.from_dict(reply)
+        return self._decode(GetVehicleMovingInfoRes, reply)
 
     def get_vehicle_control_info(
         self, vehicle_id_list: List[str]
@@ -313,7 +338,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_control_info(vehicle_id_list)
-        return GetVehicleControlInfoRes.from_dict(reply)
+        return self._decode(GetVehicleControlInfoRes, reply)
 
     def get_vehicle_perception_info(
         self, vehicle_id: str
@@ -330,7 +355,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_perception_info(vehicle_id)
-        return GetVehiclePerceptionInfoRes.from_dict(reply)
+        return self._decode(GetVehiclePerceptionInfoRes, reply)
 
     def get_vehicle_reference_lines(
         self, vehicle_id: str
@@ -347,7 +372,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_reference_lines(vehicle_id)
-        return GetVehicleReferenceLinesRes.from_dict(reply)
+        return self._decode(GetVehicleReferenceLinesRes, reply)
 
     def get_vehicle_dis_to_link_boundary(self, vehicle_id: str):
         return self.simulator_fast.get_vehicle_dis_to_link_boundary(vehicle_id)
@@ -365,7 +390,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_planning_info(vehicle_id)
-        return GetVehiclePlanningInfoRes.from_dict(reply)
+        return self._decode(GetVehiclePlanningInfoRes, reply)
 
     def get_vehicle_navigation_info(
         self, vehicle_id: str
@@ -382,7 +407,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_navigation_info(vehicle_id)
-        return GetVehicleNavigationInfoRes.from_dict(reply)
+        return self._decode(GetVehicleNavigationInfoRes, reply)
 
     def get_vehicle_collision_status(
         self, vehicle_id: str
@@ -399,7 +424,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_collision_status(vehicle_id)
-        return GetVehicleCollisionStatusRes.from_dict(reply)
+        return self._decode(GetVehicleCollisionStatusRes, reply)
 
     def get_vehicle_target_speed(self, vehicle_id: str) -> GetVehicleTargetSpeedRes:
         """Get vehicle target speed.
@@ -414,7 +439,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_target_speed(vehicle_id)
-        return GetVehicleTargetSpeedRes.from_dict(reply)
+        return self._decode(GetVehicleTargetSpeedRes, reply)
 
     def get_vehicle_sensor_config(self, vehicle_id: str) -> GetVehicleSensorConfigRes:
         """Get vehicle sensor configuration.
@@ -429,7 +454,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_vehicle_sensor_config(vehicle_id=vehicle_id)
-        return GetVehicleSensorConfigRes.from_dict(reply)
+        return self._decode(GetVehicleSensorConfigRes, reply)
 
     def set_vehicle_control_info(
         self,
@@ -453,7 +478,7 @@ class Simulator:
         reply = self.simulator_fast.set_vehicle_control_info(
             vehicle_id=vehicle_id, ste_wheel=ste_wheel, lon_acc=lon_acc
         )
-        return SetVehicleControlInfoRes.from_dict(reply)
+        return self._decode(SetVehicleControlInfoRes, reply)
 
     def set_vehicle_moving_info(
         self,
@@ -491,7 +516,7 @@ class Simulator:
             v_acc=v_acc,
             w_acc=w_acc,
         )
-        return SetVehicleMovingInfoRes.from_dict(reply)
+        return self._decode(SetVehicleMovingInfoRes, reply)
 
     def set_vehicle_base_info(
         self,
@@ -515,7 +540,7 @@ class Simulator:
         reply = self.simulator_fast.set_vehicle_base_info(
             vehicle_id=vehicle_id, base_info=base_info, dynamic_info=dynamic_info
         )
-        return SetVehicleBaseInfoRes.from_dict(reply)
+        return self._decode(SetVehicleBaseInfoRes, reply)
 
     def set_vehicle_planning_info(
         self, vehicle_id: str, planning_path: List[Point], speed: List[float]
@@ -536,7 +561,7 @@ class Simulator:
         reply = self.simulator_fast.set_vehicle_planning_info(
             vehicle_id=vehicle_id, planning_path=planning_path, speed=speed
         )
-        return SetVehiclePlanningInfoRes.from_dict(reply)
+        return self._decode(SetVehiclePlanningInfoRes, reply)
 
     def set_vehicle_position(
         self, vehicle_id: str, point: Point, phi: Optional[float] = None
@@ -557,7 +582,7 @@ class Simulator:
         reply = self.simulator_fast.set_vehicle_position(
             vehicle_id=vehicle_id, point=point, phi=phi
         )
-        return SetVehiclePositionRes.from_dict(reply)
+        return self._decode(SetVehiclePositionRes, reply)
 
     def set_vehicle_link_nav(
         self, vehicle_id: str, link_id_list: List[str]
@@ -577,7 +602,7 @@ class Simulator:
         reply = self.simulator_fast.set_vehicle_link_nav(
             vehicle_id=vehicle_id, link_id_list=link_id_list
         )
-        return SetVehicleLinkNavRes.from_dict(reply)
+        return self._decode(SetVehicleLinkNavRes, reply)
 
     def set_vehicle_destination(
         self, vehicle_id: str, destination: Point
@@ -597,7 +622,7 @@ class Simulator:
         reply = self.simulator_fast.set_vehicle_destination(
             vehicle_id=vehicle_id, destination=destination
         )
-        return SetVehicleDestinationRes.from_dict(reply)
+        return self._decode(SetVehicleDestinationRes, reply)
 
     # --------- 行人部分 ---------
     def get_ped_id_list(self) -> GetPedIdListRes:
@@ -610,7 +635,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_ped_id_list()
-        return GetPedIdListRes.from_dict(reply)
+        return self._decode(GetPedIdListRes, reply)
 
     def get_ped_base_info(self, ped_id_list: List[str]) -> GetPedBaseInfoRes:
         """Get pedestrian base information.
@@ -625,7 +650,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_ped_base_info(ped_id_list)
-        return GetPedBaseInfoRes.from_dict(reply)
+        return self._decode(GetPedBaseInfoRes, reply)
 
     def set_ped_position(
         self, ped_id: str, point: Point, phi: Optional[float] = None
@@ -646,7 +671,7 @@ class Simulator:
         reply = self.simulator_fast.set_ped_position(
             ped_id=ped_id, point=point, phi=phi
         )
-        return SetPedPositionRes.from_dict(reply)
+        return self._decode(SetPedPositionRes, reply)
 
     # --------- 非机动车部分 ---------
     def get_nmv_id_list(self) -> GetNMVIdListRes:
@@ -659,7 +684,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_nmv_id_list()
-        return GetNMVIdListRes.from_dict(reply)
+        return self._decode(GetNMVIdListRes, reply)
 
     def get_nmv_base_info(self, nmv_id_list: List[str]) -> GetNMVBaseInfoRes:
         """Get non-motor vehicle base information.
@@ -674,7 +699,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_nmv_base_info(nmv_id_list)
-        return GetNMVBaseInfoRes.from_dict(reply)
+        return self._decode(GetNMVBaseInfoRes, reply)
 
     def set_nmv_position(
         self, nmv_id: str, point: Point, phi: Optional[float] = None
@@ -695,7 +720,7 @@ class Simulator:
         reply = self.simulator_fast.set_nmv_position(
             nmv_id=nmv_id, point=point, phi=phi
         )
-        return SetNMVPositionRes.from_dict(reply)
+        return self._decode(SetNMVPositionRes, reply)
 
     def get_step_spawn_id_list(self) -> GetStepSpawnIdListRes:
         """Get step spawn ID list.
@@ -707,7 +732,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_step_spawn_id_list()
-        return GetStepSpawnIdListRes.from_dict(reply)
+        return self._decode(GetStepSpawnIdListRes, reply)
 
     def get_participant_base_info(
         self, participant_id_list: List[str]
@@ -724,7 +749,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_participant_base_info(participant_id_list)
-        return GetParticipantBaseInfoRes.from_dict(reply)
+        return self._decode(GetParticipantBaseInfoRes, reply)
 
     def get_participant_moving_info(
         self, participant_id_list: List[str]
@@ -741,7 +766,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.get_participant_moving_info(participant_id_list)
-        return GetParticipantMovingInfoRes.from_dict(reply)
+        return self._decode(GetParticipantMovingInfoRes, reply)
 
     def get_participant_position(
         self, participant_id_list: List[str]
@@ -760,7 +785,7 @@ class Simulator:
         reply = self.simulator_fast.get_participant_position(
             participant_id_list=participant_id_list
         )
-        return GetParticipantPositionRes.from_dict(reply)
+        return self._decode(GetParticipantPositionRes, reply)
 
     def next_stage(self, junction_id: str) -> NextStageRes:
         """Move to next stage.
@@ -775,7 +800,7 @@ class Simulator:
             APIError: If the request fails
         """
         reply = self.simulator_fast.next_stage(junction_id)
-        return NextStageRes.from_dict(reply)
+        return self._decode(NextStageRes, reply)
 
     def set_vehicle_road_perception_info(
         self,
@@ -785,9 +810,9 @@ class Simulator:
 
         reply = self.simulator_fast.set_vehicle_road_perception_info(
             vehicle_id,
-            asdict(noa),
+            to_dict(noa),
         )
-        return SetVehicleRoadPerceptionInfoRes.from_dict(reply)
+        return self._decode(SetVehicleRoadPerceptionInfoRes, reply)
 
     def set_vehicle_obstacle_perception_info(
         self,
@@ -797,9 +822,9 @@ class Simulator:
 
         reply = self.simulator_fast.set_vehicle_obstacle_perception_info(
             vehicle_id,
-            [asdict(obstacle) for obstacle in obstacles],
+            to_dict(obstacles),
         )
-        return SetVehicleObstaclePerceptionInfoRes.from_dict(reply)
+        return self._decode(SetVehicleObstaclePerceptionInfoRes, reply)
 
     def set_vehicle_extra_metrics(
         self,
@@ -811,7 +836,7 @@ class Simulator:
             vehicle_id,
             metrics,
         )
-        return SetVehicleExtraMetricsRes.from_dict(reply)
+        return self._decode(SetVehicleExtraMetricsRes, reply)
 
     def set_vehicle_local_paths(
         self,
@@ -822,10 +847,10 @@ class Simulator:
 
         reply = self.simulator_fast.set_vehicle_local_paths(
             vehicle_id,
-            [asdict(local_path) for local_path in local_paths],
+            local_paths,
             choose_idx,
         )
-        return SetVehicleLocalPathsRes.from_dict(reply)
+        return self._decode(SetVehicleLocalPathsRes, reply)
 
     def get_idc_vehicle_nav(
         self,
@@ -835,7 +860,7 @@ class Simulator:
         reply = self.simulator_fast.get_idc_vehicle_nav(
             vehicle_id,
         )
-        return GetIdcVehicleNavRes.from_dict(reply)
+        return self._decode(GetIdcVehicleNavRes, reply)
 
     def idc_step(
         self,
@@ -851,4 +876,4 @@ class Simulator:
             lon_acc,
             ref_limit,
         )
-        return IdcStepRes.from_dict(reply)
+        return self._decode(IdcStepRes, reply)
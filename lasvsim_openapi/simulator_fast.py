@@ -1,9 +1,44 @@
 from lasvsim_openapi.http_client import HttpClient
 from lasvsim_openapi.simulator_model import SimulatorConfig
-from typing import Dict, List, Optional
-from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from lasvsim_openapi.model_encoder import local_path_dicts, point_dict, point_dicts, to_dict, value_list
 
 from lasvsim_openapi.simulator_model import ObjBaseInfo, DynamicInfo, Point
+from lasvsim_openapi.static_cache import (
+    BASE_INFO,
+    MOVEMENT_LIST,
+    SENSOR_CONFIG,
+    SIGNAL_PLAN,
+    VEHICLE_KINDS,
+    StaticDataCache,
+)
+
+# 服务端单次查询的 ID 数量上限
+ID_LIST_LIMIT = 1000
+
+
+def split_id_list(id_list: List[str], chunk_size: int) -> List[List[str]]:
+    """Split an ID list into chunks of at most chunk_size IDs."""
+    return [id_list[i:i + chunk_size] for i in range(0, len(id_list), chunk_size)]
+
+
+def merge_replies(replies: List[dict]) -> dict:
+    """Merge the replies of a chunked ID list query.
+
+    Dict members (e.g. position_dict) are merged key by key and list members
+    concatenated; any other member is taken from the first reply.
+    """
+    merged = dict(replies[0])
+    for reply in replies[1:]:
+        for key, value in reply.items():
+            current = merged.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged[key] = {**current, **value}
+            elif isinstance(current, list) and isinstance(value, list):
+                merged[key] = current + value
+            elif key not in merged:
+                merged[key] = value
+    return merged
 
 
 class SimulatorFast:
@@ -11,6 +46,9 @@ class SimulatorFast:
 
     http_client: HttpClient = None
     simulation_id: str = ""
+    # 超过该数量的 ID 列表会被拆分后并发查询
+    id_list_chunk_size: int = ID_LIST_LIMIT
+    static_cache: Optional[StaticDataCache] = None
 
     def __init__(self, http_client: HttpClient, sim_config: SimulatorConfig):
         """Initialize simulator client.
@@ -34,6 +72,63 @@ class SimulatorFast:
         self.http_client.headers["x-md-rl-direct-addr"] = reply["simulation_addr"]
         self.simulation_id = reply["simulation_id"]
 
+    def enable_static_cache(self, cache: Optional[StaticDataCache] = None) -> StaticDataCache:
+        """Cache vehicle base info, sensor configs, movement lists and signal plans.
+
+        Cached entries of this simulation are dropped on reset() and stop(),
+        a vehicle's entries on set_vehicle_base_info(), and the entries of
+        every ID returned by get_step_spawn_id_list().
+
+        Args:
+            cache: Optional cache to use, e.g. one shared by several
+                simulators, a new one is created when omitted
+
+        Returns:
+            The cache in use
+        """
+        self.static_cache = cache if cache is not None else StaticDataCache()
+        return self.static_cache
+
+    def disable_static_cache(self):
+        """Stop caching and drop this simulation's cached entries."""
+        if self.static_cache is not None:
+            self.static_cache.invalidate(self.simulation_id)
+        self.static_cache = None
+
+    def _cached(self, kind: str, entity_id: str, fetch) -> dict:
+        cache = self.static_cache
+        if cache is None:
+            return fetch()
+        reply = cache.get(kind, self.simulation_id, entity_id)
+        if reply is None:
+            reply = fetch()
+            cache.put(kind, self.simulation_id, entity_id, reply)
+        return reply
+
+    def _post_id_list(self, path: str, key: str, id_list: List[str]) -> dict:
+        """Post an ID list query, splitting oversized lists into concurrent chunks.
+
+        Args:
+            path: Request path
+            key: Name of the ID list field in the request
+            id_list: IDs to query
+
+        Returns:
+            The merged response as dict
+
+        Raises:
+            APIError: If any of the requests fails
+        """
+        if not id_list or len(id_list) <= self.id_list_chunk_size:
+            return self.http_client.post(path, {"simulation_id": self.simulation_id, key: id_list})
+
+        post = self.http_client.post
+        replies = self.http_client.gather([
+            (lambda chunk=chunk: post(path, {"simulation_id": self.simulation_id, key: chunk}))
+            for chunk in split_id_list(list(id_list), self.id_list_chunk_size)
+        ])
+        return merge_replies(replies)
+
     def step(self):
         """Step the simulation forward.
 
@@ -48,6 +143,52 @@ class SimulatorFast:
             {"simulation_id": self.simulation_id},
         )
 
+    def step_and_observe(
+        self,
+        controls: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        queries: Optional[Dict[str, Sequence]] = None,
+    ) -> dict:
+        """Apply controls, step the simulation and run queries in one call.
+
+        The control writes are issued concurrently, then the simulation is
+        stepped, then all queries are issued concurrently. Per step this
+        costs three round trips of latency instead of one per request.
+
+        Args:
+            controls: Optional mapping of vehicle ID to a (ste_wheel, lon_acc)
+                tuple passed to set_vehicle_control_info
+            queries: Optional mapping of getter name to its positional
+                arguments, e.g. {"get_vehicle_position": (vehicle_id_list,)}
+
+        Returns:
+            A dict holding the step response under "step", the control
+            responses by vehicle ID under "controls" and each query response
+            under its getter name
+
+        Raises:
+            ValueError: If a query does not name a getter of this class
+            APIError: If any of the requests fails
+        """
+        controls = controls or {}
+        queries = queries or {}
+        for name in queries:
+            if not name.startswith("get_") or not callable(getattr(self, name, None)):
+                raise ValueError(f"unknown simulator query: {name}")
+
+        control_res = self.set_vehicle_control_info_many(controls)
+        if control_res["errors"]:
+            raise next(iter(control_res["errors"].values()))
+        result = {
+            "controls": control_res["results"],
+            "step": self.step(),
+        }
+        query_replies = self.http_client.gather([
+            (lambda method=getattr(self, name), args=tuple(args): method(*args))
+            for name, args in queries.items()
+        ])
+        result.update(zip(queries, query_replies))
+        return result
+
     def stop(self) -> dict:
         """Stop the simulation.
 
@@ -57,6 +198,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
+        if self.static_cache is not None:
+            self.static_cache.invalidate(self.simulation_id)
         return self.http_client.post(
             "/openapi/cosim/v2/simulation/stop",
             {"simulation_id": self.simulation_id},
@@ -80,6 +223,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
+        if self.static_cache is not None:
+            self.static_cache.invalidate(self.simulation_id)
         return self.http_client.post(
             "/openapi/cosim/v2/simulation/reset",
             {
@@ -136,10 +281,10 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
+        return self._cached(SIGNAL_PLAN, junction_id, lambda: self.http_client.post(
             "/openapi/cosim/v2/simulation/map/traffic_light/signal_plan/get",
             {"simulation_id": self.simulation_id, "junction_id": junction_id},
-        )
+        ))
 
     def get_movement_list(self, junction_id: str) -> dict:
         """Get movement list.
@@ -153,10 +298,10 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
+        return self._cached(MOVEMENT_LIST, junction_id, lambda: self.http_client.post(
             "/openapi/cosim/v2/simulation/map/movement/list/get",
             {"simulation_id": self.simulation_id, "junction_id": junction_id},
-        )
+        ))
 
     def get_vehicle_id_list(self) -> dict:
         """Get vehicle ID list.
@@ -198,10 +343,32 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/vehicle/base_info/get",
-            {"simulation_id": self.simulation_id, "id_list": vehicle_id_list},
+        cache = self.static_cache
+        if cache is None:
+            return self._post_id_list(
+                "/openapi/cosim/v2/simulation/vehicle/base_info/get", "id_list", vehicle_id_list
+            )
+
+        info_dict = {}
+        missing = []
+        for vehicle_id in vehicle_id_list:
+            info = cache.get(BASE_INFO, self.simulation_id, vehicle_id)
+            if info is None:
+                missing.append(vehicle_id)
+            else:
+                info_dict[vehicle_id] = info
+        if not missing:
+            return {"info_dict": info_dict}
+
+        reply = self._post_id_list(
+            "/openapi/cosim/v2/simulation/vehicle/base_info/get", "id_list", missing
         )
+        fetched = reply.get("info_dict") or {}
+        for vehicle_id, info in fetched.items():
+            cache.put(BASE_INFO, self.simulation_id, vehicle_id, info)
+        info_dict.update(fetched)
+        reply["info_dict"] = {k: info_dict[k] for k in vehicle_id_list if k in info_dict}
+        return reply
 
     def get_vehicle_position(self, vehicle_id_list: List[str]) -> dict:
         """Get vehicle position.
@@ -215,9 +382,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/vehicle/position/get",
-            {"simulation_id": self.simulation_id, "id_list": vehicle_id_list},
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/vehicle/position/get", "id_list", vehicle_id_list
         )
 
     def get_vehicle_moving_info(self, vehicle_id_list: List[str]) -> dict:
@@ -232,9 +398,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/vehicle/moving_info/get",
-            {"simulation_id": self.simulation_id, "id_list": vehicle_id_list},
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/vehicle/moving_info/get", "id_list", vehicle_id_list
         )
 
     def get_vehicle_control_info(self, vehicle_id_list: List[str]) -> dict:
@@ -249,9 +414,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/vehicle/control/get",
-            {"simulation_id": self.simulation_id, "id_list": vehicle_id_list},
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/vehicle/control/get", "id_list", vehicle_id_list
         )
 
     def get_vehicle_perception_info(self, vehicle_id: str) -> dict:
@@ -385,10 +549,10 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
+        return self._cached(SENSOR_CONFIG, vehicle_id, lambda: self.http_client.post(
             "/openapi/cosim/v2/simulation/vehicle/sensor_config/get",
             {"simulation_id": self.simulation_id, "vehicle_id": vehicle_id},
-        )
+        ))
 
     def set_vehicle_control_info(
         self,
@@ -419,6 +583,76 @@ class SimulatorFast:
             },
         )
 
+    def _set_many(self, setter, args_by_id: Dict[str, Any]) -> dict:
+        """Call a per-vehicle setter for many vehicles concurrently.
+
+        Args:
+            setter: Bound setter taking the vehicle ID first
+            args_by_id: Mapping of vehicle ID to the remaining setter
+                arguments, as a tuple of positional or a dict of keyword
+                arguments
+
+        Returns:
+            A dict with the responses by vehicle ID under "results" and the
+            errors of failed vehicles under "errors"
+        """
+        calls = []
+        for vehicle_id, args in args_by_id.items():
+            if isinstance(args, dict):
+                calls.append(lambda vehicle_id=vehicle_id, args=args: setter(vehicle_id, **args))
+            else:
+                calls.append(lambda vehicle_id=vehicle_id, args=tuple(args): setter(vehicle_id, *args))
+
+        results = {}
+        errors = {}
+        for vehicle_id, reply in zip(args_by_id, self.http_client.gather(calls, return_exceptions=True)):
+            if isinstance(reply, Exception):
+                errors[vehicle_id] = reply
+            else:
+                results[vehicle_id] = reply
+        return {"results": results, "errors": errors}
+
+    def set_vehicle_control_info_many(
+        self, controls: Dict[str, Tuple[Optional[float], Optional[float]]]
+    ) -> dict:
+        """Set control information of many vehicles concurrently.
+
+        Args:
+            controls: Mapping of vehicle ID to a (ste_wheel, lon_acc) tuple
+
+        Returns:
+            A dict with the responses by vehicle ID under "results" and the
+            error raised for each failed vehicle under "errors"
+        """
+        return self._set_many(self.set_vehicle_control_info, controls)
+
+    def set_vehicle_moving_info_many(self, moving_infos: Dict[str, Any]) -> dict:
+        """Set moving information of many vehicles concurrently.
+
+        Args:
+            moving_infos: Mapping of vehicle ID to a (u, v, w, u_acc, v_acc,
+                w_acc) tuple or a dict of those keyword arguments
+
+        Returns:
+            A dict with the responses by vehicle ID under "results" and the
+            error raised for each failed vehicle under "errors"
+        """
+        return self._set_many(self.set_vehicle_moving_info, moving_infos)
+
+    def set_vehicle_position_many(
+        self, positions: Dict[str, Tuple[Point, Optional[float]]]
+    ) -> dict:
+        """Set position of many vehicles concurrently.
+
+        Args:
+            positions: Mapping of vehicle ID to a (point, phi) tuple
+
+        Returns:
+            A dict with the responses by vehicle ID under "results" and the
+            error raised for each failed vehicle under "errors"
+        """
+        return self._set_many(self.set_vehicle_position, positions)
+
     def set_vehicle_moving_info(
         self,
         vehicle_id: str,
@@ -479,13 +713,15 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
+        if self.static_cache is not None:
+            self.static_cache.invalidate(self.simulation_id, [vehicle_id], VEHICLE_KINDS)
         return self.http_client.post(
             "/openapi/cosim/v2/simulation/vehicle/base_info/set",
             {
                 "simulation_id": self.simulation_id,
                 "vehicle_id": vehicle_id,
-                "base_info": asdict(base_info),
-                "dynamic_info": asdict(dynamic_info),
+                "base_info": to_dict(base_info),
+                "dynamic_info": to_dict(dynamic_info),
             },
         )
 
@@ -496,8 +732,9 @@ class SimulatorFast:
 
         Args:
             vehicle_id: Vehicle ID
-            planning_path: List of planning path points
-            speed: List of speeds for each trajectory point
+            planning_path: List of planning path points, as Point or (x, y[, z])
+                tuples, or an (N, 2)/(N, 3) array
+            speed: List or array of speeds for each trajectory point
 
         Returns:
             Vehicle planning info response as dict
@@ -510,8 +747,8 @@ class SimulatorFast:
             {
                 "simulation_id": self.simulation_id,
                 "vehicle_id": vehicle_id,
-                "planning_path": [asdict(p) for p in planning_path],
-                "speed": speed,
+                "planning_path": point_dicts(planning_path),
+                "speed": value_list(speed),
             },
         )
 
@@ -536,7 +773,7 @@ class SimulatorFast:
             {
                 "simulation_id": self.simulation_id,
                 "vehicle_id": vehicle_id,
-                "point": asdict(point),
+                "point": point_dict(point),
                 "phi": phi,
             },
         )
@@ -581,7 +818,7 @@ class SimulatorFast:
             {
                 "simulation_id": self.simulation_id,
                 "vehicle_id": vehicle_id,
-                "destination": asdict(destination),
+                "destination": point_dict(destination),
             },
         )
 
@@ -611,9 +848,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/ped/base_info/get",
-            {"simulation_id": self.simulation_id, "id_list": ped_id_list},
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/ped/base_info/get", "id_list", ped_id_list
         )
 
     def set_ped_position(
@@ -637,7 +873,7 @@ class SimulatorFast:
             {
                 "simulation_id": self.simulation_id,
                 "ped_id": ped_id,
-                "point": asdict(point),
+                "point": point_dict(point),
                 "phi": phi,
             },
         )
@@ -669,9 +905,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/nmv/base_info/get",
-            {"simulation_id": self.simulation_id, "id_list": nmv_id_list},
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/nmv/base_info/get", "id_list", nmv_id_list
         )
 
     def set_nmv_position(
@@ -695,7 +930,7 @@ class SimulatorFast:
             {
                 "simulation_id": self.simulation_id,
                 "nmv_id": nmv_id,
-                "point": asdict(point),
+                "point": point_dict(point),
                 "phi": phi,
             },
         )
@@ -709,10 +944,14 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
+        reply = self.http_client.post(
             "/openapi/cosim/v2/simulation/participant/step_spawn_ids/get",
             {"simulation_id": self.simulation_id},
         )
+        if self.static_cache is not None and reply:
+            # 新生成的参与者可能复用了旧 ID
+            self.static_cache.invalidate(self.simulation_id, reply.get("id_list") or [], VEHICLE_KINDS)
+        return reply
 
     def get_participant_base_info(self, participant_id_list: List[str]) -> dict:
         """Get participant base information.
@@ -726,12 +965,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/participant/base_info/get",
-            {
-                "simulation_id": self.simulation_id,
-                "participant_id_list": participant_id_list,
-            },
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/participant/base_info/get", "participant_id_list", participant_id_list
         )
 
     def get_participant_moving_info(self, participant_id_list: List[str]) -> dict:
@@ -746,19 +981,16 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/participant/moving_info/get",
-            {
-                "simulation_id": self.simulation_id,
-                "participant_id_list": participant_id_list,
-            },
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/participant/moving_info/get", "participant_id_list", participant_id_list
         )
 
     def get_participant_position(self, participant_id_list: List[str]) -> dict:
         """Get participant position information.
 
         Args:
-            participant_id_list: List of participant IDs (maximum 1000 IDs)
+            participant_id_list: List of participant IDs, lists longer than
+                id_list_chunk_size are queried in concurrent chunks
 
         Returns:
             Participant position response as dict
@@ -766,12 +998,8 @@ class SimulatorFast:
         Raises:
             APIError: If the request fails
         """
-        return self.http_client.post(
-            "/openapi/cosim/v2/simulation/participant/position/get",
-            {
-                "simulation_id": self.simulation_id,
-                "participant_id_list": participant_id_list,
-            },
+        return self._post_id_list(
+            "/openapi/cosim/v2/simulation/participant/position/get", "participant_id_list", participant_id_list
         )
 
     def next_stage(self, junction_id: str) -> dict:
@@ -868,14 +1096,16 @@ class SimulatorFast:
     def set_vehicle_local_paths(
         self,
         vehicle_id: str,
-        local_paths: Optional[List[Dict]] = None,
+        local_paths: Optional[Sequence[Any]] = None,
         choose_idx: Optional[int] = None,
     ) -> dict:
         """Set vehicle local paths.
 
         Args:
             vehicle_id: Vehicle ID
-            local_paths: List of local path data
+            local_paths: Local paths as LocalPath instances, dicts,
+                (points, prob) tuples with points given as a list or array,
+                or a structured array with points and prob fields
             choose_idx: Index of selected path
 
         Returns:
@@ -889,7 +1119,7 @@ class SimulatorFast:
             {
                 "simulation_id": self.simulation_id,
                 "vehicle_id": vehicle_id,
-                "local_paths": local_paths,
+                "local_paths": local_path_dicts(local_paths),
                 "choose_idx": choose_idx,
             },
         )
@@ -11,9 +11,12 @@ from enum import IntEnum
 class Point:
     """Point information."""
 
-    x: float = 0.0
-    y: float = 0.0
-    z: float = 0.0
+    # 高频模型使用 __slots__ 减少大量实例的内存占用, 默认值由 __init__ 提供
+    __slots__ = ("x", "y", "z")
+
+    x: float
+    y: float
+    z: float
 
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
         self.x = x
@@ -25,9 +28,11 @@ class Point:
         if data is None:
             return None
 
-        instance = cls()
-        instance.__dict__ = data
-        return instance
+        return cls(
+            x=data.get("x", 0.0),
+            y=data.get("y", 0.0),
+            z=data.get("z", 0.0),
+        )
 
 
 @dataclass
@@ -116,23 +121,42 @@ class DynamicInfo:
 class Position:
     """Position information."""
 
-    point: Optional[Point] = None
-    phi: float = 0.0
-    lane_id: str = ""
-    link_id: str = ""
-    junction_id: str = ""
-    segment_id: str = ""
-    dis_to_lane_end: Optional[float] = None
-    position_type: int = 0  # 1 - 地图外
+    __slots__ = (
+        "point",
+        "phi",
+        "lane_id",
+        "link_id",
+        "junction_id",
+        "segment_id",
+        "dis_to_lane_end",
+        "position_type",
+        "type",
+        "heading",
+        "roll",
+        "patch",
+        "lane_index",
+        "lane_offset",
+        "s",
+        "t",
+    )
 
-    type: int = 0
-    heading: Optional[float] = None
-    roll: Optional[float] = None
-    patch: Optional[float] = None
-    lane_index: Optional[int] = None
-    lane_offset: Optional[float] = None
-    s: Optional[float] = None
-    t: Optional[float] = None
+    point: Optional[Point]
+    phi: float
+    lane_id: str
+    link_id: str
+    junction_id: str
+    segment_id: str
+    dis_to_lane_end: Optional[float]
+    position_type: int  # 1 - 地图外
+
+    type: int
+    heading: Optional[float]
+    roll: Optional[float]
+    patch: Optional[float]
+    lane_index: Optional[int]
+    lane_offset: Optional[float]
+    s: Optional[float]
+    t: Optional[float]
 
     def __init__(
         self,
@@ -198,14 +222,16 @@ class Position:
 class ObjMovingInfo:
     """Object moving information."""
 
-    u: float = 0.0
-    u_acc: float = 0.0
-    v: float = 0.0
-    v_acc: float = 0.0
-    w: float = 0.0
-    w_acc: float = 0.0
+    __slots__ = ("u", "u_acc", "v", "v_acc", "w", "w_acc", "heading")
 
-    heading: float = 0.0
+    u: float
+    u_acc: float
+    v: float
+    v_acc: float
+    w: float
+    w_acc: float
+
+    heading: float
 
     def __init__(
         self,
@@ -244,12 +270,21 @@ class ObjMovingInfo:
 class ControlInfo:
     """Control information."""
 
-    ste_wheel: float = 0.0
-    lon_acc: float = 0.0
-    fl_torque: float = 0.0
-    fr_torque: float = 0.0
-    rl_torque: float = 0.0
-    rr_torque: float = 0.0
+    __slots__ = (
+        "ste_wheel",
+        "lon_acc",
+        "fl_torque",
+        "fr_torque",
+        "rl_torque",
+        "rr_torque",
+    )
+
+    ste_wheel: float
+    lon_acc: float
+    fl_torque: float
+    fr_torque: float
+    rl_torque: float
+    rr_torque: float
 
     def __init__(
         self,
@@ -521,6 +556,9 @@ class StepRes:
     code: StepCode = StepCode.RUNNING
     message: str = ""
 
+    # 解码元数据, 见 lazy_model._field_specs
+    _enum_fields = ("code",)
+
     def __init__(self, code: StepCode = StepCode.RUNNING, message: str = ""):
         self.code = code
         self.message = message
@@ -2480,6 +2518,9 @@ class SensorConfig:
     install_lon: float = 0.0  # Longitudinal offset relative to vehicle center of mass
     install_lat: float = 0.0  # Lateral offset relative to vehicle center of mass
 
+    # 解码元数据, 见 lazy_model._field_specs
+    _enum_fields = ("sensor_type",)
+
     def __init__(
         self,
         sensor_id: str = "",
@@ -2911,6 +2952,9 @@ class IdcStepRes:
     navigation_info: Optional[NavigationInfo] = None
     step_res: StepRes = None
 
+    # 解码元数据, 见 lazy_model._field_specs
+    _default_instance_fields = ("position", "moving_info", "navigation_info", "step_res")
+
     @classmethod
     def from_dict(cls, data: dict = None):
         return cls(
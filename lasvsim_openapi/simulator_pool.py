@@ -0,0 +1,317 @@
+"""
+Simulator pool module for the lasvsim API.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from lasvsim_openapi.http_client import HttpClient
+from lasvsim_openapi.http_client_async import AsyncHttpClient
+from lasvsim_openapi.simulator_async import AsyncSimulatorFast
+from lasvsim_openapi.simulator_fast import SimulatorFast
+from lasvsim_openapi.simulator_model import SimulatorConfig
+
+# (vehicle_id, ste_wheel, lon_acc); None leaves a simulator untouched
+ControlCmd = Optional[Tuple[str, Optional[float], Optional[float]]]
+
+
+def _collect(futures: list, return_exceptions: bool) -> list:
+    results = []
+    first_error = None
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            if first_error is None:
+                first_error = e
+            results.append(e)
+    if first_error is not None and not return_exceptions:
+        raise first_error
+    return results
+
+
+def _check_lengths(simulators: list, args_lists: Tuple[Sequence, ...]):
+    for args in args_lists:
+        if len(args) != len(simulators):
+            raise ValueError(f"expected {len(simulators)} arguments, one per simulator, got {len(args)}")
+
+
+class SimulatorPool:
+    """Several SimulatorFast sessions driven side by side from one process.
+
+    Batched calls fan out over a thread pool, so the wall time of e.g.
+    step_all() is bounded by the slowest session rather than the sum.
+    All sessions share the connection pool of the given HTTP client.
+    """
+
+    simulators: List[SimulatorFast] = None
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        sim_configs: Sequence[SimulatorConfig],
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize all simulators concurrently.
+
+        If any of them fails to initialize, the ones that succeeded are
+        stopped again before the error is raised.
+
+        Args:
+            http_client: HTTP client instance
+            sim_configs: One configuration per simulator
+            max_workers: Number of worker threads, defaults to one per simulator
+
+        Raises:
+            APIError: If a simulator fails to initialize
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or max(len(sim_configs), 1))
+        futures = [
+            self._executor.submit(SimulatorFast, http_client=http_client, sim_config=c)
+            for c in sim_configs
+        ]
+        results = _collect(futures, return_exceptions=True)
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            started = [r for r in results if isinstance(r, SimulatorFast)]
+            _collect([self._executor.submit(s.stop) for s in started], return_exceptions=True)
+            self._executor.shutdown()
+            raise errors[0]
+        self.simulators = results
+
+    def __len__(self) -> int:
+        return len(self.simulators)
+
+    def __iter__(self):
+        return iter(self.simulators)
+
+    def __getitem__(self, index: int) -> SimulatorFast:
+        return self.simulators[index]
+
+    def __enter__(self) -> 'SimulatorPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def map(self, fn: Callable[..., Any], *args_lists: Sequence, return_exceptions: bool = False) -> list:
+        """Call fn(simulator, *args) for every simulator concurrently.
+
+        Args:
+            fn: Callable taking a simulator followed by the per-simulator arguments
+            args_lists: Optional sequences with one argument per simulator
+            return_exceptions: Return errors in place of results instead of
+                raising the first one
+
+        Returns:
+            Results in simulator order
+
+        Raises:
+            ValueError: If an argument sequence does not have one item per
+                simulator
+        """
+        _check_lengths(self.simulators, args_lists)
+        futures = [
+            self._executor.submit(fn, sim, *args)
+            for sim, *args in zip(self.simulators, *args_lists)
+        ]
+        return _collect(futures, return_exceptions)
+
+    def step_all(self, return_exceptions: bool = False) -> List[dict]:
+        """Step every simulation forward.
+
+        Args:
+            return_exceptions: Return errors in place of results
+
+        Returns:
+            Step responses in simulator order
+        """
+        return self.map(SimulatorFast.step, return_exceptions=return_exceptions)
+
+    def set_control_all(self, controls: Sequence[ControlCmd], return_exceptions: bool = False) -> List[Optional[dict]]:
+        """Set vehicle control information in every simulation.
+
+        Args:
+            controls: One (vehicle_id, ste_wheel, lon_acc) tuple per simulator,
+                or None to skip that simulator
+            return_exceptions: Return errors in place of results
+
+        Returns:
+            Responses in simulator order, None for skipped simulators
+        """
+        if len(controls) != len(self.simulators):
+            raise ValueError(f"expected {len(self.simulators)} controls, got {len(controls)}")
+
+        def set_control(sim: SimulatorFast, control: ControlCmd):
+            if control is None:
+                return None
+            return sim.set_vehicle_control_info(*control)
+
+        return self.map(set_control, controls, return_exceptions=return_exceptions)
+
+    def reset_all(self, reset_traffic_flow: bool = False, return_exceptions: bool = False) -> List[dict]:
+        """Reset every simulation.
+
+        Args:
+            reset_traffic_flow: Whether to reset traffic flow
+            return_exceptions: Return errors in place of results
+
+        Returns:
+            Reset responses in simulator order
+        """
+        return self.map(
+            lambda sim: sim.reset(reset_traffic_flow),
+            return_exceptions=return_exceptions,
+        )
+
+    def stop_all(self, return_exceptions: bool = True) -> List[dict]:
+        """Stop every simulation.
+
+        Args:
+            return_exceptions: Return errors in place of results, so one
+                failed stop does not keep the others running
+
+        Returns:
+            Stop responses in simulator order
+        """
+        return self.map(SimulatorFast.stop, return_exceptions=return_exceptions)
+
+    def close(self):
+        """Stop all simulations and release the worker threads."""
+        try:
+            self.stop_all()
+        finally:
+            self._executor.shutdown()
+
+
+class AsyncSimulatorPool:
+    """Several AsyncSimulatorFast sessions multiplexed on one event loop.
+
+    Use AsyncSimulatorPool.create to build an initialized pool.
+    """
+
+    simulators: List[AsyncSimulatorFast] = None
+
+    def __init__(self, simulators: List[AsyncSimulatorFast]):
+        """Wrap already initialized simulators.
+
+        Args:
+            simulators: Initialized simulators
+        """
+        self.simulators = simulators
+
+    @classmethod
+    async def create(cls, http_client: AsyncHttpClient, sim_configs: Sequence[SimulatorConfig]) -> 'AsyncSimulatorPool':
+        """Initialize all simulators concurrently.
+
+        Args:
+            http_client: Async HTTP client instance
+            sim_configs: One configuration per simulator
+
+        Returns:
+            A new pool
+
+        Raises:
+            APIError: If a simulator fails to initialize
+        """
+        simulators = [AsyncSimulatorFast(http_client) for _ in sim_configs]
+        results = await asyncio.gather(
+            *[sim.init(c) for sim, c in zip(simulators, sim_configs)],
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            started = [s for s, r in zip(simulators, results) if not isinstance(r, Exception)]
+            await asyncio.gather(*[s.stop() for s in started], return_exceptions=True)
+            raise errors[0]
+        return cls(simulators)
+
+    def __len__(self) -> int:
+        return len(self.simulators)
+
+    def __iter__(self):
+        return iter(self.simulators)
+
+    def __getitem__(self, index: int) -> AsyncSimulatorFast:
+        return self.simulators[index]
+
+    async def map(self, fn: Callable[..., Any], *args_lists: Sequence, return_exceptions: bool = False) -> list:
+        """Await fn(simulator, *args) for every simulator concurrently.
+
+        Args:
+            fn: Coroutine function taking a simulator followed by the
+                per-simulator arguments
+            args_lists: Optional sequences with one argument per simulator
+            return_exceptions: Return errors in place of results instead of
+                raising the first one
+
+        Returns:
+            Results in simulator order
+
+        Raises:
+            ValueError: If an argument sequence does not have one item per
+                simulator
+        """
+        _check_lengths(self.simulators, args_lists)
+        return await asyncio.gather(
+            *[fn(sim, *args) for sim, *args in zip(self.simulators, *args_lists)],
+            return_exceptions=return_exceptions,
+        )
+
+    async def step_all(self, return_exceptions: bool = False) -> List[dict]:
+        """Step every simulation forward.
+
+        Args:
+            return_exceptions: Return errors in place of results
+
+        Returns:
+            Step responses in simulator order
+        """
+        return await self.map(AsyncSimulatorFast.step, return_exceptions=return_exceptions)
+
+    async def set_control_all(self, controls: Sequence[ControlCmd], return_exceptions: bool = False) -> List[Optional[dict]]:
+        """Set vehicle control information in every simulation.
+
+        Args:
+            controls: One (vehicle_id, ste_wheel, lon_acc) tuple per simulator,
+                or None to skip that simulator
+            return_exceptions: Return errors in place of results
+
+        Returns:
+            Responses in simulator order, None for skipped simulators
+        """
+        if len(controls) != len(self.simulators):
+            raise ValueError(f"expected {len(self.simulators)} controls, got {len(controls)}")
+
+        async def set_control(sim: AsyncSimulatorFast, control: ControlCmd):
+            if control is None:
+                return None
+            return await sim.set_vehicle_control_info(*control)
+
+        return await self.map(set_control, controls, return_exceptions=return_exceptions)
+
+    async def reset_all(self, reset_traffic_flow: bool = False, return_exceptions: bool = False) -> List[dict]:
+        """Reset every simulation.
+
+        Args:
+            reset_traffic_flow: Whether to reset traffic flow
+            return_exceptions: Return errors in place of results
+
+        Returns:
+            Reset responses in simulator order
+        """
+        return await self.map(
+            lambda sim: sim.reset(reset_traffic_flow),
+            return_exceptions=return_exceptions,
+        )
+
+    async def stop_all(self, return_exceptions: bool = True) -> List[dict]:
+        """Stop every simulation.
+
+        Args:
+            return_exceptions: Return errors in place of results
+
+        Returns:
+            Stop responses in simulator order
+        """
+        return await self.map(AsyncSimulatorFast.stop, return_exceptions=return_exceptions)
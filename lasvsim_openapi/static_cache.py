@@ -0,0 +1,103 @@
+"""
+Static simulation data cache module for the lasvsim API.
+"""
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# 缓存的数据种类
+BASE_INFO = "base_info"
+SENSOR_CONFIG = "sensor_config"
+MOVEMENT_LIST = "movement_list"
+SIGNAL_PLAN = "signal_plan"
+
+# 与车辆 ID 绑定的数据种类
+VEHICLE_KINDS = (BASE_INFO, SENSOR_CONFIG)
+
+
+class StaticDataCache:
+    """Cache for simulation data that rarely changes within a session.
+
+    Entries are keyed by (kind, simulation_id, entity_id), so one cache may
+    be shared by several simulators. Cached values are the raw reply dicts
+    and are returned as is; treat them as read-only.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: Dict[Tuple[str, str, str], Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, kind: str, simulation_id: str, entity_id: str) -> Optional[Any]:
+        """Look up a cached value.
+
+        Args:
+            kind: Data kind, e.g. BASE_INFO
+            simulation_id: Simulation ID
+            entity_id: Vehicle or junction ID
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        value = self._entries.get((kind, simulation_id, entity_id))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, kind: str, simulation_id: str, entity_id: str, value: Any):
+        """Store a value, None values are not cached.
+
+        Args:
+            kind: Data kind, e.g. BASE_INFO
+            simulation_id: Simulation ID
+            entity_id: Vehicle or junction ID
+            value: Value to cache
+        """
+        if value is None:
+            return
+        with self._lock:
+            self._entries[(kind, simulation_id, entity_id)] = value
+
+    def invalidate(
+        self,
+        simulation_id: str,
+        entity_ids: Optional[Iterable[str]] = None,
+        kinds: Iterable[str] = None,
+    ):
+        """Drop cached entries of a simulation.
+
+        Args:
+            simulation_id: Simulation ID
+            entity_ids: IDs to drop, all entities of the simulation when omitted
+            kinds: Data kinds to drop, all kinds when omitted
+        """
+        with self._lock:
+            if entity_ids is None:
+                kinds = None if kinds is None else set(kinds)
+                for key in [
+                    k for k in self._entries
+                    if k[1] == simulation_id and (kinds is None or k[0] in kinds)
+                ]:
+                    del self._entries[key]
+                return
+            kinds = tuple(kinds) if kinds is not None else (BASE_INFO, SENSOR_CONFIG, MOVEMENT_LIST, SIGNAL_PLAN)
+            for entity_id in entity_ids:
+                for kind in kinds:
+                    self._entries.pop((kind, simulation_id, entity_id), None)
+
+    def clear(self):
+        """Drop all entries and reset the hit counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,233 @@
+"""
+Vectorized IDC environment module for the lasvsim API.
+"""
+from typing import Callable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "VecIdcEnv requires numpy, install it with `pip install lasvsim-openapi[numpy]`"
+    ) from e
+
+from lasvsim_openapi.simulator_pool import SimulatorPool
+
+EGO_FEATURES = ("x", "y", "phi", "u", "v", "w", "u_acc", "v_acc", "w_acc")
+PERCEPTION_FEATURES = ("valid", "x", "y", "phi", "u", "length", "width")
+
+
+class VecIdcEnv:
+    """Gym-style vectorized environment driving idc_step on many simulations.
+
+    Every step issues one idc_step per simulation concurrently and packs the
+    replies into a preallocated ``(num_envs, obs_dim)`` float64 array laid
+    out as:
+
+    * ego state, see EGO_FEATURES
+    * ``max_perception`` slots of PERCEPTION_FEATURES, nearest objects
+      first, empty slots zero-filled with ``valid == 0``
+    * ``n_ref_lines`` reference lines, each a valid flag followed by
+      ``ref_line_points`` (x, y) pairs; longer lines are truncated and
+      shorter ones padded with their last point
+
+    ``obs_slices`` maps "ego", "perception" and "reference_lines" to the
+    column slice of each block. The returned observation array is reused
+    across steps; copy it if you need to keep it.
+
+    Finished simulations are reset automatically within step, like Gym's
+    vector environments: their row of the returned observations is the
+    first observation of the next episode, and the last observation of the
+    finished episode is in their info under "terminal_observation". Pass
+    auto_reset=False to reset them yourself instead.
+    """
+
+    pool: SimulatorPool = None
+    vehicle_ids: List[str] = None
+    num_envs: int = 0
+    obs_dim: int = 0
+
+    def __init__(
+        self,
+        pool: SimulatorPool,
+        vehicle_ids: Optional[Sequence[str]] = None,
+        max_perception: int = 8,
+        n_ref_lines: int = 3,
+        ref_line_points: int = 20,
+        ref_limit: Optional[float] = None,
+        reward_fn: Optional[Callable[[dict], float]] = None,
+        auto_reset: bool = True,
+    ):
+        """Initialize the environment.
+
+        Args:
+            pool: Initialized simulators, one per environment
+            vehicle_ids: Controlled vehicle per simulator, defaults to the
+                first test vehicle of each simulation
+            max_perception: Number of perception slots
+            n_ref_lines: Number of reference line slots
+            ref_line_points: Number of points kept per reference line
+            ref_limit: Reference limit passed to idc_step
+            reward_fn: Optional callable computing a reward from the raw
+                idc_step reply, rewards are zero otherwise
+            auto_reset: Reset finished simulations within step, see the
+                class docstring; otherwise the caller has to reset them,
+                e.g. with reset()
+        """
+        self.pool = pool
+        if vehicle_ids is None:
+            vehicle_ids = pool.map(lambda sim: sim.get_test_vehicle_id_list()["list"][0])
+        if len(vehicle_ids) != len(pool):
+            raise ValueError(f"expected {len(pool)} vehicle ids, got {len(vehicle_ids)}")
+        self.vehicle_ids = list(vehicle_ids)
+        self.num_envs = len(pool)
+        self.max_perception = max_perception
+        self.n_ref_lines = n_ref_lines
+        self.ref_line_points = ref_line_points
+        self.ref_limit = ref_limit
+        self.reward_fn = reward_fn
+        self.auto_reset = auto_reset
+
+        n_ego = len(EGO_FEATURES)
+        n_perception = max_perception * len(PERCEPTION_FEATURES)
+        n_ref = n_ref_lines * (1 + 2 * ref_line_points)
+        self.obs_slices = {
+            "ego": slice(0, n_ego),
+            "perception": slice(n_ego, n_ego + n_perception),
+            "reference_lines": slice(n_ego + n_perception, n_ego + n_perception + n_ref),
+        }
+        self.obs_dim = n_ego + n_perception + n_ref
+
+        self._obs = np.zeros((self.num_envs, self.obs_dim), dtype=np.float64)
+        self._rewards = np.zeros(self.num_envs, dtype=np.float64)
+        self._dones = np.zeros(self.num_envs, dtype=bool)
+        self._perception = self._obs[:, self.obs_slices["perception"]].reshape(
+            self.num_envs, max_perception, len(PERCEPTION_FEATURES)
+        )
+        self._ref_lines = self._obs[:, self.obs_slices["reference_lines"]].reshape(
+            self.num_envs, n_ref_lines, 1 + 2 * ref_line_points
+        )
+
+    def reset(self) -> np.ndarray:
+        """Reset every simulation and return the first observation.
+
+        The observation comes from an idc_step without control input, so
+        each simulation advances by one step.
+
+        Returns:
+            Observation array of shape (num_envs, obs_dim)
+        """
+        self.pool.reset_all()
+        obs, _, _, _ = self.step(None)
+        return obs
+
+    def step(self, actions: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+        """Apply one action per environment and step all simulations.
+
+        Args:
+            actions: Array of shape (num_envs, 2) holding steering wheel
+                angle and longitudinal acceleration, or None for no control
+
+        Returns:
+            A tuple of (observations, rewards, dones, infos), infos being
+            the raw idc_step replies; with auto_reset the replies of
+            finished simulations also hold "terminal_observation"
+        """
+        if actions is None:
+            controls = [(None, None)] * self.num_envs
+        else:
+            actions = np.asarray(actions, dtype=np.float64)
+            if actions.shape != (self.num_envs, 2):
+                raise ValueError(f"expected actions of shape ({self.num_envs}, 2), got {actions.shape}")
+            controls = actions.tolist()
+
+        ref_limit = self.ref_limit
+        replies = self.pool.map(
+            lambda sim, vehicle_id, control: sim.idc_step(vehicle_id, control[0], control[1], ref_limit),
+            self.vehicle_ids,
+            controls,
+        )
+        for i, reply in enumerate(replies):
+            self._pack(i, reply)
+            self._dones[i] = not 0 <= (reply.get("step_res") or {}).get("code", 0) <= 100
+            if self.reward_fn is not None:
+                self._rewards[i] = self.reward_fn(reply)
+        if self.auto_reset and self._dones.any():
+            self._reset_done(replies)
+        return self._obs, self._rewards, self._dones, replies
+
+    def _reset_done(self, replies: List[dict]):
+        """Reset the finished simulations and pack the first observation of their next episode."""
+        ref_limit = self.ref_limit
+
+        def restart(sim, vehicle_id, done):
+            if not done:
+                return None
+            sim.reset()
+            return sim.idc_step(vehicle_id, None, None, ref_limit)
+
+        restarted = self.pool.map(restart, self.vehicle_ids, self._dones.tolist())
+        for i, reply in enumerate(restarted):
+            if reply is not None:
+                replies[i]["terminal_observation"] = self._obs[i].copy()
+                self._pack(i, reply)
+
+    def _pack(self, i: int, reply: dict):
+        obs = self._obs[i]
+        position = reply.get("position") or {}
+        point = position.get("point") or {}
+        moving = reply.get("moving_info") or {}
+        ego_x = point.get("x", 0.0)
+        ego_y = point.get("y", 0.0)
+        obs[:len(EGO_FEATURES)] = (
+            ego_x,
+            ego_y,
+            position.get("phi", 0.0),
+            moving.get("u", 0.0),
+            moving.get("v", 0.0),
+            moving.get("w", 0.0),
+            moving.get("u_acc", 0.0),
+            moving.get("v_acc", 0.0),
+            moving.get("w_acc", 0.0),
+        )
+
+        slots = self._perception[i]
+        slots[:] = 0.0
+        rows = []
+        for obj in reply.get("perception_infos") or ():
+            obj_position = obj.get("position") or {}
+            obj_point = obj_position.get("point") or {}
+            base_info = obj.get("base_info") or {}
+            x = obj_point.get("x", 0.0)
+            y = obj_point.get("y", 0.0)
+            rows.append((
+                (x - ego_x) ** 2 + (y - ego_y) ** 2,
+                (
+                    1.0,
+                    x,
+                    y,
+                    obj_position.get("phi", 0.0),
+                    (obj.get("moving_info") or {}).get("u", 0.0),
+                    base_info.get("length", 0.0),
+                    base_info.get("width", 0.0),
+                ),
+            ))
+        if rows:
+            rows.sort(key=lambda row: row[0])
+            rows = rows[:self.max_perception]
+            slots[:len(rows)] = [row[1] for row in rows]
+
+        lines = self._ref_lines[i]
+        lines[:] = 0.0
+        n_points = self.ref_line_points
+        for j, ref_line in enumerate((reply.get("reference_lines") or ())[:self.n_ref_lines]):
+            points = (ref_line.get("points") or ())[:n_points]
+            if not points:
+                continue
+            xy = lines[j, 1:].reshape(n_points, 2)
+            xy[:len(points)] = [(p.get("x", 0.0), p.get("y", 0.0)) for p in points]
+            xy[len(points):] = xy[len(points) - 1]
+            lines[j, 0] = 1.0
+
+    def close(self):
+        """Stop all simulations of the underlying pool."""
+        self.pool.close()
@@ -27,6 +27,11 @@ setup(
         "urllib3>=2.3.0",
         "ujson>=5.10.0",
     ],
+    extras_require={
+        "numpy": ["numpy>=1.17"],
+        "orjson": ["orjson>=3.6"],
+        "msgpack": ["msgpack>=1.0"],
+    },
     python_requires=">=3.0",
     keywords=["Qianxing", "Lasvsim", "自动驾驶",
               "OpenAPI", "Simulation", "Autonomous Driving"],
@@ -1,6 +1,13 @@
 """Test configuration and fixtures."""
+import gzip
+import itertools
+import json
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Tuple
+from urllib.parse import urlparse
 
 import pytest
 
@@ -9,6 +16,14 @@ from lasvsim_openapi.http_client import HttpConfig
 from lasvsim_openapi.simulator import Simulator
 from lasvsim_openapi.simulator_model import SimulatorConfig
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK = "application/msgpack"
+COSIM = "/openapi/cosim/v2/simulation"
+
 
 @pytest.fixture
 def client() -> Client:
@@ -48,3 +63,136 @@ def scenario_info(client: Client, task_record_ids: Tuple[int, int]) -> Tuple[str
     task_id, record_id = task_record_ids
     res = client.process_task.get_record_scenario(task_id, record_id)
     return res.scen_id, res.scen_ver
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict):
+        if self.server.msgpack and MSGPACK in (self.headers.get("Accept") or ""):
+            content_type, body = MSGPACK, msgpack.packb(payload)
+        else:
+            content_type, body = "application/json", json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if len(body) >= 256 and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if self.headers.get("Content-Encoding"):
+            if self.headers.get("Content-Encoding") != "gzip" or not self.server.gzip:
+                self._reply(415, {"message": "unsupported content encoding"})
+                return
+            raw = gzip.decompress(raw)
+        content_type = self.headers.get("Content-Type")
+        self.server.content_types.append(content_type)
+        if content_type == MSGPACK:
+            if not self.server.msgpack:
+                self._reply(415, {"message": "unsupported media type"})
+                return
+            data = msgpack.unpackb(raw)
+        else:
+            data = json.loads(raw or b"{}")
+        path = urlparse(self.path).path
+        self.server.paths.append(path)
+        route = self.server.routes.get(path)
+        if route is not None:
+            self._reply(*route(data))
+            return
+        if path == "/drop":
+            # 读取请求后不回复直接断开
+            self.close_connection = True
+            return
+        if path == "/close":
+            # 正常回复, 但随后关闭 keep-alive 连接
+            self.close_connection = True
+        if path == "/no_content":
+            # 204 响应不带 Content-Length, 连接保持打开
+            self.send_response(204)
+            self.end_headers()
+            return
+        if path == "/slow":
+            time.sleep(1.0)
+        if path == "/error":
+            self._reply(400, {"message": "bad request", "reason": "NOT_EXIST"})
+            return
+        self._reply(200, {"path": path, "echo": data})
+
+
+@pytest.fixture
+def local_server():
+    """Start a stand-in HTTP server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.msgpack = msgpack is not None
+    server.content_types = []
+    server.gzip = True
+    server.paths = []
+    # 路径 -> 处理函数, 接收请求体, 返回 (状态码, 响应体)
+    server.routes = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cosim_server(local_server):
+    """The stand-in server answering the cosim simulation endpoints.
+
+    Vehicle positions are {"point": {"x": index}} for vehicle IDs
+    "veh_<index>"; setting controls of vehicles whose ID starts with
+    "missing" fails with NOT_EXIST. Static data replies echo the queried
+    IDs, and the step spawn IDs are server.spawn_ids. server.requests
+    records (path, body) of every cosim request.
+    """
+    server = local_server
+    server.requests = []
+    server.spawn_ids = []
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def route(path, reply):
+        def handle(data):
+            with lock:
+                server.requests.append((path, data))
+            return reply(data)
+        server.routes[COSIM + path] = handle
+
+    def set_control(data):
+        if data["vehicle_id"].startswith("missing"):
+            return 400, {"message": f"vehicle {data['vehicle_id']} not found", "reason": "NOT_EXIST"}
+        return 200, {"vehicle_id": data["vehicle_id"]}
+
+    route("/init", lambda data: (200, {"simulation_id": f"sim_{next(counter)}", "simulation_addr": "addr"}))
+    route("/step", lambda data: (200, {"code": 0, "simulation_id": data["simulation_id"]}))
+    route("/stop", lambda data: (200, {}))
+    route("/reset", lambda data: (200, {}))
+    route("/vehicle/control/set", set_control)
+    route("/vehicle/position/get", lambda data: (200, {"position_dict": {
+        vehicle_id: {"point": {"x": float(vehicle_id.split("_")[-1])}} for vehicle_id in data["id_list"]
+    }}))
+    route("/vehicle/base_info/get", lambda data: (200, {"info_dict": {
+        vehicle_id: {"base_info": {"obj_id": vehicle_id}} for vehicle_id in data["id_list"]
+    }}))
+    route("/vehicle/base_info/set", lambda data: (200, {}))
+    route("/vehicle/sensor_config/get", lambda data: (200, {"vehicle_id": data["vehicle_id"], "sensors": []}))
+    route("/map/traffic_light/signal_plan/get", lambda data: (200, {"junction_id": data["junction_id"]}))
+    route("/map/movement/list/get", lambda data: (200, {"list": [{"junction_id": data["junction_id"]}]}))
+    route("/participant/step_spawn_ids/get", lambda data: (200, {"id_list": list(server.spawn_ids)}))
+    return server
@@ -0,0 +1,263 @@
+"""Tests for the HTTP client against a local stand-in server."""
+import asyncio
+
+import pytest
+
+from lasvsim_openapi.codec import Codec
+from lasvsim_openapi.http_client import APIError, HttpClient, HttpConfig
+from lasvsim_openapi.http_client_async import AsyncHttpClient, AsyncSharedPool
+
+MSGPACK = "application/msgpack"
+
+
+@pytest.fixture
+def http_client(local_server) -> HttpClient:
+    """Create an HTTP client pointing at the stand-in server."""
+    host, port = local_server.server_address
+    client = HttpClient(HttpConfig(token="token", endpoint=f"http://{host}:{port}"))
+    yield client
+    client.close()
+
+
+def test_post_roundtrip(http_client: HttpClient):
+    """Test a plain JSON round trip."""
+    res = http_client.post("/echo", {"a": 1, "b": [1.5, "x"]})
+    assert res == {"path": "/echo", "echo": {"a": 1, "b": [1.5, "x"]}}
+
+
+def test_post_error(http_client: HttpClient):
+    """Test that non-200 responses surface as APIError."""
+    with pytest.raises(APIError) as exc_info:
+        http_client.post("/error", {"a": 1})
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.reason == "NOT_EXIST"
+
+
+def test_clone_shares_pool(local_server, http_client: HttpClient):
+    """Test that clones keep their own headers but share one connection pool."""
+    clones = [http_client.clone() for _ in range(16)]
+    for i, clone in enumerate(clones):
+        clone.headers["x-md-simulation_id"] = str(i)
+        assert clone.http is http_client.http
+
+    for clone in clones:
+        clone.post("/echo", {"a": 1})
+    assert local_server.connections == 1, "sequential requests should reuse one connection"
+    assert "x-md-simulation_id" not in http_client.headers
+
+    # 关闭克隆不影响共用连接池的其他客户端
+    clones[0].close()
+    assert clones[1].post("/echo", {"a": 2})["echo"] == {"a": 2}
+    assert local_server.connections == 1
+
+
+def test_set_pool_size(http_client: HttpClient):
+    """Test resizing the shared pool from any clone."""
+    clone = http_client.clone()
+    http_client.set_pool_size(2)
+    assert http_client.shared_pool.executor._max_workers == 2
+    clone.set_pool_size(8)
+    assert http_client.shared_pool.maxsize == 8
+    # 工作线程数随连接池大小重建
+    assert http_client.shared_pool.executor._max_workers == 8
+    assert http_client.post("/echo", {"a": 1})["echo"] == {"a": 1}
+    calls = [lambda i=i: clone.post("/echo", {"i": i}) for i in range(4)]
+    assert [r["echo"]["i"] for r in http_client.gather(calls)] == list(range(4))
+
+    with pytest.raises(ValueError):
+        http_client.set_pool_size(0)
+
+
+def test_async_client_shares_pool(local_server):
+    """Test concurrent async requests from clones over one shared pool."""
+    host, port = local_server.server_address
+    config = HttpConfig(token="token", endpoint=f"http://{host}:{port}", pool_maxsize=4)
+
+    async def run():
+        client = AsyncHttpClient(config)
+        clones = [client.clone() for _ in range(32)]
+        try:
+            replies = await asyncio.gather(*[c.post("/echo", {"i": i}) for i, c in enumerate(clones)])
+            assert [r["echo"]["i"] for r in replies] == list(range(32))
+            assert client.shared_pool.size <= 4
+            await clones[0].close()
+            assert (await clones[1].post("/echo", {"i": 1}))["echo"] == {"i": 1}
+
+            with pytest.raises(APIError) as exc_info:
+                await client.post("/error", {"a": 1})
+            assert exc_info.value.reason == "NOT_EXIST"
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+    assert local_server.connections <= 4
+
+
+def test_async_post_not_resent(local_server):
+    """Test that async POSTs are resent only on a stale keep-alive connection."""
+    host, port = local_server.server_address
+    config = HttpConfig(token="token", endpoint=f"http://{host}:{port}")
+
+    async def run():
+        client = AsyncHttpClient(config)
+        client.shared_pool.backoff_factor = 0.0
+        try:
+            with pytest.raises(APIError):
+                await client.post("/drop", {"a": 1})
+            assert local_server.paths == ["/drop"], "a POST whose reply was lost must not be sent again"
+
+            assert (await client.post("/close", {"a": 1}))["echo"] == {"a": 1}
+            # 复用的连接已被服务端关闭, 请求尚未被处理, 在新连接上重发
+            assert (await client.post("/echo", {"a": 2}))["echo"] == {"a": 2}
+            assert local_server.paths == ["/drop", "/close", "/echo"]
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+def test_async_no_content_and_timeout(local_server):
+    """Test bodiless 204 replies on a kept-alive connection and the response timeout."""
+    host, port = local_server.server_address
+    config = HttpConfig(token="token", endpoint=f"http://{host}:{port}", timeout=0.2)
+
+    async def run():
+        client = AsyncHttpClient(config)
+        try:
+            status, _, data = await client.shared_pool.request("POST", "/no_content", {}, b"{}")
+            assert (status, data) == (204, b"")
+            assert (await client.post("/echo", {"a": 1}))["echo"] == {"a": 1}
+            assert local_server.connections == 1
+
+            with pytest.raises(APIError):
+                await client.post("/slow", {"a": 1})
+            assert local_server.paths == ["/no_content", "/echo", "/slow"], "a timed-out POST must not be sent again"
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+def test_async_cancelled_waiter(local_server):
+    """Test that a waiter cancelled after being woken passes the free connection on."""
+    host, port = local_server.server_address
+
+    async def run():
+        pool = AsyncSharedPool(HttpConfig(endpoint=f"http://{host}:{port}", pool_maxsize=1))
+        try:
+            conn, _ = await pool._acquire()
+            first = asyncio.ensure_future(pool._acquire())
+            second = asyncio.ensure_future(pool._acquire())
+            await asyncio.sleep(0)
+            assert len(pool._waiters) == 2
+
+            pool._release(conn, True)
+            first.cancel()
+            # 没有转交时 second 会一直等待
+            assert await asyncio.wait_for(second, 1.0) == (conn, True)
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            assert pool._in_use == 1 and not pool._waiters
+            pool._release(conn, True)
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_gather(http_client: HttpClient):
+    """Test running requests concurrently over the shared pool."""
+    calls = [lambda i=i: http_client.post("/echo", {"i": i}) for i in range(8)]
+    replies = http_client.gather(calls)
+    assert [r["echo"]["i"] for r in replies] == list(range(8))
+
+    calls.append(lambda: http_client.post("/error", {"a": 1}))
+    with pytest.raises(APIError):
+        http_client.gather(calls)
+    replies = http_client.gather(calls, return_exceptions=True)
+    assert isinstance(replies[-1], APIError)
+
+
+@pytest.mark.parametrize("codec", ["ujson", "orjson"])
+def test_codec_roundtrip(local_server, codec: str):
+    """Test requests and responses through each body codec."""
+    if codec == "orjson":
+        pytest.importorskip("orjson")
+    host, port = local_server.server_address
+    client = HttpClient(HttpConfig(token="token", endpoint=f"http://{host}:{port}", codec=codec))
+    try:
+        assert client.codec.name == codec
+        assert isinstance(client._encode_body({"a": 1})[0], bytes)
+        data = {"id_list": ["veh_0", "veh_1"], "point": {"x": 1.5, "y": -2.0}, "name": "车辆"}
+        assert client.post("/echo", data)["echo"] == data
+    finally:
+        client.close()
+
+
+def test_unknown_codec():
+    """Test that an unknown codec name is rejected."""
+    with pytest.raises(ValueError):
+        HttpClient(HttpConfig(endpoint="http://127.0.0.1:1", codec="yaml"))
+    # 自定义编码必须实现 encode 和 decode
+    with pytest.raises(TypeError):
+        type("HalfCodec", (Codec,), {"encode": lambda self, data: b""})()
+
+
+def test_msgpack_negotiation(local_server):
+    """Test switching to msgpack bodies once the server answers in msgpack."""
+    pytest.importorskip("msgpack")
+    host, port = local_server.server_address
+    client = HttpClient(HttpConfig(token="token", endpoint=f"http://{host}:{port}", wire_format="msgpack"))
+    try:
+        data = {"id_list": ["veh_0"], "point": {"x": 1.5, "y": -2.0}}
+        assert client.post("/echo", data)["echo"] == data
+        assert client.clone().post("/echo", data)["echo"] == data
+        assert local_server.content_types == ["application/json", MSGPACK], "clones should share the negotiated format"
+
+        with pytest.raises(APIError) as exc_info:
+            client.post("/error", data)
+        assert exc_info.value.reason == "NOT_EXIST"
+    finally:
+        client.close()
+
+
+def test_msgpack_fallback(local_server):
+    """Test falling back to JSON when the server rejects msgpack bodies."""
+    pytest.importorskip("msgpack")
+    host, port = local_server.server_address
+    client = HttpClient(HttpConfig(token="token", endpoint=f"http://{host}:{port}", wire_format="msgpack"))
+    try:
+        # 服务端声明支持 msgpack 响应, 但拒绝 msgpack 请求体
+        assert client.post("/echo", {"a": 1})["echo"] == {"a": 1}
+        local_server.msgpack = False
+        assert client.post("/echo", {"a": 2})["echo"] == {"a": 2}
+        assert client.post("/echo", {"a": 3})["echo"] == {"a": 3}
+        assert local_server.content_types == ["application/json", MSGPACK, "application/json", "application/json"]
+    finally:
+        client.close()
+
+
+def test_compression(local_server):
+    """Test compressing large request bodies and decoding compressed responses."""
+    host, port = local_server.server_address
+    client = HttpClient(HttpConfig(
+        token="token", endpoint=f"http://{host}:{port}", compression="gzip", compression_threshold=512,
+    ))
+    try:
+        large = {"id_list": [f"veh_{i}" for i in range(200)]}
+        assert client.post("/echo", large)["echo"] == large
+        assert client.post("/echo", {"a": 1})["echo"] == {"a": 1}
+
+        stats = client.clone().compression_stats()["/echo"]
+        assert stats["requests"] == 2 and stats["compressed_requests"] == 1
+        assert stats["bytes_out_wire"] < stats["bytes_out_raw"]
+        assert stats["compressed_responses"] == 1
+        assert stats["bytes_in_wire"] < stats["bytes_in_raw"]
+
+        local_server.gzip = False
+        assert client.post("/echo", large)["echo"] == large, "rejected compressed bodies should be resent plain"
+        assert client.compression_stats()["/echo"]["compressed_requests"] == 2
+        assert client.post("/echo", large)["echo"] == large
+        assert client.compression_stats()["/echo"]["compressed_requests"] == 2
+    finally:
+        client.close()
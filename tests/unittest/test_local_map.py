@@ -0,0 +1,148 @@
+"""Tests for the local map builder."""
+import math
+import random
+
+import pytest
+
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.model_encoder import to_dict
+from lasvsim_openapi.qxmap import Qxmap
+
+pytest.importorskip("numpy")
+from lasvsim_openapi.local_map import KINDS, LocalMapBuilder  # noqa: E402
+
+
+def line(points):
+    return {"points": [{"x": x, "y": y} for x, y in points]}
+
+
+def road_map(roads: int = 6) -> dict:
+    """Parallel east-west roads 40m apart, each ending at a junction with a crosswalk."""
+    segments, junctions = [], []
+    for j in range(roads):
+        y = 40.0 * j
+        lanes = []
+        for k in range(2):
+            yc = y + 3.5 * k
+            xs = [float(x) for x in range(0, 201, 10)]
+            lanes.append({
+                "id": f"lane_{j}_{k}",
+                "center_line": [{"point": {"x": x, "y": yc}} for x in xs],
+                "left_boundary": line([(x, yc + 1.75) for x in xs]),
+                "right_boundary": line([(x, yc - 1.75) for x in xs]),
+                "stopline": {"id": f"stop_{j}", "shape": line([(200.0, y - 1.75), (200.0, y + 5.25)])},
+            })
+        segments.append({"id": f"seg_{j}", "ordered_links": [{
+            "id": f"link_{j}",
+            "reference_line": [{"point": {"x": x, "y": y - 1.75}} for x in (0.0, 100.0, 200.0)],
+            "ordered_lanes": lanes,
+        }]})
+        junctions.append({
+            "id": f"junction_{j}",
+            "shape": line([(200.0, y - 5), (220.0, y - 5), (220.0, y + 10), (200.0, y + 10)]),
+            "crosswalks": [{"id": f"cw_{j}", "shape": line([(202.0, y - 5), (206.0, y - 5), (206.0, y + 10)])}],
+        })
+    return {"segments": segments, "junctions": junctions}
+
+
+def segment_distance(x, y, a, b):
+    dx, dy = b.x - a.x, b.y - a.y
+    length2 = dx * dx + dy * dy
+    u = min(max(((x - a.x) * dx + (y - a.y) * dy) / length2, 0.0), 1.0) if length2 else 0.0
+    return math.hypot(x - (a.x + u * dx), y - (a.y + u * dy))
+
+
+def contains(points, x, y):
+    inside = False
+    for a, b in zip(points, points[1:] + points[:1]):
+        if (a.y > y) != (b.y > y) and x < a.x + (y - a.y) * (b.x - a.x) / (b.y - a.y):
+            inside = not inside
+    return inside
+
+
+def brute_force(hd_map: Qxmap, x: float, y: float, r: float) -> dict:
+    """Features of a fresh builder's table within r of a point, by LocalMap field."""
+    result = {}
+    full = LocalMapBuilder(hd_map, radius=1e9).build(x, y)
+    for kind in KINDS:
+        kept = []
+        for feature in getattr(full, kind):
+            points = feature.line.points if hasattr(feature, "line") else feature.points
+            closed = not hasattr(feature, "line") and len(points) >= 3
+            ends = points + points[:1] if closed else points
+            if min(segment_distance(x, y, a, b) for a, b in zip(ends, ends[1:])) <= r \
+                    or closed and contains(points, x, y):
+                kept.append(to_dict(feature))
+        result[kind] = kept
+    return result
+
+
+def test_local_map_builder():
+    """Test incremental builds against a brute-force selection along a drive."""
+    hd_map = decode(Qxmap, road_map())
+    builder = LocalMapBuilder(hd_map, radius=30.0, cell_size=25.0)
+    # 每条路: 3 条边界, 2 条中心线, 1 条停止线, 1 条参考线, 路口和人行横道各 1
+    assert len(builder) == 6 * 9
+
+    local_map = builder.build(100.0, 0.0)
+    assert len(local_map.lane_center_lines) == 2 and len(local_map.lane_boundaries) == 3
+    assert local_map.stop_lines == [] and local_map.crosswalks == []
+    assert builder.build(100.5, 0.0) is local_map
+    assert len(builder.build(195.0, 0.0).crosswalks) == 1
+    # 路口多边形内部离边界超过半径时也要选中
+    assert len(builder.build(210.0, 2.5, 1.0).junctions) == 1
+
+    rnd = random.Random(0)
+    x, y = 0.0, 0.0
+    other = builder.fork()
+    for _ in range(200):
+        x, y = x + rnd.uniform(-8, 12), y + rnd.uniform(-6, 6)
+        if rnd.random() < 0.05:
+            x, y = rnd.uniform(-50, 250), rnd.uniform(-50, 250)
+        local_map = builder.build(x, y)
+        assert {kind: [to_dict(f) for f in getattr(local_map, kind)] for kind in KINDS} == \
+            brute_force(hd_map, x, y, 30.0)
+        assert to_dict(other.build(x, y, 30.0)) == to_dict(local_map)
+    assert to_dict(builder.build(x, y, 60.0)) == to_dict(LocalMapBuilder(hd_map, radius=60.0).build(x, y))
+
+    centers = LocalMapBuilder(hd_map, kinds=["lane_center_lines"]).build(100.0, 0.0)
+    assert centers.lane_boundaries == [] and len(centers.lane_center_lines) == 6
+    with pytest.raises(ValueError):
+        LocalMapBuilder(hd_map, kinds=["lanes"])
+
+
+def test_lane_boundary_marks():
+    """Test lane mark styles on boundaries and de-duplication of reversed shared boundaries."""
+    solid, broken = 2, 3
+    xs = [0.0, 50.0, 100.0]
+    forward = [(x, 0.0) for x in xs]
+    hd_map = decode(Qxmap, {"segments": [
+        {"id": "east", "ordered_links": [{"id": "e", "ordered_lanes": [{
+            "id": "e0",
+            "length": 100.0,
+            "center_line": [{"point": {"x": x, "y": -1.75}} for x in xs],
+            "left_boundary": line(forward),
+            "right_boundary": line([(x, -3.5) for x in xs]),
+            "left_lane_marks": [{"s": 0.0, "length": 100.0, "style": solid, "color": 1}],
+            "right_lane_marks": [
+                {"s": 0.0, "length": 30.0, "style": solid, "color": 2},
+                {"s": 30.0, "length": 70.0, "style": broken, "color": 2},
+            ],
+        }]}]},
+        {"id": "west", "ordered_links": [{"id": "w", "ordered_lanes": [{
+            "id": "w0",
+            "center_line": [{"point": {"x": x, "y": 1.75}} for x in reversed(xs)],
+            "left_boundary": line(list(reversed(forward))),
+            "right_boundary": line([(x, 3.5) for x in reversed(xs)]),
+        }]}]},
+    ]})
+    boundaries = LocalMapBuilder(hd_map).build(50.0, 0.0).lane_boundaries
+    # 中央分隔线在两条 link 中反向存储, 只保留一条
+    assert [(b.style, b.color) for b in boundaries] == [
+        ("LANE_MARK_STYLE_SOLID", "1"),
+        ("LANE_MARK_STYLE_SOLID", "2"),
+        ("LANE_MARK_STYLE_BROKEN", "2"),
+        ("", ""),
+    ]
+    assert [(p.x, p.y) for p in boundaries[1].line.points] == [(0.0, -3.5), (30.0, -3.5)]
+    assert [(p.x, p.y) for p in boundaries[2].line.points] == [(30.0, -3.5), (50.0, -3.5), (100.0, -3.5)]
@@ -0,0 +1,155 @@
+"""Tests for the HD map disk cache."""
+import os
+
+import pytest
+
+from lasvsim_openapi.lazy_model import is_lazy
+from lasvsim_openapi.map_cache import HdMapCache
+from lasvsim_openapi.resources import Resources
+
+MAP_DATA = {
+    "id": "map",
+    "digest": "abc123",
+    "segments": [{
+        "id": "seg",
+        "ordered_links": [{
+            "id": "link",
+            "ordered_lanes": [{
+                "id": "lane",
+                "center_line": [{"s": 0.0, "point": {"x": 0.0, "y": 0.0}}, {"s": 1.5, "point": {"x": 1.5, "y": 0.0}}],
+            }],
+        }],
+    }],
+}
+
+
+class FakeHttpClient:
+    """Answers map requests and counts them."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def clone(self):
+        return self
+
+    def post(self, path, data=None):
+        self.calls += 1
+        return {"data": dict(MAP_DATA, id=data["scen_id"])}
+
+
+def test_map_cache_get_data(tmp_path):
+    """Test disk round trips, digest addressing and hit counters."""
+    cache = HdMapCache(str(tmp_path))
+    assert cache.get_data("scen", "1") is None
+    assert cache.get_data("scen", "1", lambda: MAP_DATA) == MAP_DATA
+    assert cache.get_data("scen", "1", lambda: 1 / 0) == MAP_DATA
+    # 同一 digest 的地图只存一份
+    assert cache.get_data("other", "1", lambda: dict(MAP_DATA)) == MAP_DATA
+    assert [name.split(".")[0] for name in os.listdir(tmp_path / "maps")] == ["abc123"]
+    assert len(os.listdir(tmp_path / "refs")) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    reopened = HdMapCache(str(tmp_path))
+    assert reopened.get_data("scen", "1") == MAP_DATA
+    assert reopened.get_data("scen", "2") is None
+
+    no_digest = {"id": "plain"}
+    assert cache.get_data("plain", "1", lambda: no_digest) == no_digest
+    assert HdMapCache(str(tmp_path)).get_data("plain", "1") == no_digest
+
+    cache.clear()
+    assert HdMapCache(str(tmp_path)).get_data("scen", "1") is None
+
+
+def test_map_cache_corrupt_files(tmp_path):
+    """Test that truncated or mismatched map files are dropped and fetched again."""
+    cache = HdMapCache(str(tmp_path))
+    cache.get_data("scen", "1", lambda: MAP_DATA)
+    (name,) = os.listdir(tmp_path / "maps")
+    path = tmp_path / "maps" / name
+    body = path.read_bytes()
+    path.write_bytes(body[:len(body) // 2])
+    assert HdMapCache(str(tmp_path)).get_data("scen", "1") is None
+    assert not path.exists()
+    assert HdMapCache(str(tmp_path)).get_data("scen", "1", lambda: MAP_DATA) == MAP_DATA
+    assert path.read_bytes() == body
+
+    # 文件内容与引用的 digest 不符
+    cache = HdMapCache(str(tmp_path))
+    cache.get_data("other", "1", lambda: dict(MAP_DATA, digest="def456"))
+    os.replace(tmp_path / "maps" / name.replace("abc123", "def456"), path)
+    assert HdMapCache(str(tmp_path)).get_data("scen", "1", lambda: MAP_DATA) == MAP_DATA
+    assert path.read_bytes() == body
+
+
+def test_map_cache_resources(tmp_path):
+    """Test that Resources downloads and decodes a map once per scenario version."""
+    http_client = FakeHttpClient()
+    resources = Resources(http_client)
+    cache = resources.enable_map_cache(HdMapCache(str(tmp_path), memory_size=1))
+
+    first = resources.get_hd_map("scen_a", "1").data
+    assert first.id == "scen_a"
+    assert first.segments[0].ordered_links[0].ordered_lanes[0].center_line[1].point.x == 1.5
+    assert resources.get_hd_map("scen_a", "1").data is first
+    assert resources.resources_fast.get_hd_map("scen_a", "1") == {"data": dict(MAP_DATA, id="scen_a")}
+    assert http_client.calls == 1
+
+    # 新进程: 只读磁盘, 不再下载
+    resources = Resources(http_client)
+    resources.enable_map_cache(HdMapCache(str(tmp_path)))
+    assert resources.get_hd_map("scen_a", "1").data.id == "scen_a"
+    assert http_client.calls == 1
+
+    resources.disable_map_cache()
+    resources.get_hd_map("scen_a", "1")
+    assert http_client.calls == 2
+    assert cache.hits == 2
+
+
+def test_lazy_hd_map(tmp_path):
+    """Test lazily decoded maps with and without the cache."""
+    http_client = FakeHttpClient()
+    resources = Resources(http_client)
+    hd_map = resources.get_hd_map("scen_a", "1", lazy=True).data
+    assert is_lazy(hd_map)
+    assert hd_map.segment_by_id("seg").ordered_links[0].id == "link"
+
+    cache = resources.enable_map_cache(HdMapCache(str(tmp_path)))
+    lazy = resources.get_hd_map("scen_a", "1", lazy=True).data
+    eager = resources.get_hd_map("scen_a", "1").data
+    assert is_lazy(lazy) and not is_lazy(eager)
+    assert resources.get_hd_map("scen_a", "1", lazy=True).data is lazy
+    assert lazy == eager
+    assert cache.misses == 1
+    with pytest.raises(ValueError):
+        resources.get_hd_map("scen_a", "1", lazy=True, arrays=True)
+
+
+def test_generated_hd_map(tmp_path):
+    """Test maps decoded by the generated decoder with and without the cache."""
+    resources = Resources(FakeHttpClient())
+    eager = resources.get_hd_map("scen_a", "1").data
+    assert resources.get_hd_map("scen_a", "1", generated=True).data == eager
+
+    cache = resources.enable_map_cache(HdMapCache(str(tmp_path)))
+    generated = resources.get_hd_map("scen_a", "1", generated=True).data
+    assert generated == eager and generated is not resources.get_hd_map("scen_a", "1").data
+    assert resources.get_hd_map("scen_a", "1", generated=True).data is generated
+    assert cache.misses == 1
+    with pytest.raises(ValueError):
+        resources.get_hd_map("scen_a", "1", lazy=True, generated=True)
+
+
+def test_array_hd_map(tmp_path):
+    """Test maps decoded with array-backed polylines."""
+    pytest.importorskip("numpy")
+    from lasvsim_openapi.polyline import CenterLineArray
+
+    resources = Resources(FakeHttpClient())
+    lane = resources.get_hd_map("scen_a", "1", arrays=True).data.segment_by_id("seg").ordered_links[0].ordered_lanes[0]
+    assert isinstance(lane.center_line, CenterLineArray)
+    resources.enable_map_cache(HdMapCache(str(tmp_path)))
+    hd_map = resources.get_hd_map("scen_a", "1", arrays=True).data
+    assert hd_map is resources.get_hd_map("scen_a", "1", arrays=True).data
+    assert hd_map == resources.get_hd_map("scen_a", "1").data
@@ -0,0 +1,292 @@
+"""Tests for decoding API responses into models."""
+import copy
+import dataclasses
+import pickle
+import typing
+from dataclasses import asdict
+from enum import Enum
+
+import pytest
+
+from lasvsim_openapi import lazy_model, model_decoder, qxmap, simulator_model
+from lasvsim_openapi.lazy_model import is_lazy, lazy_from_dict
+from lasvsim_openapi.model_decoder import decode, decoder
+from lasvsim_openapi.sim_record_model import SensorObj, Step, Track
+from lasvsim_openapi.simulator_model import (
+    ControlInfo,
+    GetVehiclePositionRes,
+    IdcStepRes,
+    ObjMovingInfo,
+    Point,
+    Position,
+    StepCode,
+    StepRes,
+)
+
+
+@pytest.fixture
+def position_reply() -> dict:
+    """A get_vehicle_position reply with a few vehicles."""
+    return {
+        "position_dict": {
+            f"veh_{i}": {
+                "point": {"x": float(i), "y": 2.0 * i, "z": 0.5},
+                "phi": 0.1 * i,
+                "lane_id": f"lane_{i % 2}" if i < 3 else "",
+                "link_id": "link_0",
+                "s": 10.0 * i,
+                "t": -0.5,
+                **({"lane_offset": 0.25} if i % 2 else {}),
+            }
+            for i in range(4)
+        }
+    }
+
+
+def test_position_columns(position_reply: dict):
+    """Test columnar decoding against the object decoder."""
+    pytest.importorskip("numpy")
+    from lasvsim_openapi.position_columns import PositionColumns
+
+    columns = PositionColumns.from_dict(position_reply)
+    res = GetVehiclePositionRes.from_dict(position_reply)
+    assert len(columns) == len(res.position_dict)
+
+    for i, vehicle_id in enumerate(columns.ids):
+        position = res.position_dict[vehicle_id]
+        assert columns.x[i] == position.point.x
+        assert columns.y[i] == position.point.y
+        assert columns.phi[i] == position.phi
+        assert columns.s[i] == position.s
+        assert columns.lane_id(i) == position.lane_id
+        assert columns.link_id(i) == position.link_id
+        if position.lane_offset is None:
+            assert columns.lane_offset[i] != columns.lane_offset[i], "missing values should be NaN"
+        else:
+            assert columns.lane_offset[i] == position.lane_offset
+    assert columns.lane_code[3] == -1, "empty lane ID should be coded as -1"
+
+
+def test_position_columns_reuse_buffer(position_reply: dict):
+    """Test decoding into an existing buffer keeps intern codes stable."""
+    pytest.importorskip("numpy")
+    from lasvsim_openapi.position_columns import PositionColumns
+
+    out = PositionColumns()
+    PositionColumns.from_dict(position_reply, out=out)
+    codes = dict(zip(out.ids, out.lane_code.tolist()))
+
+    del position_reply["position_dict"]["veh_0"]
+    res = PositionColumns.from_dict(position_reply, out=out)
+    assert res is out
+    assert len(out) == 3
+    assert dict(zip(out.ids, out.lane_code.tolist())) == {k: v for k, v in codes.items() if k != "veh_0"}
+
+
+def test_lazy_from_dict(position_reply: dict):
+    """Test lazily decoded responses against eagerly decoded ones."""
+    eager = GetVehiclePositionRes.from_dict(copy.deepcopy(position_reply))
+    lazy = lazy_from_dict(GetVehiclePositionRes, position_reply)
+
+    assert is_lazy(lazy) and not is_lazy(eager)
+    assert isinstance(lazy, GetVehiclePositionRes)
+    position = lazy.position_dict["veh_1"]
+    assert isinstance(position, Position)
+    assert position.point.x == 1.0
+    assert position.lane_offset == 0.25
+    assert lazy.position_dict["veh_0"].lane_offset is None
+
+    assert lazy == eager and eager == lazy
+    assert repr(lazy) == repr(eager)
+    assert asdict(lazy) == asdict(eager)
+
+    restored = pickle.loads(pickle.dumps(lazy))
+    assert type(restored) is GetVehiclePositionRes
+    assert restored == eager
+
+
+def test_lazy_from_dict_defaults():
+    """Test that missing members get the same defaults as from_dict."""
+    eager = IdcStepRes.from_dict({})
+    lazy = lazy_from_dict(IdcStepRes, {})
+    assert lazy == eager
+    assert lazy.perception_infos == []
+    assert lazy.step_res.code == StepCode.RUNNING
+
+    lazy = lazy_from_dict(IdcStepRes, {"step_res": {"code": 1001}})
+    assert lazy.step_res.code is StepCode(1001)
+    assert lazy_from_dict(IdcStepRes, None) is None
+
+
+def test_decoding_without_source(monkeypatch):
+    """Test that lazy and generated decoding do not depend on the model source code."""
+    def no_source(obj):
+        raise OSError("source code not available")
+
+    monkeypatch.setattr("inspect.getsource", no_source)
+    monkeypatch.setattr(lazy_model, "_lazy_classes", {})
+    monkeypatch.setattr(model_decoder, "_decoders", {})
+    for decode_func in (decode, lazy_from_dict):
+        assert decode_func(IdcStepRes, {}).step_res == StepRes(code=StepCode.RUNNING)
+        assert decode_func(IdcStepRes, {}).position == Position()
+        assert decode_func(IdcStepRes, {"step_res": {"code": 1001}}).step_res.code is StepCode(1001)
+        assert type(decode_func(qxmap.Lane, {"type": 1}).type) is int
+
+
+def test_field_metadata_checked():
+    """Test that enum fields without decoding metadata are rejected."""
+    @dataclasses.dataclass
+    class Undeclared:
+        code: StepCode = StepCode.RUNNING
+
+        @classmethod
+        def from_dict(cls, data: dict = None):
+            return cls(StepCode(data.get("code", 0)))
+
+    @dataclasses.dataclass
+    class NotAnEnum:
+        code: int = 0
+        _enum_fields = ("code",)
+
+        @classmethod
+        def from_dict(cls, data: dict = None):
+            return cls(data.get("code", 0))
+
+    for cls in (Undeclared, NotAnEnum):
+        with pytest.raises(TypeError):
+            decoder(cls)
+        with pytest.raises(TypeError):
+            lazy_from_dict(cls, {})
+
+
+@pytest.mark.parametrize("cls", [Point, Position, ObjMovingInfo, ControlInfo, Track, Step, SensorObj])
+def test_slotted_models(cls):
+    """Test that high-volume models carry no per-instance __dict__."""
+    instance = cls()
+    assert not hasattr(instance, "__dict__")
+    assert cls.from_dict({}) == instance
+
+
+def test_point_from_dict_copies():
+    """Test that Point.from_dict does not alias the input dict."""
+    data = {"x": 1.0, "y": 2.0}
+    point = Point.from_dict(data)
+    point.x = 3.0
+    assert data == {"x": 1.0, "y": 2.0}
+    assert point == Point(3.0, 2.0, 0.0)
+
+
+def sample_reply(tp, depth: int = 0):
+    """Build a raw reply of type tp from the model type hints."""
+    if getattr(tp, "__origin__", None) is typing.Union:
+        tp = [a for a in tp.__args__ if a is not type(None)][0]
+    if dataclasses.is_dataclass(tp):
+        hints = typing.get_type_hints(tp)
+        return {f.name: sample_reply(hints[f.name], depth + 1) for f in dataclasses.fields(tp)}
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return list(tp)[-1].value
+    args = getattr(tp, "__args__", ())
+    if getattr(tp, "__origin__", None) is list:
+        return [sample_reply(args[0], depth + 1) for _ in range(2)]
+    if getattr(tp, "__origin__", None) is dict:
+        return {f"key_{i}": sample_reply(args[1], depth + 1) for i in range(2)}
+    return {float: 1.5, int: depth, str: f"id_{depth}", bool: True}.get(tp)
+
+
+RESPONSE_MODELS = [
+    cls for module in (simulator_model, qxmap) for name, cls in vars(module).items()
+    if dataclasses.is_dataclass(cls) and cls.__module__ == module.__name__
+    and (name.endswith("Res") or module is qxmap) and name != "Qxmap"
+]
+
+
+@pytest.mark.parametrize("cls", RESPONSE_MODELS, ids=lambda cls: cls.__name__)
+def test_generated_decoder(cls):
+    """Test generated decoders against the hand-written from_dict."""
+    for data in (sample_reply(cls), {}):
+        original = copy.deepcopy(data)
+        try:
+            expected = cls.from_dict(copy.deepcopy(data))
+            repr(expected)
+        except AttributeError:
+            # from_dict 无法解码的字段组合, 不作比较
+            continue
+        res = decode(cls, data)
+        assert data == original, "decoding should not modify the reply"
+        assert type(res) is cls
+        assert res == expected
+        assert repr(res) == repr(expected)
+    assert decode(cls, None) is None
+
+
+def test_generated_decoder_qxmap():
+    """Test decoding a whole map, including its digest."""
+    data = sample_reply(qxmap.Qxmap)
+    res = decode(qxmap.Qxmap, data)
+    expected = qxmap.Qxmap.from_dict(copy.deepcopy(data))
+    assert res.digest == expected.digest == data["digest"]
+    assert res == expected
+
+
+def test_generated_decoder_enums():
+    """Test enum conversion follows from_dict."""
+    res = decode(IdcStepRes, {"step_res": {"code": 1001}})
+    assert res.step_res.code is StepCode(1001)
+    assert res == IdcStepRes.from_dict({"step_res": {"code": 1001}})
+
+    # qxmap 的 from_dict 原样保存枚举字段的数值
+    lane = decode(qxmap.Lane, {"type": 1})
+    assert type(lane.type) is int
+    assert decoder(qxmap.Lane) is decoder(qxmap.Lane)
+
+
+def test_to_dict_matches_asdict():
+    """Test request serialization against dataclasses.asdict."""
+    from lasvsim_openapi.model_encoder import point_dicts, to_dict
+    from lasvsim_openapi.simulator_model import LaneBoundary, LocalMap, LocalPath, Obstacle
+
+    obstacle = Obstacle(id="obs", type=2, moving_info=ObjMovingInfo(u=1.0), position=Position(point=Point(1.0, 2.0)))
+    local_map = LocalMap(lane_boundaries=[LaneBoundary()], traffic_light_colors={"l0": 1})
+    local_path = LocalPath(points=[Point(0.0, 1.0), Point(1.0, 2.0)], prob=0.5)
+    for obj in (obstacle, local_map, local_path):
+        assert to_dict(obj) == asdict(obj)
+    assert to_dict([obstacle, None]) == [asdict(obstacle), None]
+    assert to_dict(None) is None
+
+    path = [Point(1.0, 2.0, 3.0), (4.0, 5.0), [6.0, 7.0, 8.0], {"x": 9.0, "y": 1.0, "z": 0.0}]
+    assert point_dicts(path) == [
+        {"x": 1.0, "y": 2.0, "z": 3.0},
+        {"x": 4.0, "y": 5.0, "z": 0.0},
+        {"x": 6.0, "y": 7.0, "z": 8.0},
+        {"x": 9.0, "y": 1.0, "z": 0.0},
+    ]
+
+
+def test_array_paths():
+    """Test serializing planning and local paths given as numpy arrays."""
+    np = pytest.importorskip("numpy")
+    from lasvsim_openapi.model_encoder import local_path_dicts, point_dicts, value_list
+    from lasvsim_openapi.simulator_model import LocalPath
+
+    xyz = np.arange(12, dtype=np.float64).reshape(4, 3)
+    expected = point_dicts([Point(*row) for row in xyz.tolist()])
+    assert point_dicts(xyz) == expected
+    assert type(point_dicts(xyz)[0]["x"]) is float
+    assert point_dicts(xyz[:, :2]) == [dict(p, z=0.0) for p in expected]
+
+    records = np.zeros(4, dtype=[("x", "f8"), ("y", "f8"), ("z", "f8"), ("v", "f8")])
+    records["x"], records["y"], records["z"] = xyz.T
+    assert point_dicts(records) == expected
+    with pytest.raises(ValueError):
+        point_dicts(np.zeros((4, 4)))
+    assert value_list(np.ones(3)) == [1.0, 1.0, 1.0]
+
+    paths = np.zeros(2, dtype=[("points", "f8", (4, 3)), ("prob", "f8")])
+    paths["points"] = xyz
+    paths["prob"] = [0.75, 0.25]
+    local_paths = [LocalPath(points=[Point(*row) for row in xyz.tolist()], prob=p) for p in (0.75, 0.25)]
+    expected = [asdict(p) for p in local_paths]
+    assert local_path_dicts(paths) == expected
+    assert local_path_dicts(local_paths) == expected
+    assert local_path_dicts([(xyz, 0.75), {"points": xyz, "prob": 0.25}]) == expected
+    assert local_path_dicts([[xyz, 0.75], [xyz.tolist(), np.float64(0.25)]]) == expected
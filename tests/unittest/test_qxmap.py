@@ -0,0 +1,275 @@
+"""Tests for HD map queries."""
+import math
+import random
+
+import pytest
+
+from lasvsim_openapi.lazy_model import is_lazy, lazy_from_dict
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.model_encoder import to_dict
+from lasvsim_openapi.qxmap import Junction, Qxmap, Segment
+
+np = pytest.importorskip("numpy")
+from lasvsim_openapi.frenet import FrenetProjector  # noqa: E402
+
+
+def lane_dict(lane_id: str, points, width: float = 3.5) -> dict:
+    """A lane following points, with boundaries offset by half the width."""
+    center_line, left, right = [], [], []
+    s = 0.0
+    for i, (x, y) in enumerate(points):
+        if i:
+            s += math.hypot(x - points[i - 1][0], y - points[i - 1][1])
+        j = min(i, len(points) - 2)
+        heading = math.atan2(points[j + 1][1] - points[j][1], points[j + 1][0] - points[j][0])
+        nx, ny = -math.sin(heading) * width / 2, math.cos(heading) * width / 2
+        center_line.append({"s": s, "heading": heading, "point": {"x": x, "y": y}})
+        left.append({"x": x + nx, "y": y + ny})
+        right.append({"x": x - nx, "y": y - ny})
+    return {
+        "id": lane_id,
+        "length": s,
+        "center_line": center_line,
+        "left_boundary": {"points": left},
+        "right_boundary": {"points": right},
+    }
+
+
+def hd_map_data() -> dict:
+    """A segment with two parallel lanes along X, a curved junction lane and a diagonal one."""
+    straight = [(float(x), 0.0) for x in range(0, 101, 5)]
+    arc = [(100.0 + 20 * math.sin(a), 20 - 20 * math.cos(a)) for a in np.linspace(0, math.pi / 2, 10)]
+    return {
+        "id": "map",
+        "segments": [{
+            "id": "seg",
+            "ordered_links": [{
+                "id": "link",
+                "reference_line": [{"s": x, "point": {"x": x, "y": 1.75}} for x, _ in straight],
+                "ordered_lanes": [
+                    lane_dict("lane_0", straight),
+                    lane_dict("lane_1", [(x, y + 3.5) for x, y in straight]),
+                ],
+            }],
+        }],
+        "junctions": [{
+            "id": "junction",
+            "movements": [{"id": "movement", "upstream_link_id": "link", "downstream_link_id": "turn"}],
+            "links": [
+                {"id": "turn", "ordered_lanes": [lane_dict("lane_turn", arc)]},
+                {"id": "diagonal", "ordered_lanes": [lane_dict("lane_diag", [(0.0, 20.0), (40.0, 60.0)])]},
+            ],
+        }],
+    }
+
+
+@pytest.fixture
+def hd_map() -> Qxmap:
+    return Qxmap.from_dict(hd_map_data())
+
+
+def brute_force_nearest(hd_map: Qxmap, x: float, y: float):
+    best = None
+    for lane in hd_map.iter_lanes():
+        pts = np.array([(c.point.x, c.point.y) for c in lane.center_line])
+        a, b = pts[:-1], pts[1:]
+        d = b - a
+        u = np.clip(((x - a[:, 0]) * d[:, 0] + (y - a[:, 1]) * d[:, 1]) / (d ** 2).sum(axis=1), 0, 1)
+        dist = np.hypot(x - a[:, 0] - u * d[:, 0], y - a[:, 1] - u * d[:, 1]).min()
+        if best is None or dist < best[1]:
+            best = (lane.id, dist)
+    return best
+
+
+def test_nearest_lane(hd_map: Qxmap):
+    """Test nearest lane lookups against a linear scan."""
+    assert hd_map.nearest_lane(50.0, 0.4) == "lane_0"
+    assert hd_map.nearest_lane(50.0, 3.0) == "lane_1"
+    assert hd_map.nearest_lane(114.0, 6.0) == "lane_turn"
+    assert hd_map.nearest_lane(50.0, 40.0, max_distance=5.0) is None
+
+    rnd = random.Random(0)
+    index = hd_map.lane_index(cell_size=4.0)
+    for _ in range(200):
+        x, y = rnd.uniform(-50, 200), rnd.uniform(-50, 80)
+        lane_id, dist = index.nearest(x, y)
+        expected_id, expected_dist = brute_force_nearest(hd_map, x, y)
+        assert dist == pytest.approx(expected_dist)
+        if not math.isclose(dist, expected_dist):
+            assert lane_id == expected_id
+
+
+def test_nearest_non_finite(hd_map: Qxmap):
+    """Test that NaN and infinite points find nothing instead of looping forever."""
+    for x, y in ((math.nan, 0.0), (50.0, math.nan), (math.inf, 0.0), (0.0, -math.inf)):
+        assert hd_map.nearest_lane(x, y) is None
+        assert hd_map.lane_index().nearest(x, y, max_distance=5.0) is None
+
+    seg, dist, u = hd_map.lane_index().nearest_segments([math.nan, 50.0, math.inf], [0.0, 0.4, 0.0])
+    assert list(seg[[0, 2]]) == [-1, -1] and list(dist[[0, 2]]) == [math.inf, math.inf]
+    assert seg[1] >= 0 and dist[1] == pytest.approx(0.4)
+
+    projector = hd_map.lane_projector()
+    for ids in (None, "lane_0"):
+        line_ids, s, t = projector.to_frenet([50.0, math.nan, 30.0], [0.5, 0.0, math.inf], ids=ids)
+        assert list(line_ids) == ["lane_0", None, None]
+        assert s[0] == pytest.approx(50.0) and np.isnan(s[1:]).all() and np.isnan(t[1:]).all()
+
+
+def test_lanes_in_box_and_radius(hd_map: Qxmap):
+    """Test box and radius queries."""
+    assert hd_map.lanes_in_box(10.0, -1.0, 20.0, 1.0) == ["lane_0"]
+    assert hd_map.lanes_in_box(10.0, -1.0, 20.0, 2.0) == ["lane_0", "lane_1"]
+    assert hd_map.lanes_in_box(10.0, -10.0, 20.0, -5.0) == []
+    assert hd_map.lanes_in_box(110.0, 10.0, 130.0, 30.0) == ["lane_turn"]
+    # 与线段包围盒相交, 但线段未穿过矩形
+    assert hd_map.lanes_in_box(25.0, 30.0, 28.0, 33.0) == []
+    assert hd_map.lanes_in_box(25.0, 30.0, 28.0, 48.0) == ["lane_diag"]
+
+    assert hd_map.lanes_within(50.0, -1.0, 1.0) == ["lane_0"]
+    assert hd_map.lanes_within(50.0, 3.0, 10.0) == ["lane_1", "lane_0"]
+    assert hd_map.lanes_within(50.0, 40.0, 5.0) == []
+
+
+def test_frenet_projection(hd_map: Qxmap):
+    """Test batch Frenet projection and its inverse."""
+    projector = hd_map.lane_projector()
+    ids, s, t = projector.to_frenet([30.0, 30.0, 50.0, -5.0], [0.5, -1.0, 3.0, 0.5])
+    assert list(ids) == ["lane_0", "lane_0", "lane_1", "lane_0"]
+    assert s == pytest.approx([30.0, 30.0, 50.0, -5.0])
+    assert t == pytest.approx([0.5, -1.0, -0.5, 0.5])
+
+    # 圆弧车道左转, 圆心在左侧
+    a = 0.6
+    ids, s, t = projector.to_frenet(100.0 + 18 * math.sin(a), 20 - 18 * math.cos(a))
+    assert ids[0] == "lane_turn"
+    assert s[0] == pytest.approx(20 * a, rel=0.01)
+    assert t[0] == pytest.approx(2.0, abs=0.1)
+
+    ids, s, t = projector.to_frenet([50.0, 60.0, 70.0], [0.5, 3.0, 30.0], ids="lane_0")
+    assert list(ids) == ["lane_0", "lane_0", "lane_0"]
+    assert s == pytest.approx([50.0, 60.0, 70.0])
+    assert t == pytest.approx([0.5, 3.0, 30.0])
+    ids, s, t = projector.to_frenet([50.0], [0.5], ids=["lane_1"])
+    assert (ids[0], s[0], t[0]) == ("lane_1", pytest.approx(50.0), pytest.approx(-3.0))
+    with pytest.raises(ValueError):
+        projector.to_frenet([0.0], [0.0], ids=["no_such_lane"])
+
+    rnd = np.random.default_rng(0)
+    x, y = rnd.uniform(-10, 95, 500), rnd.uniform(-1.5, 5.0, 500)
+    ids, s, t = projector.to_frenet(x, y)
+    back_x, back_y = projector.to_xy(ids, s, t)
+    assert back_x == pytest.approx(x)
+    assert back_y == pytest.approx(y)
+
+    x, y = rnd.uniform(-50, 200, 300), rnd.uniform(-50, 80, 300)
+    ids, s, t = projector.to_frenet(x, y)
+    for i in range(len(x)):
+        lane_id, dist = brute_force_nearest(hd_map, x[i], y[i])
+        if 0 < s[i] < projector.length[projector.ids.index(ids[i])]:
+            assert abs(t[i]) == pytest.approx(dist)
+
+    links = hd_map.link_projector()
+    assert links.ids == ["link"]
+    ids, s, t = links.to_frenet([20.0], [0.0])
+    assert (ids[0], s[0], t[0]) == ("link", pytest.approx(20.0), pytest.approx(-1.75))
+    x, y = links.to_xy("link", [0.0, 100.0], [1.75, 0.0])
+    assert x == pytest.approx([0.0, 100.0])
+    assert y == pytest.approx([3.5, 1.75])
+
+
+def test_frenet_zero_length_segments():
+    """Test that repeated and single points keep the lateral offset."""
+    projector = FrenetProjector(
+        ["north", "point"], [[(0.0, 0.0), (0.0, 10.0), (0.0, 10.0)], [(5.0, 5.0)]], cell_size=2.0,
+    )
+    # 末尾重复点构成零长度线段, 沿用前一线段的方向 (+y), 左侧为 -x
+    x, y = projector.to_xy("north", [10.0, 12.0, 5.0], [1.0, -1.0, 1.0])
+    assert x == pytest.approx([-1.0, 1.0, -1.0])
+    assert y == pytest.approx([10.0, 12.0, 5.0])
+    ids, s, t = projector.to_frenet([-1.0], [10.0], ids="north")
+    assert (s[0], t[0]) == (pytest.approx(10.0), pytest.approx(1.0))
+
+    # 单点折线没有方向, 按 +x 方向处理
+    x, y = projector.to_xy("point", 0.0, 2.0)
+    assert (x[0], y[0]) == (pytest.approx(5.0), pytest.approx(7.0))
+    ids, s, t = projector.to_frenet([5.0, 5.0], [7.0, 3.0], ids="point")
+    assert list(t) == pytest.approx([2.0, -2.0])
+
+
+def test_lazy_map_by_id():
+    """Test ID lookups on eager and lazily decoded maps."""
+    data = hd_map_data()
+    eager = decode(Qxmap, data)
+    lazy = lazy_from_dict(Qxmap, data)
+    assert lazy.segment_by_id("missing") is None
+
+    segment = lazy.segment_by_id("seg")
+    assert isinstance(segment, Segment) and is_lazy(segment)
+    assert "ordered_links" not in segment.__dict__, "segment should not be decoded by the ID lookup"
+    assert [lane.id for lane in segment.ordered_links[0].ordered_lanes] == ["lane_0", "lane_1"]
+    assert segment is lazy.segments[0]
+    assert segment == eager.segment_by_id("seg")
+
+    junction = lazy.junction_by_id("junction")
+    assert isinstance(junction, Junction)
+    assert [link.id for link in junction.links] == ["turn", "diagonal"]
+    assert junction == eager.junction_by_id("junction")
+    assert lazy.nearest_lane(50.0, 3.0) == "lane_1"
+
+
+def test_topology_by_id():
+    """Test lane, link and movement lookups and the lane/link/segment ownership maps."""
+    for hd_map in (decode(Qxmap, hd_map_data()), lazy_from_dict(Qxmap, hd_map_data())):
+        lane = hd_map.lane_by_id("lane_turn")
+        assert lane is hd_map.junctions[0].links[0].ordered_lanes[0]
+        assert hd_map.lane_to_link("lane_turn") is hd_map.link_by_id("turn")
+        assert hd_map.link_to_segment("turn") is None
+        assert hd_map.lane_to_link("lane_1").id == "link"
+        assert hd_map.link_to_segment("link") is hd_map.segment_by_id("seg")
+        assert hd_map.movement_by_id("movement").downstream_link_id == "turn"
+        for missing in (hd_map.lane_by_id, hd_map.link_by_id, hd_map.lane_to_link, hd_map.link_to_segment,
+                        hd_map.movement_by_id):
+            assert missing("missing") is None
+
+
+def test_iter_missing_lists():
+    """Test iterating and indexing maps whose lists are None, as in partial replies."""
+    hd_map = decode(Qxmap, hd_map_data())
+    hd_map.junctions[0].links = None
+    hd_map.segments[0].ordered_links[0].ordered_lanes = None
+    assert [link.id for link in hd_map.iter_links()] == ["link"]
+    assert list(hd_map.iter_lanes()) == []
+    assert hd_map.link_by_id("link") is not None and hd_map.lane_by_id("lane_1") is None
+    hd_map.junctions = None
+    hd_map.segments[0].ordered_links = None
+    assert list(hd_map.iter_links()) == []
+
+
+def test_array_map():
+    """Test that array-backed polylines behave like the object lists."""
+    from lasvsim_openapi.polyline import CenterLineArray, PointArray, decode_array_map
+
+    data = hd_map_data()
+    eager = decode(Qxmap, data)
+    arrays = decode_array_map(data)
+    assert data == hd_map_data(), "input should not be modified"
+    assert arrays == eager
+
+    lane = arrays.segments[0].ordered_links[0].ordered_lanes[1]
+    assert isinstance(lane.center_line, CenterLineArray)
+    assert isinstance(lane.left_boundary.points, PointArray)
+    assert lane.center_line.array.shape == (21, 7)
+    assert lane.center_line[1].point.x == 5.0
+    assert list(lane.center_line[-2:].column("s")) == [95.0, 100.0]
+    assert [c.point.y for c in lane.center_line][:2] == [3.5, 3.5]
+    assert lane.left_boundary.points.xy[0].tolist() == [0.0, 5.25]
+    assert arrays.segments[0].ordered_links[0].reference_line[2].s == 10.0
+    assert to_dict(lane) == to_dict(eager.segments[0].ordered_links[0].ordered_lanes[1])
+    with pytest.raises(ValueError):
+        PointArray(np.zeros((3, 2)))
+
+    assert arrays.nearest_lane(114.0, 6.0) == "lane_turn"
+    x, y = [30.0, 50.0, 110.0], [0.5, 3.0, 5.0]
+    for expected, actual in zip(eager.lane_projector().to_frenet(x, y), arrays.lane_projector().to_frenet(x, y)):
+        assert list(expected) == list(actual)
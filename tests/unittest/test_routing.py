@@ -0,0 +1,99 @@
+"""Tests for lane-level routing."""
+import math
+
+import pytest
+
+from lasvsim_openapi.model_decoder import decode
+from lasvsim_openapi.qxmap import Qxmap
+
+
+def lane(lane_id, start, end, downstream=()):
+    return {
+        "id": lane_id,
+        "center_line": [{"point": {"x": start[0], "y": start[1]}}, {"point": {"x": end[0], "y": end[1]}}],
+        "downstream_lane_ids": list(downstream),
+    }
+
+
+@pytest.fixture
+def hd_map():
+    # A 两车道直行接 B, 左侧车道左转接 C; D 只有 link 级拓扑
+    return decode(Qxmap, {
+        "segments": [
+            {"id": "sa", "ordered_links": [{"id": "A", "ordered_lanes": [
+                lane("A0", (0, 0), (100, 0), ["Js"]), lane("A1", (0, 3.5), (100, 3.5), ["Jl"])]}]},
+            {"id": "sb", "ordered_links": [{"id": "B", "downstream_link_ids": ["D"], "ordered_lanes": [
+                lane("B0", (120, 0), (220, 0)), lane("B1", (120, 3.5), (220, 3.5))]}]},
+            {"id": "sc", "ordered_links": [{"id": "C", "ordered_lanes": [lane("C0", (110, 20), (110, 120))]}]},
+            {"id": "sd", "ordered_links": [{"id": "D", "ordered_lanes": [lane("D0", (220, 0), (300, 0))]}]},
+        ],
+        "junctions": [{"id": "j", "links": [
+            {"id": "J_straight", "ordered_lanes": [lane("Js", (100, 0), (120, 0), ["B0"])]},
+            {"id": "J_left", "ordered_lanes": [lane("Jl", (100, 3.5), (110, 20), ["C0"])]},
+        ]}],
+    })
+
+
+def test_lane_route(hd_map):
+    """Test routes with lane changes, link targets and unreachable lanes."""
+    graph = hd_map.lane_graph(lane_change_cost=10.0)
+    assert hd_map.lane_graph() is graph and len(graph) == 8
+    assert graph.lane_route("A0", "C0") == ["A0", "A1", "Jl", "C0"]
+    assert graph.route_cost("A0", "C0") == pytest.approx(10.0 + 100.0 + math.hypot(10, 16.5))
+    assert graph.link_route("A1", to_link_id="B") == ["A", "J_straight", "B"]
+    assert graph.link_route("A1", "B1") == ["A", "J_straight", "B"]
+    assert graph.lane_route("A1", "B1") == ["A1", "A0", "Js", "B0", "B1"]
+    assert graph.link_route("A0", "D0") == ["A", "J_straight", "B", "D"]
+    assert graph.lane_route("C0", "A0") is None
+    assert graph.route_cost("C0", "A0") == math.inf
+    assert graph.lane_route("A0", "A0") == ["A0"]
+    with pytest.raises(ValueError):
+        graph.lane_route("A0", "nope")
+    with pytest.raises(ValueError):
+        graph.lane_route("A0", "B0", "B")
+
+
+def test_shortest_path_tree(hd_map):
+    """Test that cached trees give the same routes as A*."""
+    graph = hd_map.lane_graph()
+    expected = {lane_id: graph.link_route(lane_id, to_link_id="D") for lane_id in graph.lane_ids}
+    costs = {lane_id: graph.route_cost(lane_id, to_link_id="D") for lane_id in graph.lane_ids}
+    assert graph.link_routes(graph.lane_ids, to_link_id="D") == expected
+    assert graph.shortest_path_tree(to_link_id="D") is graph.shortest_path_tree(to_link_id="D")
+    for lane_id in graph.lane_ids:
+        assert graph.route_cost(lane_id, to_link_id="D") == pytest.approx(costs[lane_id])
+        assert graph.link_route(lane_id, to_link_id="D") == expected[lane_id]
+    assert expected["C0"] is None and expected["D0"] == ["D"]
+
+
+def test_lane_change_marks():
+    """Test that lane changes across solid marks are left out, and Dijkstra without start points."""
+    solid, broken = {"style": 2}, {"style": 3}
+    left = lane("L", (0, 3.5), (100, 3.5))
+    right = lane("R", (0, 0), (100, 0))
+    # R 左侧为实线; L 右侧前段虚线后段实线, 仍可换道
+    right["left_lane_marks"] = [dict(solid, s=0.0, length=100.0)]
+    left["right_lane_marks"] = [dict(broken, s=0.0, length=60.0), dict(solid, s=60.0, length=40.0)]
+    graph = decode(Qxmap, {"segments": [{"id": "s", "ordered_links": [
+        {"id": "A", "ordered_lanes": [right, left]},
+        {"id": "B", "ordered_lanes": [
+            lane("B0", (0, 10), (100, 10)),
+            dict(lane("B1", (0, 13.5), (100, 13.5)), right_lane_marks=[{"styles": [2, 2]}]),
+            dict(lane("B2", (0, 17), (100, 17)), right_lane_marks=[{"styles": [2, 3]}]),
+        ]},
+    ]}]}).lane_graph()
+    assert graph.lane_route("L", "R") == ["L", "R"]
+    assert graph.lane_route("R", "L") is None
+    # B0 无车道线时参考 B1 右侧的双实线; B2 与 B1 之间为虚实线, 允许换道
+    assert graph.lane_route("B0", "B1") is None and graph.lane_route("B1", "B0") is None
+    assert graph.lane_route("B2", "B1") == ["B2", "B1"]
+    assert graph._scale > 0
+
+    no_start = decode(Qxmap, {"segments": [{"id": "s", "ordered_links": [
+        {"id": "A", "ordered_lanes": [lane("A0", (0, 0), (100, 0), ["X"])]},
+        {"id": "X", "ordered_lanes": [{"id": "X", "length": 1.0, "downstream_lane_ids": ["B0"]}]},
+        {"id": "B", "ordered_lanes": [lane("B0", (1000, 0), (1100, 0))]},
+    ]}]}).lane_graph()
+    assert no_start._scale == 0.0
+    assert no_start.lane_route("A0", "B0") == ["A0", "X", "B0"]
+    assert no_start.route_cost("A0", "B0") == pytest.approx(101.0)
@@ -5,7 +5,7 @@ import pytest
 
 from lasvsim_openapi.client import Client
 from lasvsim_openapi.simulator import Simulator
-from lasvsim_openapi.simulator_model import Point, ObjBaseInfo, DynamicInfo,LocalMap,Obstacle,ObjMovingInfo,Position,LocalPath
+from lasvsim_openapi.simulator_model import Point, ObjBaseInfo, DynamicInfo,LocalMap,Obstacle,ObjMovingInfo,Position,LocalPath,SimulatorConfig
 
 
 def test_simulator_initialization(simulator: Simulator):
@@ -990,3 +990,107 @@ def test_get_vehicle_sensor_config(simulator: Simulator):
     # Then test getting vehicle sensor configuration
     sensor_config_res = simulator.get_vehicle_sensor_config(res.list[0])
     assert sensor_config_res is not None, "sensor config response should not be None"
+
+
+def test_simulator_pool(client: Client, scenario_info: Tuple[str, str]):
+    """Test stepping several simulators through a pool."""
+    scen_id, scen_ver = scenario_info
+    configs = [SimulatorConfig(scen_id=scen_id, scen_ver=scen_ver) for _ in range(2)]
+    with client.client_fast.init_simulator_pool(configs) as pool:
+        assert len(pool) == 2
+        assert pool[0].simulation_id != pool[1].simulation_id
+
+        vehicle_ids = pool.map(lambda sim: sim.get_test_vehicle_id_list()["list"][0])
+        res = pool.set_control_all([(vid, 1.0, 0.1) for vid in vehicle_ids])
+        assert len(res) == 2
+
+        res = pool.step_all()
+        assert len(res) == 2, "step_all should return one result per simulator"
+
+
+def test_vec_idc_env(client: Client, scenario_info: Tuple[str, str]):
+    """Test stepping the vectorized IDC environment."""
+    np = pytest.importorskip("numpy")
+    from lasvsim_openapi.vec_env import VecIdcEnv
+
+    scen_id, scen_ver = scenario_info
+    configs = [SimulatorConfig(scen_id=scen_id, scen_ver=scen_ver) for _ in range(2)]
+    env = VecIdcEnv(client.client_fast.init_simulator_pool(configs))
+    try:
+        obs = env.reset()
+        assert obs.shape == (2, env.obs_dim)
+
+        obs, rewards, dones, infos = env.step(np.zeros((2, 2)))
+        assert obs.shape == (2, env.obs_dim)
+        assert rewards.shape == (2,) and dones.shape == (2,)
+        assert len(infos) == 2
+    finally:
+        env.close()
+
+
+def test_get_vehicle_position_chunked(simulator: Simulator):
+    """Test that chunked ID list queries merge to the same result."""
+    res = simulator.get_vehicle_id_list()
+    assert len(res.list) > 0
+
+    expected = simulator.get_vehicle_position(res.list)
+    simulator.simulator_fast.id_list_chunk_size = 1
+    try:
+        chunked = simulator.get_vehicle_position(res.list)
+    finally:
+        del simulator.simulator_fast.id_list_chunk_size
+    assert set(chunked.position_dict) == set(expected.position_dict)
+
+
+def test_static_cache(simulator: Simulator):
+    """Test caching vehicle base info until the simulation is reset."""
+    simulator_fast = simulator.simulator_fast
+    cache = simulator_fast.enable_static_cache()
+    try:
+        res = simulator.get_vehicle_id_list()
+        assert len(res.list) > 0
+
+        first = simulator.get_vehicle_base_info([res.list[0]])
+        second = simulator.get_vehicle_base_info([res.list[0]])
+        assert first == second
+        assert cache.hits == 1
+
+        simulator.reset()
+        assert len(cache) == 0, "reset should drop cached entries"
+    finally:
+        simulator_fast.disable_static_cache()
+
+
+def test_step_and_observe(simulator: Simulator):
+    """Test applying controls, stepping and querying in one call."""
+    simulator_fast = simulator.simulator_fast
+    vehicle_id = simulator_fast.get_test_vehicle_id_list()["list"][0]
+
+    res = simulator_fast.step_and_observe(
+        controls={vehicle_id: (1.0, 0.1)},
+        queries={
+            "get_vehicle_position": ([vehicle_id],),
+            "get_vehicle_moving_info": ([vehicle_id],),
+            "get_vehicle_perception_info": (vehicle_id,),
+        },
+    )
+    assert res["step"] is not None
+    assert vehicle_id in res["controls"]
+    assert vehicle_id in res["get_vehicle_position"]["position_dict"]
+
+    with pytest.raises(ValueError):
+        simulator_fast.step_and_observe(queries={"stop": ()})
+
+
+def test_set_vehicle_control_info_many(simulator: Simulator):
+    """Test setting control information of several vehicles at once."""
+    simulator_fast = simulator.simulator_fast
+    vehicle_ids = simulator_fast.get_test_vehicle_id_list()["list"]
+    assert len(vehicle_ids) > 0
+
+    controls = {vehicle_id: (1.0, 0.1) for vehicle_id in vehicle_ids}
+    controls["invalid_vehicle_id"] = (1.0, 0.1)
+    res = simulator_fast.set_vehicle_control_info_many(controls)
+    assert set(res["results"]) | set(res["errors"]) == set(controls), "every vehicle should be reported"
+    assert not set(res["results"]) & set(res["errors"])
+    assert set(vehicle_ids) <= set(res["results"])
@@ -0,0 +1,169 @@
+"""Tests for SimulatorFast and AsyncSimulatorFast against the stand-in cosim server."""
+import asyncio
+
+import pytest
+
+from lasvsim_openapi.http_client import APIError, HttpClient, HttpConfig
+from lasvsim_openapi.http_client_async import AsyncHttpClient
+from lasvsim_openapi.simulator import Simulator
+from lasvsim_openapi.simulator_async import AsyncSimulatorFast
+from lasvsim_openapi.simulator_fast import SimulatorFast, merge_replies, split_id_list
+from lasvsim_openapi.simulator_model import SimulatorConfig
+
+CONFIG = SimulatorConfig(scen_id="scen", scen_ver="1")
+VEHICLES = [f"veh_{i}" for i in range(7)]
+
+
+@pytest.fixture
+def http_config(cosim_server) -> HttpConfig:
+    host, port = cosim_server.server_address
+    return HttpConfig(token="token", endpoint=f"http://{host}:{port}")
+
+
+@pytest.fixture
+def simulator(http_config: HttpConfig) -> SimulatorFast:
+    client = HttpClient(http_config)
+    yield SimulatorFast(client, CONFIG)
+    client.close()
+
+
+def cosim_paths(server) -> list:
+    return [path for path, _ in server.requests]
+
+
+def position_requests(server) -> list:
+    return [data["id_list"] for path, data in server.requests if path == "/vehicle/position/get"]
+
+
+def test_split_and_merge():
+    """Test splitting ID lists and merging chunk replies."""
+    assert split_id_list(VEHICLES, 3) == [VEHICLES[:3], VEHICLES[3:6], VEHICLES[6:]]
+    assert split_id_list([], 3) == []
+    merged = merge_replies([
+        {"position_dict": {"a": 1}, "list": [1], "code": 0},
+        {"position_dict": {"b": 2}, "list": [2], "code": 1, "extra": True},
+    ])
+    assert merged == {"position_dict": {"a": 1, "b": 2}, "list": [1, 2], "code": 0, "extra": True}
+
+
+def test_get_vehicle_position_chunked(cosim_server, simulator: SimulatorFast):
+    """Test that oversized ID lists are queried in chunks and merged."""
+    expected = simulator.get_vehicle_position(VEHICLES)
+    assert position_requests(cosim_server) == [VEHICLES]
+
+    simulator.id_list_chunk_size = 3
+    chunked = simulator.get_vehicle_position(VEHICLES)
+    assert chunked == expected
+    assert sorted(position_requests(cosim_server)[1:]) == [VEHICLES[:3], VEHICLES[3:6], VEHICLES[6:]]
+    assert chunked["position_dict"]["veh_6"] == {"point": {"x": 6.0}}
+
+
+def test_async_get_vehicle_position_chunked(cosim_server, http_config: HttpConfig):
+    """Test chunked ID list queries of the async simulator."""
+    async def run():
+        client = AsyncHttpClient(http_config)
+        try:
+            simulator = AsyncSimulatorFast(client)
+            await simulator.init(CONFIG)
+            expected = await simulator.get_vehicle_position(VEHICLES)
+            simulator.id_list_chunk_size = 2
+            assert await simulator.get_vehicle_position(VEHICLES) == expected
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+    assert sorted(position_requests(cosim_server)[1:]) == [VEHICLES[i:i + 2] for i in range(0, 7, 2)]
+
+
+def test_step_and_observe(cosim_server, simulator: SimulatorFast):
+    """Test that controls are applied before the step and queries run after it."""
+    cosim_server.requests.clear()
+    res = simulator.step_and_observe(
+        controls={"veh_0": (1.0, 0.5), "veh_1": (0.0, -1.0)},
+        queries={"get_vehicle_position": (VEHICLES[:2],)},
+    )
+    assert cosim_paths(cosim_server) == ["/vehicle/control/set"] * 2 + ["/step", "/vehicle/position/get"]
+    assert res["controls"] == {"veh_0": {"vehicle_id": "veh_0"}, "veh_1": {"vehicle_id": "veh_1"}}
+    assert res["step"]["code"] == 0
+    assert set(res["get_vehicle_position"]["position_dict"]) == {"veh_0", "veh_1"}
+
+    # 控制失败时抛出按输入顺序的第一个错误, 不再推进仿真
+    cosim_server.requests.clear()
+    with pytest.raises(APIError) as exc_info:
+        simulator.step_and_observe(
+            controls={"veh_0": (1.0, 0.5), "missing_1": (0.0, 0.0), "missing_2": (0.0, 0.0)},
+            queries={"get_vehicle_position": (VEHICLES,)},
+        )
+    assert "missing_1" in str(exc_info.value.message)
+    assert cosim_paths(cosim_server) == ["/vehicle/control/set"] * 3
+
+    with pytest.raises(ValueError):
+        simulator.step_and_observe(queries={"stop": ()})
+
+
+def test_async_step_and_observe(cosim_server, http_config: HttpConfig):
+    """Test the ordering and error handling of the async step_and_observe."""
+    async def run():
+        client = AsyncHttpClient(http_config)
+        try:
+            simulator = AsyncSimulatorFast(client)
+            await simulator.init(CONFIG)
+            cosim_server.requests.clear()
+            res = await simulator.step_and_observe(
+                controls={"veh_0": (1.0, 0.5)},
+                queries={"get_vehicle_position": (["veh_3"],)},
+            )
+            assert cosim_paths(cosim_server) == ["/vehicle/control/set", "/step", "/vehicle/position/get"]
+            assert res["get_vehicle_position"]["position_dict"] == {"veh_3": {"point": {"x": 3.0}}}
+
+            cosim_server.requests.clear()
+            with pytest.raises(APIError) as exc_info:
+                await simulator.step_and_observe(controls={"missing_1": (0.0, 0.0), "missing_2": (0.0, 0.0)})
+            assert "missing_1" in str(exc_info.value.message)
+            assert cosim_paths(cosim_server) == ["/vehicle/control/set"] * 2
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+def test_set_vehicle_control_info_many(cosim_server, simulator: SimulatorFast):
+    """Test that per-vehicle failures are collected without hiding the other results."""
+    res = simulator.set_vehicle_control_info_many({
+        "veh_0": (1.0, 0.5),
+        "missing_1": (0.0, 0.0),
+        "veh_2": {"lon_acc": -1.0},
+    })
+    assert res["results"] == {"veh_0": {"vehicle_id": "veh_0"}, "veh_2": {"vehicle_id": "veh_2"}}
+    assert list(res["errors"]) == ["missing_1"]
+    assert isinstance(res["errors"]["missing_1"], APIError)
+    assert res["errors"]["missing_1"].reason == "NOT_EXIST"
+    sent = {data["vehicle_id"]: data for path, data in cosim_server.requests if path == "/vehicle/control/set"}
+    assert (sent["veh_0"]["ste_wheel"], sent["veh_0"]["lon_acc"]) == (1.0, 0.5)
+    assert (sent["veh_2"]["ste_wheel"], sent["veh_2"]["lon_acc"]) == (None, -1.0)
+    assert simulator.set_vehicle_control_info_many({}) == {"results": {}, "errors": {}}
+
+
+def test_async_set_vehicle_control_info_many(cosim_server, http_config: HttpConfig):
+    """Test per-vehicle error collection of the async bulk setters."""
+    async def run():
+        client = AsyncHttpClient(http_config)
+        try:
+            simulator = AsyncSimulatorFast(client)
+            await simulator.init(CONFIG)
+            return await simulator.set_vehicle_control_info_many({"missing_0": (0.0, 0.0), "veh_1": (1.0, 0.0)})
+        finally:
+            await client.close()
+
+    res = asyncio.run(run())
+    assert res["results"] == {"veh_1": {"vehicle_id": "veh_1"}}
+    assert list(res["errors"]) == ["missing_0"] and isinstance(res["errors"]["missing_0"], APIError)
+
+
+def test_simulator_generated_decoding(simulator: SimulatorFast):
+    """Test that Simulator decodes replies the same way with the generated decoders."""
+    eager, generated = Simulator(simulator), Simulator(simulator, generated=True)
+    assert generated.step() == eager.step()
+    assert generated.get_vehicle_position(VEHICLES[:3]) == eager.get_vehicle_position(VEHICLES[:3])
+    with pytest.raises(ValueError):
+        Simulator(simulator, lazy=True, generated=True)
@@ -0,0 +1,69 @@
+"""Tests for simulator pools against the stand-in cosim server."""
+import asyncio
+
+import pytest
+
+from lasvsim_openapi.http_client import APIError, HttpClient, HttpConfig
+from lasvsim_openapi.http_client_async import AsyncHttpClient
+from lasvsim_openapi.simulator_model import SimulatorConfig
+from lasvsim_openapi.simulator_pool import AsyncSimulatorPool, SimulatorPool
+
+CONFIGS = [SimulatorConfig(scen_id="scen", scen_ver="1") for _ in range(3)]
+
+
+def endpoint(server) -> str:
+    host, port = server.server_address
+    return f"http://{host}:{port}"
+
+
+def test_simulator_pool(cosim_server):
+    """Test fan-out, result order and argument checks of SimulatorPool."""
+    client = HttpClient(HttpConfig(token="token", endpoint=endpoint(cosim_server)))
+    try:
+        with SimulatorPool(client, CONFIGS) as pool:
+            ids = [sim.simulation_id for sim in pool]
+            assert len(pool) == 3 and len(set(ids)) == 3
+            assert [res["simulation_id"] for res in pool.step_all()] == ids
+
+            res = pool.set_control_all([("veh_0", 1.0, 0.1), None, ("missing", 0.0, 0.0)], return_exceptions=True)
+            assert res[0] == {"vehicle_id": "veh_0"} and res[1] is None
+            assert isinstance(res[2], APIError) and res[2].reason == "NOT_EXIST"
+            with pytest.raises(APIError):
+                pool.set_control_all([None, None, ("missing", 0.0, 0.0)])
+
+            assert pool.map(lambda sim, x: (sim.simulation_id, x), [1, 2, 3]) == list(zip(ids, [1, 2, 3]))
+            # 参数个数与模拟器个数不符时不能静默丢弃模拟器
+            with pytest.raises(ValueError):
+                pool.map(lambda sim, x: x, [1, 2])
+            with pytest.raises(ValueError):
+                pool.set_control_all([None])
+        stopped = [data["simulation_id"] for path, data in cosim_server.requests if path == "/stop"]
+        assert sorted(stopped) == sorted(ids)
+    finally:
+        client.close()
+
+
+def test_async_simulator_pool(cosim_server):
+    """Test fan-out, result order and argument checks of AsyncSimulatorPool."""
+    async def run():
+        client = AsyncHttpClient(HttpConfig(token="token", endpoint=endpoint(cosim_server)))
+        try:
+            pool = await AsyncSimulatorPool.create(client, CONFIGS)
+            ids = [sim.simulation_id for sim in pool]
+            assert len(set(ids)) == 3
+            assert [res["simulation_id"] for res in await pool.step_all()] == ids
+
+            res = await pool.set_control_all([None, ("missing", 0.0, 0.0), ("veh_1", 0.0, 1.0)], return_exceptions=True)
+            assert res[0] is None and isinstance(res[1], APIError) and res[2] == {"vehicle_id": "veh_1"}
+
+            async def tag(sim, x):
+                return sim.simulation_id, x
+
+            assert await pool.map(tag, "abc") == list(zip(ids, "abc"))
+            with pytest.raises(ValueError):
+                await pool.map(tag, "abcd")
+            await pool.stop_all()
+        finally:
+            await client.close()
+
+    asyncio.run(run())
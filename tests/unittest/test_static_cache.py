@@ -0,0 +1,105 @@
+"""Tests for the static simulation data cache."""
+from lasvsim_openapi.http_client import HttpClient, HttpConfig
+from lasvsim_openapi.simulator_fast import SimulatorFast
+from lasvsim_openapi.simulator_model import SimulatorConfig
+from lasvsim_openapi.static_cache import BASE_INFO, SENSOR_CONFIG, SIGNAL_PLAN, StaticDataCache
+
+# 缓存的查询接口
+STATIC_PATHS = (
+    "/vehicle/base_info/get",
+    "/vehicle/sensor_config/get",
+    "/map/traffic_light/signal_plan/get",
+    "/map/movement/list/get",
+)
+
+
+def test_static_cache_get_put():
+    """Test cache lookups and hit counters."""
+    cache = StaticDataCache()
+    assert cache.get(BASE_INFO, "sim", "veh") is None
+    cache.put(BASE_INFO, "sim", "veh", {"base_info": {}})
+    cache.put(BASE_INFO, "sim", "none", None)
+    assert cache.get(BASE_INFO, "sim", "veh") == {"base_info": {}}
+    assert cache.get(BASE_INFO, "other_sim", "veh") is None
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_static_cache_invalidate():
+    """Test dropping entries by simulation, entity and kind."""
+    cache = StaticDataCache()
+    for sim in ("sim_0", "sim_1"):
+        cache.put(BASE_INFO, sim, "veh_0", {})
+        cache.put(SENSOR_CONFIG, sim, "veh_0", {})
+        cache.put(BASE_INFO, sim, "veh_1", {})
+        cache.put(SIGNAL_PLAN, sim, "junction_0", {})
+
+    cache.invalidate("sim_0", ["veh_0"], [BASE_INFO])
+    assert cache.get(BASE_INFO, "sim_0", "veh_0") is None
+    assert cache.get(SENSOR_CONFIG, "sim_0", "veh_0") is not None
+
+    cache.invalidate("sim_0", kinds=[SIGNAL_PLAN])
+    assert cache.get(SIGNAL_PLAN, "sim_0", "junction_0") is None
+
+    cache.invalidate("sim_0")
+    assert len(cache) == 4, "entries of other simulations should be kept"
+
+
+def test_simulator_static_cache(cosim_server):
+    """Test SimulatorFast answering static queries from the cache until they are invalidated."""
+    host, port = cosim_server.server_address
+    client = HttpClient(HttpConfig(token="token", endpoint=f"http://{host}:{port}"))
+
+    def counts() -> list:
+        return [sum(path == p for path, _ in cosim_server.requests) for p in STATIC_PATHS]
+
+    def last_id_list() -> list:
+        return [data["id_list"] for path, data in cosim_server.requests if path == STATIC_PATHS[0]][-1]
+
+    try:
+        simulator = SimulatorFast(client, SimulatorConfig(scen_id="scen", scen_ver="1"))
+        cache = simulator.enable_static_cache()
+
+        def query() -> list:
+            return [
+                simulator.get_vehicle_base_info(["veh_0", "veh_1"]),
+                simulator.get_vehicle_sensor_config("veh_0"),
+                simulator.get_signal_plan("junction_0"),
+                simulator.get_movement_list("junction_0"),
+            ]
+
+        first = query()
+        assert query() == first
+        assert counts() == [1, 1, 1, 1]
+        assert first[0]["info_dict"]["veh_1"] == {"base_info": {"obj_id": "veh_1"}}
+
+        # 只查询未缓存的车辆, 结果按请求顺序
+        res = simulator.get_vehicle_base_info(["veh_2", "veh_1"])
+        assert list(res["info_dict"]) == ["veh_2", "veh_1"]
+        assert last_id_list() == ["veh_2"] and counts()[0] == 2
+
+        # 修改车辆信息只丢弃该车辆的缓存
+        simulator.set_vehicle_base_info("veh_0")
+        assert query() == first
+        assert counts() == [3, 2, 1, 1] and last_id_list() == ["veh_0"]
+
+        # 新生成的参与者可能复用旧 ID
+        cosim_server.spawn_ids = ["veh_1"]
+        assert simulator.get_step_spawn_id_list() == {"id_list": ["veh_1"]}
+        assert query() == first
+        assert counts() == [4, 2, 1, 1] and last_id_list() == ["veh_1"]
+
+        simulator.reset()
+        assert query() == first
+        assert counts() == [5, 3, 2, 2]
+
+        simulator.stop()
+        assert query() == first
+        assert counts() == [6, 4, 3, 3]
+
+        simulator.disable_static_cache()
+        query()
+        assert counts() == [7, 5, 4, 4]
+        assert len(cache) == 0
+    finally:
+        client.close()
@@ -0,0 +1,111 @@
+"""Tests for the vectorized IDC environment against the stand-in cosim server."""
+import copy
+import threading
+
+import pytest
+
+from lasvsim_openapi.http_client import HttpClient, HttpConfig
+from lasvsim_openapi.simulator_model import SimulatorConfig
+from lasvsim_openapi.simulator_pool import SimulatorPool
+
+np = pytest.importorskip("numpy")
+from lasvsim_openapi.vec_env import EGO_FEATURES, PERCEPTION_FEATURES, VecIdcEnv  # noqa: E402
+
+IDC_STEP_RES = {
+    "position": {"point": {"x": 10.0, "y": 20.0}, "phi": 0.5},
+    "moving_info": {"u": 8.0, "v": 0.1, "w": 0.01, "u_acc": 0.5},
+    "perception_infos": [
+        {"position": {"point": {"x": 40.0, "y": 20.0}, "phi": 0.0}, "moving_info": {"u": 5.0},
+         "base_info": {"length": 4.5, "width": 1.8}},
+        {"position": {"point": {"x": 12.0, "y": 23.0}, "phi": 3.1}, "base_info": {"length": 0.6, "width": 0.6}},
+        {"position": {"point": {"x": 10.0, "y": 0.0}}},
+    ],
+    "reference_lines": [
+        {"points": [{"x": 0.0, "y": 0.0}, {"x": 1.0, "y": 0.5}]},
+        {"points": []},
+        {"points": [{"x": float(i), "y": 2.0} for i in range(5)]},
+        {"points": [{"x": 9.0, "y": 9.0}]},
+    ],
+    "step_res": {"code": 0},
+}
+# 每段仿真在第 3 次 idc_step 时结束
+EPISODE_STEPS = 3
+
+
+@pytest.fixture
+def env(cosim_server):
+    """A two-environment VecIdcEnv whose idc_step replies move the ego by 1m per step."""
+    steps = {}
+    lock = threading.Lock()
+
+    def idc_step(data):
+        with lock:
+            n = steps[data["simulation_id"]] = steps.get(data["simulation_id"], 0) + 1
+        reply = copy.deepcopy(IDC_STEP_RES)
+        reply["position"]["point"]["x"] = float(n)
+        reply["step_res"]["code"] = 101 if n >= EPISODE_STEPS else 0
+        return 200, reply
+
+    def reset(data):
+        with lock:
+            steps.pop(data["simulation_id"], None)
+        return 200, {}
+
+    cosim_server.routes["/openapi/cosim/v2/simulation/idc_step"] = idc_step
+    cosim_server.routes["/openapi/cosim/v2/simulation/reset"] = reset
+    host, port = cosim_server.server_address
+    client = HttpClient(HttpConfig(token="token", endpoint=f"http://{host}:{port}"))
+    pool = SimulatorPool(client, [SimulatorConfig(scen_id="scen", scen_ver="1") for _ in range(2)])
+    env = VecIdcEnv(pool, vehicle_ids=["ego", "ego"], max_perception=2, n_ref_lines=3, ref_line_points=3)
+    yield env
+    env.close()
+    client.close()
+
+
+def test_pack(env: VecIdcEnv):
+    """Test the observation layout for a fixed idc_step reply."""
+    env._pack(1, IDC_STEP_RES)
+    obs = env._obs[1]
+    assert obs.shape == (len(EGO_FEATURES) + 2 * len(PERCEPTION_FEATURES) + 3 * 7,)
+    assert obs[env.obs_slices["ego"]].tolist() == [10.0, 20.0, 0.5, 8.0, 0.1, 0.01, 0.5, 0.0, 0.0]
+    # 按与自车的距离取最近的两个目标
+    assert obs[env.obs_slices["perception"]].reshape(2, -1).tolist() == [
+        [1.0, 12.0, 23.0, 3.1, 0.0, 0.6, 0.6],
+        [1.0, 10.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    ]
+    # 不足的点用最后一个点补齐, 空参考线的槽位为零, 超出的参考线丢弃
+    assert obs[env.obs_slices["reference_lines"]].reshape(3, -1).tolist() == [
+        [1.0, 0.0, 0.0, 1.0, 0.5, 1.0, 0.5],
+        [0.0] * 7,
+        [1.0, 0.0, 2.0, 1.0, 2.0, 2.0, 2.0],
+    ]
+    assert not env._obs[0].any()
+
+    env._pack(1, {})
+    assert not env._obs[1].any()
+
+
+def test_auto_reset(env: VecIdcEnv):
+    """Test that finished environments are reset with their terminal observation in infos."""
+    obs = env.reset()
+    assert obs[:, 0].tolist() == [1.0, 1.0]
+    obs, rewards, dones, infos = env.step(np.zeros((2, 2)))
+    assert obs[:, 0].tolist() == [2.0, 2.0] and not dones.any()
+
+    obs, rewards, dones, infos = env.step(np.zeros((2, 2)))
+    assert dones.tolist() == [True, True]
+    # 返回新一段仿真的首个观测, 结束时的观测放在 infos 中
+    assert obs[:, 0].tolist() == [1.0, 1.0]
+    assert [info["terminal_observation"][0] for info in infos] == [3.0, 3.0]
+    assert infos[0]["terminal_observation"][1] == 20.0
+
+    obs, rewards, dones, infos = env.step(np.zeros((2, 2)))
+    assert obs[:, 0].tolist() == [2.0, 2.0] and not dones.any()
+    assert all("terminal_observation" not in info for info in infos)
+
+    env.auto_reset = False
+    env.step(None)
+    obs, rewards, dones, infos = env.step(None)
+    assert dones.all() and obs[:, 0].tolist() == [4.0, 4.0]
+    with pytest.raises(ValueError):
+        env.step(np.zeros((3, 2)))